@@ -0,0 +1,10 @@
+from datetime import timedelta
+
+from django.core.management import call_command
+
+from tasks.services import task
+
+
+@task(every=timedelta(days=1))
+def prune_expired_tokens():
+    call_command('prune_tokens', chunk_size=1000, sleep=0.1)
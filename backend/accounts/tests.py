@@ -0,0 +1,100 @@
+import time
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache as default_cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .authentication import CachedJWTAuthentication, _current_version, _version_key, cache
+from .models import User
+from .tokens import GENERATION_KEY, FastRefreshToken, _BlacklistSet
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        default_cache.clear()
+        self.user = User.objects.create_user('guest@example.com', 'old-pass', first_name='Guest', last_name='User')
+        self.auth = CachedJWTAuthentication()
+
+    def test_cached_user_served_without_queries(self):
+        token = AccessToken.for_user(self.user)
+        self.auth.get_user(token)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.auth.get_user(token).pk, self.user.pk)
+
+    def test_save_invalidates_cached_user(self):
+        token = AccessToken.for_user(self.user)
+        self.auth.get_user(token)
+        self.user.first_name = 'Renamed'
+        self.user.save()
+        self.assertEqual(self.auth.get_user(token).first_name, 'Renamed')
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(token)
+
+    def test_evicted_version_does_not_revive_old_entries(self):
+        self.auth.get_user(AccessToken.for_user(self.user))
+        old = _current_version(self.user.pk)
+        cache.delete(_version_key(self.user.pk))
+        self.assertGreater(_current_version(self.user.pk), old)
+
+    def test_revoke_check_applies_to_cached_users(self):
+        # simplejwt modules hold api_settings by reference, so patch it rather than override_settings.
+        with mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True):
+            old_token = AccessToken.for_user(self.user)
+            self.user.set_password('new-pass')
+            self.user.save()
+            # Caches the user with the new password hash.
+            self.auth.get_user(AccessToken.for_user(self.user))
+            with self.assertRaises(AuthenticationFailed):
+                self.auth.get_user(old_token)
+
+
+class BlacklistTests(TestCase):
+    def setUp(self):
+        default_cache.clear()
+        self.user = User.objects.create_user('guest@example.com', 'pass', first_name='Guest', last_name='User')
+
+    def outstanding(self, expires_at):
+        return OutstandingToken.objects.create(
+            user=self.user, jti=uuid.uuid4().hex, token='-', created_at=timezone.now(), expires_at=expires_at,
+        )
+
+    def test_logout_blacklists_refresh_token(self):
+        refresh = FastRefreshToken.for_user(self.user)
+        response = self.client.post(
+            '/api/auth/logout/', {'refresh': str(refresh)},
+            HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}', content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        with self.assertRaises(TokenError):
+            FastRefreshToken(str(refresh))
+
+    def test_other_worker_sees_new_entries(self):
+        # Another worker's set, built before the logout.
+        other = _BlacklistSet()
+        self.assertNotIn('missing', other)
+
+        refresh = FastRefreshToken.for_user(self.user)
+        refresh.blacklist()
+        self.assertIn(refresh['jti'], other)
+
+    def test_tail_picks_up_late_lower_pk_and_skips_expired(self):
+        blacklist = _BlacklistSet()
+        later = BlacklistedToken.objects.create(token=self.outstanding(timezone.now() + timedelta(days=1)))
+        self.assertIn(later.token.jti, blacklist)
+
+        # Committed after ``later`` but with a lower pk.
+        late = BlacklistedToken.objects.create(pk=later.pk - 1, token=self.outstanding(timezone.now() + timedelta(days=1)))
+        expired = BlacklistedToken.objects.create(token=self.outstanding(timezone.now() - timedelta(days=1)))
+        cache.bump(GENERATION_KEY, initial=time.time_ns())
+        self.assertIn(late.token.jti, blacklist)
+        self.assertNotIn(expired.token.jti, blacklist)
@@ -0,0 +1,86 @@
+import threading
+import time
+
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from hotel.cache import NamespacedCache
+
+# Full rebuild interval. Between rebuilds only blacklist rows newer than the
+# last one seen are fetched, and only when another worker announced a change
+# through the shared cache.
+REBUILD_SECONDS = 60
+# Rows are re-read this far below the highest pk seen: a lower pk can commit
+# after a higher one and would otherwise be missed until the next rebuild.
+TAIL_OVERLAP = 100
+GENERATION_KEY = 'blacklist-generation'
+
+cache = NamespacedCache('accounts')
+
+
+class _BlacklistSet:
+    """In-process set of JTIs of blacklisted refresh tokens that have not expired yet."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jtis = set()
+        self._watermark = 0
+        self._generation = None
+        self._built_at = float('-inf')
+
+    def __contains__(self, jti):
+        self._refresh()
+        return jti in self._jtis
+
+    def add(self, jti):
+        with self._lock:
+            self._jtis.add(jti)
+        cache.bump(GENERATION_KEY)
+
+    def _refresh(self):
+        generation = cache.get(GENERATION_KEY, 0)
+        with self._lock:
+            if time.monotonic() - self._built_at > REBUILD_SECONDS:
+                self._rebuild(generation)
+            elif generation != self._generation:
+                self._load_tail(generation)
+
+    def _rebuild(self, generation):
+        rows = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now()).values_list('pk', 'token__jti')
+        self._jtis = set()
+        self._watermark = 0
+        self._add_rows(rows)
+        self._generation = generation
+        self._built_at = time.monotonic()
+
+    def _load_tail(self, generation):
+        rows = BlacklistedToken.objects.filter(
+            pk__gt=self._watermark - TAIL_OVERLAP, token__expires_at__gt=timezone.now(),
+        ).values_list('pk', 'token__jti')
+        self._add_rows(rows)
+        self._generation = generation
+
+    def _add_rows(self, rows):
+        for pk, jti in rows:
+            self._jtis.add(jti)
+            self._watermark = max(self._watermark, pk)
+
+
+blacklisted_jtis = _BlacklistSet()
+
+
+class FastRefreshToken(RefreshToken):
+    """RefreshToken whose blacklist check is served from memory instead of a query per refresh."""
+
+    def check_blacklist(self):
+        if self.payload[api_settings.JTI_CLAIM] in blacklisted_jtis:
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklisted_jtis.add(self.payload[api_settings.JTI_CLAIM])
+        return result
@@ -2,18 +2,19 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from rest_framework.throttling import ScopedRateThrottle
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
 
+from hotel.throttling import SlidingWindowScopedRateThrottle
+
 from .serializers import RegisterSerializer, LoginSerializer, UserSerializer
+from .tokens import FastRefreshToken
 
 
-class LoginRateThrottle(ScopedRateThrottle):
+class LoginRateThrottle(SlidingWindowScopedRateThrottle):
     scope = 'login'
 
 
-class RegisterRateThrottle(ScopedRateThrottle):
+class RegisterRateThrottle(SlidingWindowScopedRateThrottle):
     scope = 'register'
 
 
@@ -24,7 +25,7 @@ def register(request):
     serializer = RegisterSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.save()
-        refresh = RefreshToken.for_user(user)
+        refresh = FastRefreshToken.for_user(user)
         return Response({
             'user': UserSerializer(user).data,
             'access': str(refresh.access_token),
@@ -40,7 +41,7 @@ def login(request):
     serializer = LoginSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.validated_data['user']
-        refresh = RefreshToken.for_user(user)
+        refresh = FastRefreshToken.for_user(user)
         return Response({
             'user': UserSerializer(user).data,
             'access': str(refresh.access_token),
@@ -54,7 +55,7 @@ def login(request):
 def logout(request):
     try:
         refresh_token = request.data.get('refresh')
-        token = RefreshToken(refresh_token)
+        token = FastRefreshToken(refresh_token)
         token.blacklist()
         return Response({'detail': 'Logged out successfully.'})
     except TokenError:
@@ -65,7 +66,7 @@ def logout(request):
 @permission_classes([AllowAny])
 def refresh_token(request):
     try:
-        refresh = RefreshToken(request.data.get('refresh'))
+        refresh = FastRefreshToken(request.data.get('refresh'))
         return Response({'access': str(refresh.access_token)})
     except TokenError:
         return Response({'detail': 'Invalid or expired token.'}, status=status.HTTP_401_UNAUTHORIZED)
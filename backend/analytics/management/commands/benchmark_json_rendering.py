@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import User
+from analytics.views import admin_dashboard
+from hotel.renderers import FastJSONRenderer, orjson
+from rooms.views import all_rooms_availability
+
+
+class Command(BaseCommand):
+    help = 'Compare stdlib and accelerated JSON rendering on the largest API payloads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed; FastJSONRenderer falls back to stdlib.'))
+
+        factory = APIRequestFactory()
+        staff = User(email='benchmark@localhost', is_staff=True, is_active=True)
+        payloads = {}
+        for name, view, path in (
+            ('admin_dashboard', admin_dashboard, '/api/analytics/dashboard/'),
+            ('all_rooms_availability', all_rooms_availability, '/api/rooms/all-availability/'),
+        ):
+            request = factory.get(path)
+            force_authenticate(request, user=staff)
+            payloads[name] = view(request).data
+
+        for name, data in payloads.items():
+            timings = {}
+            for renderer in (JSONRenderer(), FastJSONRenderer()):
+                start = time.perf_counter()
+                for _ in range(options['repeat']):
+                    body = renderer.render(data)
+                timings[type(renderer).__name__] = ((time.perf_counter() - start) / options['repeat'], len(body))
+            (std, size), (fast, _) = timings['JSONRenderer'], timings['FastJSONRenderer']
+            self.stdout.write(
+                f'{name}: {size / 1024:.0f} KiB, stdlib {std * 1000:.2f} ms, '
+                f'fast {fast * 1000:.2f} ms ({std / fast:.1f}x)'
+            )
@@ -0,0 +1,292 @@
+import io
+import itertools
+import json
+import math
+import subprocess
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from bookings.models import Booking
+from chat.models import Conversation, Message
+from outbox.models import OutboxEvent, ParkedEvent
+from payments.models import Payment
+from rooms.calendar import refresh_dates
+from rooms.models import Room
+from vouchers.models import Voucher
+
+EMAIL_DOMAIN = 'bench.test'
+VOUCHER_CODE = 'BENCHMARK'
+# Funnel bookings go this far ahead so they never collide with real or seeded ones.
+BOOKING_OFFSET_DAYS = 400
+PASSWORD = 'benchmark-pass'
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def proof_image():
+    out = io.BytesIO()
+    Image.new('RGB', (8, 8), (0, 120, 200)).save(out, 'PNG')
+    out.seek(0)
+    out.name = 'proof.png'
+    return out
+
+
+class Recorder:
+    """Latency, status and query count of every request, grouped by endpoint label."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+
+    def call(self, client, label, method, path, expect=(200,), **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = getattr(client, method)(path, **kwargs)
+            elapsed = time.perf_counter() - start
+        if response.streaming:
+            b''.join(response.streaming_content)
+        with self.lock:
+            self.samples[label].append((elapsed, len(queries), response.status_code in expect))
+        return response
+
+    def summary(self, wall_seconds):
+        everything = [s for samples in self.samples.values() for s in samples]
+        report = self._stats(everything)
+        report['throughput_rps'] = round(len(everything) / wall_seconds, 1) if wall_seconds else None
+        report['endpoints'] = {label: self._stats(samples) for label, samples in sorted(self.samples.items())}
+        return report
+
+    def _stats(self, samples):
+        latencies = [s[0] * 1000 for s in samples]
+        queries = [s[1] for s in samples]
+        return {
+            'requests': len(samples),
+            'errors': sum(1 for s in samples if not s[2]),
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'mean_queries': round(sum(queries) / len(queries), 1),
+            'max_queries': max(queries),
+        }
+
+
+class Command(BaseCommand):
+    help = 'Drive realistic request scenarios through the full middleware stack and report latency percentiles.'
+
+    scenarios = ('browse', 'booking_funnel', 'chat_polling', 'admin_dashboard')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', action='append', choices=self.scenarios,
+                            help='Repeat to pick several; defaults to all.')
+        parser.add_argument('--iterations', type=int, default=50, help='Iterations per scenario.')
+        parser.add_argument('--concurrency', type=int, default=1, help='Threads per scenario.')
+        parser.add_argument('--output', help='Write results as JSON to this file.')
+        parser.add_argument('--compare', help='Previous JSON results to diff p95 latency against.')
+        parser.add_argument('--keep-throttles', action='store_true',
+                            help='Leave DRF throttling on; by default it is disabled for the run.')
+
+    def handle(self, *args, **options):
+        self.rooms = list(Room.objects.filter(is_active=True).order_by('pk'))
+        if not self.rooms:
+            raise CommandError('No rooms found; run `manage.py loaddata fixtures/rooms.json` first.')
+
+        self.counter = itertools.count()
+        self.setup()
+        results = {}
+        try:
+            with ExitStack() as stack:
+                # The test client sends Host: testserver.
+                stack.enter_context(override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']))
+                if not options['keep_throttles']:
+                    stack.enter_context(mock.patch.object(APIView, 'check_throttles', lambda self, request: None))
+                for name in options['scenario'] or self.scenarios:
+                    results[name] = self.run_scenario(name, options['iterations'], options['concurrency'])
+        finally:
+            self.teardown()
+
+        report = {
+            'commit': git_commit(),
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'iterations': options['iterations'],
+            'concurrency': options['concurrency'],
+            'scenarios': results,
+        }
+        self.print_report(report, options['compare'])
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}')
+        failed = [name for name, result in results.items() if result['requests'] and result['errors'] == result['requests']]
+        if failed:
+            raise CommandError(f'Every request failed in: {", ".join(failed)}; the numbers above measure nothing.')
+
+    def setup(self):
+        self.teardown()
+        now = timezone.now()
+        self.guest = User.objects.create_user(f'guest@{EMAIL_DOMAIN}', PASSWORD, first_name='Bench', last_name='Guest')
+        self.staff = User.objects.create_user(
+            f'staff@{EMAIL_DOMAIN}', PASSWORD, first_name='Bench', last_name='Staff', is_staff=True,
+        )
+        self.conversation = Conversation.objects.create(customer=self.guest, subject='Benchmark')
+        Message.objects.bulk_create([
+            Message(conversation=self.conversation, sender=self.staff if n % 2 else self.guest,
+                    content='Benchmark message', is_staff_reply=bool(n % 2))
+            for n in range(20)
+        ])
+        Voucher.objects.create(
+            code=VOUCHER_CODE, discount_type='percentage', discount_value=Decimal('10'),
+            valid_from=now - timedelta(days=1), valid_until=now + timedelta(days=30),
+        )
+
+    def teardown(self):
+        bookings = list(
+            Booking.objects.filter(user__email__endswith=f'@{EMAIL_DOMAIN}').values_list('pk', 'room_id', 'check_in', 'check_out')
+        )
+        payments = list(Payment.objects.filter(booking__user__email__endswith=f'@{EMAIL_DOMAIN}'))
+        for payment in payments:
+            if payment.proof_of_payment:
+                payment.proof_of_payment.delete(save=False)
+        # Consumers must not receive events for bookings that no longer exist, and a worker
+        # may have parked some of them. All or nothing, so a failure leaves nothing orphaned.
+        events = OutboxEvent.objects.filter(aggregate_type='booking', aggregate_id__in=[b[0] for b in bookings])
+        events |= OutboxEvent.objects.filter(aggregate_type='payment', aggregate_id__in=[p.pk for p in payments])
+        with transaction.atomic():
+            ParkedEvent.objects.filter(event__in=events).delete()
+            events.delete()
+            User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').delete()
+            Voucher.objects.filter(code=VOUCHER_CODE).delete()
+        # Feeds may already show the deleted bookings.
+        for _, room_id, check_in, check_out in bookings:
+            refresh_dates(room_id, check_in, check_out)
+
+    def client_for(self, user=None):
+        if user is None:
+            return Client()
+        return Client(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+    def run_scenario(self, name, iterations, concurrency):
+        recorder = Recorder()
+        step = getattr(self, f'scenario_{name}')
+
+        def worker(n):
+            try:
+                step(recorder, n)
+            finally:
+                connection.close()
+
+        start = time.perf_counter()
+        if concurrency > 1:
+            with ThreadPoolExecutor(concurrency) as pool:
+                list(pool.map(worker, range(iterations)))
+        else:
+            for n in range(iterations):
+                step(recorder, n)
+        return recorder.summary(time.perf_counter() - start)
+
+    def scenario_browse(self, recorder, n):
+        client = self.client_for()
+        room = self.rooms[n % len(self.rooms)]
+        recorder.call(client, 'content-bundle', 'get', '/api/content/bundle/')
+        recorder.call(client, 'room-list', 'get', '/api/rooms/')
+        recorder.call(client, 'all-availability', 'get', '/api/rooms/all-availability/')
+        recorder.call(client, 'room-detail', 'get', f'/api/rooms/{room.pk}/')
+        recorder.call(client, 'room-availability', 'get', f'/api/rooms/{room.pk}/availability/')
+        recorder.call(client, 'promotions', 'get', '/api/content/promotions/')
+
+    def scenario_booking_funnel(self, recorder, n):
+        email = f'funnel-{uuid.uuid4().hex[:12]}@{EMAIL_DOMAIN}'
+        response = recorder.call(self.client_for(), 'register', 'post', '/api/auth/register/', expect=(201,), data={
+            'email': email, 'first_name': 'Bench', 'last_name': 'Funnel',
+            'password': PASSWORD, 'password2': PASSWORD,
+        }, content_type='application/json')
+        if response.status_code != 201:
+            return
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {response.json()["access"]}')
+
+        seq = next(self.counter)
+        room = self.rooms[seq % len(self.rooms)]
+        day = timezone.localdate() + timedelta(days=BOOKING_OFFSET_DAYS + seq // len(self.rooms))
+        response = recorder.call(client, 'booking-create', 'post', '/api/bookings/', expect=(201,), data={
+            'room': room.pk, 'guests': 1, 'slots': [{'date': day.isoformat(), 'slot': 'day'}],
+        }, content_type='application/json')
+        if response.status_code != 201:
+            return
+        booking_id = response.json()['id']
+
+        recorder.call(client, 'validate-voucher', 'post', '/api/vouchers/validate/', data={
+            'code': VOUCHER_CODE, 'booking_id': booking_id,
+        }, content_type='application/json')
+        recorder.call(client, 'submit-proof', 'post', '/api/payments/submit-proof/', expect=(201,), data={
+            'booking_id': booking_id, 'gcash_reference': f'BENCH{seq}',
+            'payment_type': 'downpayment', 'voucher_code': VOUCHER_CODE, 'proof_of_payment': proof_image(),
+        })
+        recorder.call(client, 'my-bookings', 'get', '/api/bookings/')
+
+    def scenario_chat_polling(self, recorder, n):
+        client = self.client_for(self.guest)
+        since = (timezone.now() - timedelta(minutes=5)).isoformat()
+        recorder.call(client, 'my-conversations', 'get', '/api/chat/conversations/')
+        for _ in range(5):
+            recorder.call(client, 'chat-poll', 'get', f'/api/chat/conversations/{self.conversation.pk}/poll/',
+                          data={'since': since})
+
+    def scenario_admin_dashboard(self, recorder, n):
+        client = self.client_for(self.staff)
+        recorder.call(client, 'admin-dashboard', 'get', '/api/analytics/dashboard/')
+        recorder.call(client, 'admin-bookings', 'get', '/api/bookings/admin/')
+        recorder.call(client, 'admin-conversations', 'get', '/api/chat/admin/conversations/')
+
+    def print_report(self, report, compare):
+        previous = {}
+        if compare:
+            with open(compare) as f:
+                previous = json.load(f)['scenarios']
+        for name, result in report['scenarios'].items():
+            line = (
+                f'{name}: {result["requests"]} requests, {result["throughput_rps"]} req/s, '
+                f'p50 {result["p50_ms"]} ms, p95 {result["p95_ms"]} ms, p99 {result["p99_ms"]} ms, '
+                f'{result["mean_queries"]} queries/request, {result["errors"]} errors'
+            )
+            if name in previous:
+                before = previous[name]['p95_ms']
+                line += f' (p95 {(result["p95_ms"] - before) / before * 100:+.0f}% vs {compare})'
+            self.stdout.write(line)
+            for label, stats in result['endpoints'].items():
+                self.stdout.write(
+                    f'  {label}: p50 {stats["p50_ms"]} ms, p95 {stats["p95_ms"]} ms, '
+                    f'{stats["mean_queries"]} queries, max {stats["max_queries"]}'
+                    + (f', {stats["errors"]} errors' if stats['errors'] else '')
+                )
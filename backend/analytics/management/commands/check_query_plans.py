@@ -0,0 +1,104 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from analytics.models import PageView
+from bookings.models import Booking
+from chat.models import Conversation, Message
+from notifications.services import reminder_candidates
+from payments.models import Payment
+from rooms.models import Room
+
+# Below this many rows a sequential scan is the planner's right call, not a regression.
+MIN_ROWS = 1000
+
+FULL_SCAN_PATTERNS = {
+    # "SCAN bookings_booking" without "USING ... INDEX".
+    'sqlite': r'\bSCAN {table}\b(?!.*USING (COVERING )?INDEX)',
+    'postgresql': r'Seq Scan on {table}\b',
+}
+# Walking a whole index is reported but not failed: without range statistics
+# SQLite often prefers an index matching GROUP BY over a range search.
+FULL_INDEX_SCAN_PATTERNS = {
+    'sqlite': r'\bSCAN {table} USING (COVERING )?INDEX',
+}
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the booking, payment, chat and analytics hot queries and fail on full table scans.'
+
+    def handle(self, *args, **options):
+        pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f'No plan check for the {connection.vendor} backend.')
+
+        index_scan = FULL_INDEX_SCAN_PATTERNS.get(connection.vendor)
+        queries = self.hot_queries()
+        # Fresh seed data has no planner statistics yet.
+        with connection.cursor() as cursor:
+            for table in {queryset.model._meta.db_table for _, queryset in queries}:
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(table)}')
+
+        failures = []
+        for label, queryset in queries:
+            table = queryset.model._meta.db_table
+            rows = queryset.model.objects.count()
+            plan = queryset.explain()
+            if rows < MIN_ROWS:
+                self.stdout.write(f'SKIP {label}: only {rows} row(s) in {table}; seed data first.')
+                continue
+            if re.search(pattern.format(table=table), plan):
+                failures.append(label)
+                self.stdout.write(self.style.ERROR(f'FULL SCAN {label}'))
+                self.stdout.write(plan)
+            elif index_scan and re.search(index_scan.format(table=table), plan):
+                self.stdout.write(self.style.WARNING(f'FULL INDEX SCAN {label}'))
+                self.stdout.write(plan)
+            else:
+                self.stdout.write(self.style.SUCCESS(f'OK {label}'))
+                if options['verbosity'] > 1:
+                    self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(f'{len(failures)} hot query(ies) fall back to a full table scan: {", ".join(failures)}')
+
+    def hot_queries(self):
+        now = timezone.now()
+        today = timezone.localdate()
+        room = Room.objects.order_by('pk').first()
+        conversation = Conversation.objects.order_by('pk').first()
+        return [
+            ('booking slot conflicts', Booking.objects.filter(
+                room=room, status__in=['confirmed', 'pending'],
+                check_in__lte=today + timedelta(days=2), check_out__gte=today,
+            )),
+            ('room occupancy', Booking.objects.filter(
+                room=room, status__in=['confirmed', 'completed'],
+                check_out__gte=today - timedelta(days=30), check_in__lte=today,
+            )),
+            ('bookings to complete', Booking.objects.filter(
+                status='confirmed', check_out__lt=today,
+            )),
+            ('expired pending bookings', Booking.objects.filter(
+                status='pending', created_at__lt=now - timedelta(hours=24),
+            )),
+            ('payment reminders due', reminder_candidates(now)),
+            ('recent bookings by status', Booking.objects.filter(
+                status='confirmed', created_at__gte=now - timedelta(days=30),
+            )),
+            ('revenue by month', Payment.objects.filter(
+                status='succeeded', created_at__gte=now - timedelta(days=365),
+            ).annotate(month=TruncMonth('created_at')).values('month').annotate(revenue=Sum('amount'))),
+            ('pending payments', Payment.objects.filter(status='pending')),
+            ('unread messages', Message.objects.filter(
+                conversation=conversation, is_read=False, is_staff_reply=False,
+            )),
+            ('visitors in window', PageView.objects.filter(
+                timestamp__gte=now - timedelta(days=90),
+            ).values('visitor_id').annotate(total_views=Count('id'), last_seen=Max('timestamp'))),
+        ]
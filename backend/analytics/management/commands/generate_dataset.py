@@ -0,0 +1,323 @@
+import random
+import secrets
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils import timezone
+
+from accounts.models import User
+from analytics.models import PageView
+from bookings.models import Booking
+from chat.models import Conversation, Message
+from payments.models import Payment
+from rooms.models import Room
+from vouchers.models import Voucher, VoucherUsage
+
+EMAIL_DOMAIN = 'synthetic.test'
+VISITOR_PREFIX = 'syn-'
+# Generated voucher codes look like SYNTHETIC-2025-3; --clear deletes only this exact form.
+VOUCHER_CODE = 'SYNTHETIC-{year}-{n}'
+VOUCHER_CODE_REGEX = r'^SYNTHETIC-[0-9]{4}-[0-9]$'
+
+# Per scale unit.
+USERS = 3000
+BOOKINGS_PER_DAY = 10
+PAGE_VIEWS_PER_DAY = 2000
+
+# Summer (March-May) and the December holidays are the busy seasons.
+MONTH_WEIGHTS = {1: 0.7, 2: 0.8, 3: 1.3, 4: 1.9, 5: 1.8, 6: 1.0, 7: 0.8, 8: 0.8, 9: 0.6, 10: 0.7, 11: 0.8, 12: 1.6}
+WEEKEND_WEIGHT = 1.8
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 3, 4, 5, 6, 6, 6, 7, 7, 6, 6, 6, 7, 9, 10, 10, 8, 5, 2]
+YEARLY_GROWTH = 0.2
+BOOKING_HORIZON_DAYS = 60
+
+FIRST_NAMES = ['Maria', 'Jose', 'Juan', 'Ana', 'Mark', 'Angel', 'John', 'Grace', 'Paolo', 'Kristine', 'Carlo', 'Joy']
+LAST_NAMES = ['Santos', 'Reyes', 'Cruz', 'Bautista', 'Garcia', 'Mendoza', 'Dela Cruz', 'Ramos', 'Aquino', 'Villanueva']
+PAGES = ['/', '/rooms', '/availability', '/promotions', '/events', '/news', '/contact', '/bookings', '/login']
+CHAT_SUBJECTS = ['Booking inquiry', 'Payment concern', 'Event reservation', 'Directions', 'Cottage availability']
+
+
+@contextmanager
+def historic_timestamps(*model_classes):
+    """Let bulk_create keep the generated created_at/updated_at values."""
+    flipped = []
+    for model in model_classes:
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.DateTimeField) and (field.auto_now or field.auto_now_add):
+                flipped.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in flipped:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic, production-sized resort history for load and benchmark testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help='Multiplier for users, bookings and page views.')
+        parser.add_argument('--years', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--end-date', type=date.fromisoformat, default=None,
+                            help='YYYY-MM-DD anchor for "today" (default: the current date). '
+                                 'Fix it to get the same data for the same seed on every run.')
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated data first.')
+        parser.add_argument('--allow-production', action='store_true',
+                            help='Run even with DEBUG off. The data includes a staff account.')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['allow_production']:
+            raise CommandError('DEBUG is off; refusing to add synthetic accounts. Pass --allow-production to override.')
+        self.rng = random.Random(options['seed'])
+        self.scale = options['scale']
+        self.batch_size = options['batch_size']
+        self.rooms = list(Room.objects.filter(is_active=True).order_by('pk'))
+        if not self.rooms:
+            raise CommandError('No rooms found; run `manage.py loaddata fixtures/rooms.json` first.')
+
+        if options['clear']:
+            self.clear()
+        elif User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').exists():
+            raise CommandError('Synthetic data already exists; pass --clear to regenerate it.')
+
+        today = options['end_date'] or timezone.localdate()
+        self.start = today - timedelta(days=365 * options['years'])
+        self.today = today
+        self.end = today + timedelta(days=BOOKING_HORIZON_DAYS)
+        # Nothing is created after the end of the anchor day.
+        self.latest = timezone.make_aware(datetime.combine(today, time.max))
+        self.password = secrets.token_urlsafe(12)
+
+        with historic_timestamps(User, Booking, Payment, VoucherUsage, Voucher, Conversation, Message, PageView):
+            users = self.generate_users()
+            bookings = self.generate_bookings(users)
+            self.generate_payments(bookings)
+            self.generate_voucher_usages(bookings)
+            self.generate_chats(users)
+            self.generate_page_views()
+        self.stdout.write(f'Password for every synthetic account, shown only once: {self.password}')
+
+    def clear(self):
+        # Bookings, payments, voucher usages and chats cascade from the users.
+        User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').delete()
+        Voucher.objects.filter(code__regex=VOUCHER_CODE_REGEX).delete()
+        PageView.objects.filter(visitor_id__startswith=VISITOR_PREFIX).delete()
+        self.stdout.write('Removed previous synthetic data.')
+
+    def weight(self, day):
+        years = (day - self.start).days / 365
+        weekend = WEEKEND_WEIGHT if day.weekday() >= 5 else 1
+        return MONTH_WEIGHTS[day.month] * weekend * (1 + YEARLY_GROWTH) ** years
+
+    def count_for(self, day, per_day):
+        expected = per_day * self.scale * self.weight(day) * self.rng.uniform(0.6, 1.4)
+        count = int(expected)
+        return count + (self.rng.random() < expected - count)
+
+    def moment(self, day):
+        hour = self.rng.choices(range(24), HOUR_WEIGHTS)[0]
+        naive = datetime.combine(day, time(hour, self.rng.randrange(60), self.rng.randrange(60)))
+        return timezone.make_aware(naive)
+
+    def days(self, start, end):
+        day = start
+        while day <= end:
+            yield day
+            day += timedelta(days=1)
+
+    def save(self, model, objs):
+        with transaction.atomic():
+            created = model.objects.bulk_create(objs, batch_size=self.batch_size)
+        self.stdout.write(f'{model.__name__}: {len(created)}')
+        return created
+
+    def generate_users(self):
+        password = make_password(self.password)
+        span = (self.today - self.start).days
+        users = []
+        for n in range(int(USERS * self.scale)):
+            joined = self.moment(self.start + timedelta(days=self.rng.randrange(span)))
+            users.append(User(
+                email=f'guest{n}@{EMAIL_DOMAIN}',
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                phone=f'09{self.rng.randrange(10 ** 9):09d}',
+                password=password,
+                date_joined=joined,
+            ))
+        users.append(User(
+            email=f'staff@{EMAIL_DOMAIN}', first_name='Front', last_name='Desk',
+            password=password, is_staff=True, date_joined=self.moment(self.start),
+        ))
+        return self.save(User, users)
+
+    def generate_bookings(self, users):
+        guests = [u for u in users if not u.is_staff]
+        taken = set()
+        bookings = []
+        for day in self.days(self.start, self.end):
+            for _ in range(self.count_for(day, BOOKINGS_PER_DAY)):
+                room = self.rng.choice(self.rooms)
+                slots = self.pick_slots(room, day, taken)
+                if not slots:
+                    continue
+                created = self.moment(max(self.start, day - timedelta(days=self.rng.randrange(30))))
+                created = min(created, self.latest)
+                dates = [s['date'] for s in slots]
+                bookings.append(Booking(
+                    user=self.rng.choice(guests),
+                    room=room,
+                    check_in=min(dates),
+                    check_out=max(dates),
+                    guests=self.rng.randint(1, room.capacity),
+                    slots=slots,
+                    total_price=self.price(room, slots),
+                    status=self.booking_status(day),
+                    created_at=created,
+                    updated_at=created,
+                ))
+        return self.save(Booking, bookings)
+
+    def pick_slots(self, room, day, taken):
+        kinds = ['day'] if room.is_day_only else self.rng.choice([['day'], ['night'], ['day', 'night']])
+        length = self.rng.choices([1, 2, 3], [70, 20, 10])[0]
+        slots = [
+            {'date': (day + timedelta(days=offset)).isoformat(), 'slot': kind}
+            for offset in range(length) for kind in kinds
+        ]
+        keys = {(room.pk, s['date'], s['slot']) for s in slots}
+        if keys & taken:
+            return None
+        taken |= keys
+        return slots
+
+    def price(self, room, slots):
+        day_price = room.day_price or Decimal('0')
+        night_price = room.night_price or room.day_price
+        return sum(night_price if s['slot'] == 'night' else day_price for s in slots)
+
+    def booking_status(self, day):
+        if day < self.today:
+            return self.rng.choices(['completed', 'cancelled', 'confirmed'], [80, 15, 5])[0]
+        return self.rng.choices(['confirmed', 'pending', 'cancelled'], [60, 30, 10])[0]
+
+    def generate_payments(self, bookings):
+        payments = []
+        for booking in bookings:
+            if booking.status == 'pending' and self.rng.random() < 0.5:
+                continue
+            payment_type = self.rng.choices(['full', 'downpayment'], [60, 40])[0]
+            amount = booking.total_price
+            if payment_type == 'downpayment':
+                amount = (amount * Decimal('0.2')).quantize(Decimal('0.01'))
+            status = {
+                'pending': 'pending',
+                'cancelled': self.rng.choice(['failed', 'refunded']),
+            }.get(booking.status, 'succeeded')
+            payments.append(Payment(
+                booking=booking,
+                gcash_reference=f'{self.rng.randrange(10 ** 13):013d}',
+                payment_type=payment_type,
+                amount=amount,
+                status=status,
+                created_at=booking.created_at,
+                updated_at=booking.created_at,
+            ))
+        self.save(Payment, payments)
+
+    def generate_voucher_usages(self, bookings):
+        vouchers = [
+            Voucher(
+                code=VOUCHER_CODE.format(year=year, n=n),
+                discount_type='percentage' if n % 2 else 'fixed',
+                discount_value=Decimal('10') if n % 2 else Decimal('200'),
+                valid_from=timezone.make_aware(datetime(year, 1, 1)),
+                valid_until=timezone.make_aware(datetime(year, 12, 31, 23, 59)),
+                created_at=timezone.make_aware(datetime(year, 1, 1)),
+            )
+            for year in range(self.start.year, self.end.year + 1)
+            for n in range(4)
+        ]
+        by_code = {v.code: v for v in self.save(Voucher, vouchers)}
+        usages = []
+        for booking in bookings:
+            if booking.status == 'cancelled' or self.rng.random() > 0.08:
+                continue
+            voucher = by_code[VOUCHER_CODE.format(year=booking.created_at.year, n=self.rng.randrange(4))]
+            if voucher.discount_type == 'percentage':
+                discount = (booking.total_price * voucher.discount_value / 100).quantize(Decimal('0.01'))
+            else:
+                discount = min(voucher.discount_value, booking.total_price)
+            voucher.times_used += 1
+            usages.append(VoucherUsage(
+                voucher=voucher, booking=booking, user_id=booking.user_id,
+                discount_amount=discount, created_at=booking.created_at,
+            ))
+        self.save(VoucherUsage, usages)
+        Voucher.objects.bulk_update(by_code.values(), ['times_used'])
+
+    def generate_chats(self, users):
+        staff = next(u for u in users if u.is_staff)
+        conversations = []
+        threads = []
+        for user in users:
+            if user.is_staff or self.rng.random() > 0.1:
+                continue
+            opened = self.moment(user.date_joined.date())
+            status = 'open' if self.rng.random() < 0.15 else 'resolved'
+            conversations.append(Conversation(
+                customer=user, subject=self.rng.choice(CHAT_SUBJECTS), status=status,
+                created_at=opened, updated_at=opened,
+            ))
+            threads.append(self.rng.randint(2, 10))
+        conversations = self.save(Conversation, conversations)
+
+        messages = []
+        for conversation, length in zip(conversations, threads):
+            sent = conversation.created_at
+            for n in range(length):
+                staff_reply = n % 2 == 1
+                sent += timedelta(minutes=self.rng.randint(1, 240))
+                messages.append(Message(
+                    conversation=conversation,
+                    sender=staff if staff_reply else conversation.customer,
+                    content='Thank you for reaching out!' if staff_reply else 'Hi, is this available?',
+                    is_staff_reply=staff_reply,
+                    # The tail of open conversations is still waiting for the other side.
+                    is_read=conversation.status == 'resolved' or n < length - 1,
+                    created_at=sent,
+                ))
+            conversation.updated_at = sent
+        self.save(Message, messages)
+        Conversation.objects.bulk_update(conversations, ['updated_at'], batch_size=self.batch_size)
+
+    def generate_page_views(self):
+        paths = PAGES + [f'/rooms/{room.pk}' for room in self.rooms]
+        batch = []
+        total = 0
+        for day in self.days(self.start, self.today):
+            remaining = self.count_for(day, PAGE_VIEWS_PER_DAY)
+            while remaining > 0:
+                visitor = f'{VISITOR_PREFIX}{self.rng.getrandbits(128):032x}'
+                viewed = self.moment(day)
+                for _ in range(min(remaining, self.rng.randint(1, 6))):
+                    batch.append(PageView(visitor_id=visitor, page_path=self.rng.choice(paths), timestamp=viewed))
+                    viewed += timedelta(seconds=self.rng.randint(5, 300))
+                    remaining -= 1
+            if len(batch) >= self.batch_size:
+                total += len(batch)
+                with transaction.atomic():
+                    PageView.objects.bulk_create(batch, batch_size=self.batch_size)
+                batch = []
+        if batch:
+            total += len(batch)
+            PageView.objects.bulk_create(batch, batch_size=self.batch_size)
+        self.stdout.write(f'PageView: {total}')
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pageview',
+            index=models.Index(fields=['timestamp', 'visitor_id'], name='pageview_timestamp_visitor_idx'),
+        ),
+    ]
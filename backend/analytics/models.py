@@ -8,6 +8,10 @@ class PageView(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            # Dashboard windows (last 30/90 days) grouped by visitor.
+            models.Index(fields=['timestamp', 'visitor_id'], name='pageview_timestamp_visitor_idx'),
+        ]
 
     def __str__(self):
         return f'{self.page_path} - {self.visitor_id[:8]} - {self.timestamp}'
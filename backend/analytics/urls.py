@@ -4,4 +4,9 @@ from . import views
 urlpatterns = [
     path('track/', views.track_page_view, name='track-page-view'),
     path('dashboard/', views.admin_dashboard, name='admin-dashboard'),
+    path('metrics/', views.metrics, name='metrics'),
+    path('cache/', views.cache_stats, name='cache-stats'),
+    path('profiles/', views.profiles, name='profiles'),
+    path('profiles/<str:profile_id>/', views.profile_download, name='profile-download'),
+    path('export/<slug:dataset>/', views.export_data, name='export-data'),
 ]
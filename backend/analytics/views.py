@@ -2,20 +2,25 @@ from rest_framework.decorators import api_view, permission_classes, throttle_cla
 from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.throttling import ScopedRateThrottle
 from django.db.models import Count, Sum, Max, F, Value, Q
 from django.db.models.functions import Concat, TruncDate, TruncMonth
-from datetime import timedelta, date
+from datetime import datetime, time, timedelta, date
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 
 from .models import PageView
 from .serializers import TrackPageViewSerializer
+from hotel.cache import cache_stats as get_cache_stats
+from hotel.metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
+from hotel.profiling import list_profiles, profile_path
+from hotel.streaming import buffered, csv_lines, gzipped, jsonl_lines
+from hotel.throttling import SlidingWindowScopedRateThrottle
 from bookings.models import Booking
 from payments.models import Payment
 from rooms.models import Room
 
 
-class AnalyticsRateThrottle(ScopedRateThrottle):
+class AnalyticsRateThrottle(SlidingWindowScopedRateThrottle):
     scope = 'analytics'
 
 
@@ -210,3 +215,138 @@ def admin_dashboard(request):
         'revenue_by_day': revenue_by_day,
         'room_occupancy': room_occupancy,
     })
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _export_bookings():
+    columns = (
+        'id', 'guest_email', 'guest_first_name', 'guest_last_name', 'room', 'check_in', 'check_out',
+        'guests', 'slots', 'total_price', 'status', 'created_at',
+    )
+    qs = Booking.objects.order_by('id').values_list(
+        'id', 'user__email', 'user__first_name', 'user__last_name', 'room__name', 'check_in', 'check_out',
+        'guests', 'slots', 'total_price', 'status', 'created_at',
+    )
+    return columns, qs, 'created_at'
+
+
+def _export_guests():
+    columns = ('user_id', 'guest_name', 'email', 'phone', 'total_bookings', 'total_spent', 'last_booking')
+    qs = (
+        Booking.objects
+        .filter(status__in=['confirmed', 'completed'])
+        .values('user__id')
+        .annotate(
+            guest_name=Concat(F('user__first_name'), Value(' '), F('user__last_name')),
+            email=F('user__email'),
+            phone=F('user__phone'),
+            total_bookings=Count('id'),
+            total_spent=Sum('total_price'),
+            last_booking=Max('created_at'),
+        )
+        .order_by('user__id')
+        .values_list('user__id', 'guest_name', 'email', 'phone', 'total_bookings', 'total_spent', 'last_booking')
+    )
+    return columns, qs, 'created_at'
+
+
+def _export_payments():
+    columns = ('id', 'booking_id', 'gcash_reference', 'payment_type', 'amount', 'currency', 'status', 'created_at')
+    return columns, Payment.objects.order_by('id').values_list(*columns), 'created_at'
+
+
+def _export_page_views():
+    columns = ('id', 'visitor_id', 'page_path', 'timestamp')
+    return columns, PageView.objects.order_by('id').values_list(*columns), 'timestamp'
+
+
+EXPORTS = {
+    'bookings': _export_bookings,
+    'guests': _export_guests,
+    'payments': _export_payments,
+    'page-views': _export_page_views,
+}
+
+
+def _parse_day(value):
+    if not value:
+        return None
+    try:
+        return timezone.make_aware(datetime.combine(date.fromisoformat(value), time.min))
+    except ValueError:
+        return False
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_data(request, dataset):
+    """
+    Stream a dataset as CSV (default) or JSON Lines: ?output=jsonl.
+
+    ?start=YYYY-MM-DD / ?end=YYYY-MM-DD filter on creation time (end is
+    inclusive) and ?gzip=1 compresses on the fly. Rows are read with a
+    chunked iterator, so memory use does not grow with the table.
+    """
+    if dataset not in EXPORTS:
+        return Response({'detail': 'Unknown export.'}, status=status.HTTP_404_NOT_FOUND)
+    output = request.query_params.get('output', 'csv')
+    if output not in ('csv', 'jsonl'):
+        return Response({'detail': 'output must be csv or jsonl.'}, status=status.HTTP_400_BAD_REQUEST)
+    start = _parse_day(request.query_params.get('start'))
+    end = _parse_day(request.query_params.get('end'))
+    if start is False or end is False:
+        return Response({'detail': 'Dates must be YYYY-MM-DD.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    columns, qs, date_field = EXPORTS[dataset]()
+    if start:
+        qs = qs.filter(**{f'{date_field}__gte': start})
+    if end:
+        qs = qs.filter(**{f'{date_field}__lt': end + timedelta(days=1)})
+
+    rows = qs.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    lines = csv_lines(columns, rows) if output == 'csv' else jsonl_lines(columns, rows)
+    body = buffered(lines)
+    filename = f'{dataset}.{output}'
+    content_type = 'text/csv' if output == 'csv' else 'application/x-ndjson'
+    if request.query_params.get('gzip') in ('1', 'true'):
+        body = gzipped(body)
+        filename += '.gz'
+        content_type = 'application/gzip'
+
+    response = StreamingHttpResponse(body, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    """Request, DB and slow-SQL metrics from all workers in Prometheus text format."""
+    return HttpResponse(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profiles(request):
+    """Most recent request profiles, newest first."""
+    return Response(list_profiles())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_download(request, profile_id):
+    """Download a profile summary (JSON) or the raw cProfile dump: ?output=prof."""
+    ext = 'prof' if request.query_params.get('output') == 'prof' else 'json'
+    path = profile_path(profile_id, ext)
+    if path is None:
+        return Response({'detail': 'Profile not found.'}, status=status.HTTP_404_NOT_FOUND)
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'{profile_id}.{ext}')
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """Cache backend, size and per-namespace hit rates (hit rates are for the answering worker)."""
+    return Response(get_cache_stats())
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.utils.safestring import mark_safe
-from .models import Booking
+from .models import ACTIVE_BOOKING_STATUSES, Booking, BookingStatus, WaitlistEntry
+from .waitlist import release_slots
+from outbox.services import booking_payload, record_booking_event, record_event, record_payment_event
 from payments.models import Payment
 
 
@@ -29,3 +31,45 @@ class BookingAdmin(admin.ModelAdmin):
     @admin.display(description='Slots')
     def get_slots_summary(self, obj):
         return obj.slots_summary
+
+    def save_model(self, request, obj, form, change):
+        # The admin wraps each save in a transaction, so the events commit with it.
+        super().save_model(request, obj, form, change)
+        if not change:
+            record_booking_event(obj, 'booking.created')
+            return
+        if any(field in form.changed_data for field in ('room', 'check_in', 'check_out', 'slots')):
+            self.record_move(obj, form.initial)
+        if 'status' in form.changed_data:
+            previous_status = form.initial.get('status')
+            record_booking_event(obj, 'booking.status_changed', previous_status)
+            if obj.status == BookingStatus.CANCELLED and previous_status in ACTIVE_BOOKING_STATUSES:
+                release_slots([obj])
+
+    def record_move(self, obj, initial):
+        previous_room = initial['room']
+        record_event('booking', obj.pk, 'booking.updated', {
+            **booking_payload(obj),
+            'previous_room_id': previous_room,
+            'previous_check_in': str(initial['check_in']),
+            'previous_check_out': str(initial['check_out']),
+        })
+        if initial['status'] in ACTIVE_BOOKING_STATUSES:
+            # Slots the booking no longer holds are freed, whatever its new status.
+            kept = {(obj.room_id, entry['date'], entry['slot']) for entry in obj.slots}
+            freed = [entry for entry in initial['slots'] if (previous_room, entry['date'], entry['slot']) not in kept]
+            release_slots([Booking(pk=obj.pk, room_id=previous_room, slots=freed)])
+
+    def save_formset(self, request, form, formset, change):
+        super().save_formset(request, form, formset, change)
+        for payment_form in formset.forms:
+            if payment_form.instance.pk and 'status' in payment_form.changed_data:
+                record_payment_event(payment_form.instance, 'payment.status_changed', payment_form.initial.get('status'))
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ('user', 'room', 'date', 'slot', 'guests', 'created_at')
+    list_filter = ('slot', 'room')
+    search_fields = ('user__email', 'room__name')
+    raw_id_fields = ('user',)
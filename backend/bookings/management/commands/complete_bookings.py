@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from bookings.tasks import complete_past_bookings
+
+
+class Command(BaseCommand):
+    help = 'Mark confirmed bookings whose stay is over as completed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        count = complete_past_bookings(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Completed {count} booking(s).'))
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-19 17:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0006_waitlist'),
+        ('rooms', '0006_room_calendars'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='booking_room_status_dates_idx',
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('status__in', ['confirmed', 'pending'])), fields=['room', 'check_in', 'check_out'], name='booking_active_slot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['status', 'check_out'], name='booking_status_checkout_idx'),
+        ),
+    ]
@@ -9,6 +9,10 @@ class BookingStatus(models.TextChoices):
     COMPLETED = 'completed', 'Completed'
 
 
+# Bookings holding their slots; matches the condition of booking_active_slot_idx.
+ACTIVE_BOOKING_STATUSES = [BookingStatus.CONFIRMED, BookingStatus.PENDING]
+
+
 class Booking(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='bookings')
     room = models.ForeignKey('rooms.Room', on_delete=models.PROTECT, related_name='bookings')
@@ -25,6 +29,21 @@ class Booking(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Slot conflict checks only ever look at live bookings, so completed and
+            # cancelled history stays out of this index. Postgres matches it when the
+            # query filters on status__in=ACTIVE_BOOKING_STATUSES; SQLite cannot match
+            # a partial index against bound parameters and uses the room index instead.
+            models.Index(
+                fields=['room', 'check_in', 'check_out'],
+                condition=models.Q(status__in=['confirmed', 'pending']),
+                name='booking_active_slot_idx',
+            ),
+            # Completion of past stays and occupancy over history.
+            models.Index(fields=['status', 'check_out'], name='booking_status_checkout_idx'),
+            # Expiry of unpaid bookings and dashboard counts.
+            models.Index(fields=['status', 'created_at'], name='booking_status_created_idx'),
+        ]
 
     def __str__(self):
         return f'Booking #{self.id} - {self.user.email} - {self.room.name}'
@@ -39,3 +58,30 @@ class Booking(models.Model):
         if night_count:
             parts.append(f'{night_count} night')
         return ' + '.join(parts) or 'No slots'
+
+
+class SlotType(models.TextChoices):
+    DAY = 'day', 'Day'
+    NIGHT = 'night', 'Night'
+
+
+class WaitlistEntry(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='waitlist_entries')
+    room = models.ForeignKey('rooms.Room', on_delete=models.CASCADE, related_name='waitlist_entries')
+    date = models.DateField()
+    slot = models.CharField(max_length=10, choices=SlotType.choices)
+    guests = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'room', 'date', 'slot'], name='waitlist_one_entry_per_slot'),
+        ]
+        indexes = [
+            # Matching freed slots against the waitlist.
+            models.Index(fields=['room', 'date', 'slot'], name='waitlist_slot_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.user.email} waiting for {self.room.name} {self.date} ({self.slot})'
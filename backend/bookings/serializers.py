@@ -1,15 +1,19 @@
 from datetime import date, timedelta
 from decimal import Decimal
 from rest_framework import serializers
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 from django.utils import timezone
-from .models import Booking
+from .models import Booking, WaitlistEntry
+from .waitlist import slot_is_free
 from rooms.serializers import RoomListSerializer
+from hotel.sparse_fields import SparseFieldsMixin
+from outbox.services import record_booking_event
 
 PAYMENT_DEADLINE_HOURS = 24
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     room_detail = RoomListSerializer(source='room', read_only=True)
     slots_summary = serializers.CharField(read_only=True)
     payment_submitted = serializers.SerializerMethodField()
@@ -27,6 +31,10 @@ class BookingSerializer(serializers.ModelSerializer):
             'payment_deadline', 'payment_type', 'payment_amount',
         )
         read_only_fields = ('id', 'check_in', 'check_out', 'total_price', 'status', 'created_at')
+        compact_fields = (
+            'id', 'room', 'check_in', 'check_out', 'guests', 'slots_summary',
+            'total_price', 'status', 'created_at', 'payment_submitted', 'payment_deadline',
+        )
 
     def get_payment_submitted(self, obj):
         return hasattr(obj, 'payment')
@@ -149,7 +157,10 @@ class BookingSerializer(serializers.ModelSerializer):
         validated_data['total_price'] = total
 
         validated_data['user'] = self.context['request'].user
-        return super().create(validated_data)
+        with transaction.atomic():
+            booking = super().create(validated_data)
+            record_booking_event(booking, 'booking.created')
+        return booking
 
 
 class BookingCreateSerializer(BookingSerializer):
@@ -160,7 +171,7 @@ class BookingCreateSerializer(BookingSerializer):
         )
 
 
-class AdminBookingSerializer(serializers.ModelSerializer):
+class AdminBookingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     guest_name = serializers.SerializerMethodField()
     guest_email = serializers.CharField(source='user.email', read_only=True)
     room_name = serializers.CharField(source='room.name', read_only=True)
@@ -178,6 +189,49 @@ class AdminBookingSerializer(serializers.ModelSerializer):
             'check_in', 'check_out', 'guests', 'slots_summary',
             'total_price', 'created_at',
         )
+        compact_fields = (
+            'id', 'guest_name', 'guest_email', 'room', 'room_name',
+            'check_in', 'check_out', 'guests', 'slots_summary',
+            'total_price', 'status', 'created_at',
+        )
 
     def get_guest_name(self, obj):
         return f'{obj.user.first_name} {obj.user.last_name}'.strip() or obj.user.email
+
+
+ALREADY_WAITLISTED = 'You are already on the waitlist for this slot.'
+
+
+class WaitlistEntrySerializer(serializers.ModelSerializer):
+    room_name = serializers.CharField(source='room.name', read_only=True)
+
+    class Meta:
+        model = WaitlistEntry
+        fields = ('id', 'room', 'room_name', 'date', 'slot', 'guests', 'created_at')
+        read_only_fields = ('id', 'created_at')
+
+    def validate(self, data):
+        room = data['room']
+        if not room.is_active:
+            raise serializers.ValidationError({'room': 'Room not found.'})
+        if data['date'] < timezone.localdate():
+            raise serializers.ValidationError({'date': 'This date has passed.'})
+        if room.is_day_only and data['slot'] == 'night':
+            raise serializers.ValidationError('This accommodation is available for day tours only.')
+        if data.get('guests', 1) > room.capacity:
+            raise serializers.ValidationError(f'This room fits max {room.capacity} persons.')
+        if slot_is_free(room.pk, data['date'], data['slot']):
+            raise serializers.ValidationError('This slot is available; book it directly.')
+        user = self.context['request'].user
+        if WaitlistEntry.objects.filter(user=user, room=room, date=data['date'], slot=data['slot']).exists():
+            raise serializers.ValidationError(ALREADY_WAITLISTED)
+        return data
+
+    def create(self, validated_data):
+        validated_data['user'] = self.context['request'].user
+        try:
+            # A concurrent request for the same slot can pass validate(); the unique constraint decides.
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError(ALREADY_WAITLISTED)
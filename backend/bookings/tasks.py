@@ -0,0 +1,81 @@
+from datetime import date, datetime, time, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from outbox.services import booking_payload, record_events
+from rooms.calendar import RESORT_TZ, slot_end
+from tasks.services import task
+from .models import Booking, BookingStatus
+from .waitlist import release_slots
+
+PAYMENT_DEADLINE_HOURS = 24
+
+
+@task(every=timedelta(minutes=15))
+def cancel_expired_bookings():
+    """Cancel pending bookings that have not been paid within 24 hours."""
+    deadline = timezone.now() - timedelta(hours=PAYMENT_DEADLINE_HOURS)
+    with transaction.atomic():
+        expired = list(
+            Booking.objects.select_for_update(of=('self',)).filter(
+                status=BookingStatus.PENDING,
+                created_at__lt=deadline,
+            ).exclude(payment__isnull=False)
+        )
+        Booking.objects.filter(pk__in=[b.pk for b in expired]).update(status=BookingStatus.CANCELLED)
+        for booking in expired:
+            booking.status = BookingStatus.CANCELLED
+        record_events([
+            ('booking', b.pk, 'booking.status_changed', booking_payload(b, BookingStatus.PENDING)) for b in expired
+        ])
+        release_slots(expired)
+    return len(expired)
+
+
+def _stay_end(booking):
+    """When the last slot of ``booking`` ends; a night slot runs until the next morning."""
+    ends = [slot_end(date.fromisoformat(entry['date']), entry['slot']) for entry in booking.slots]
+    return max(ends, default=datetime.combine(booking.check_out + timedelta(days=1), time(), RESORT_TZ))
+
+
+def _complete(bookings):
+    Booking.objects.filter(pk__in=[b.pk for b in bookings]).update(status=BookingStatus.COMPLETED)
+    for booking in bookings:
+        booking.status = BookingStatus.COMPLETED
+    record_events([
+        ('booking', b.pk, 'booking.status_changed', booking_payload(b, BookingStatus.CONFIRMED)) for b in bookings
+    ])
+
+
+@task(every=timedelta(hours=1))
+def complete_past_bookings(chunk_size=500):
+    """Complete confirmed bookings whose last slot has ended, one chunk per transaction."""
+    now = timezone.now()
+    today = now.astimezone(RESORT_TZ).date()
+    # Night slots end last, the morning after their date; every booking checking out by
+    # ``ended_by`` is over whatever its slots.
+    ended_by = today - timedelta(days=1)
+    if slot_end(ended_by, 'night') > now:
+        ended_by -= timedelta(days=1)
+    total = 0
+    while True:
+        with transaction.atomic():
+            finished = list(
+                Booking.objects.select_for_update().filter(
+                    status=BookingStatus.CONFIRMED,
+                    check_out__lte=ended_by,
+                ).order_by('check_out', 'pk')[:chunk_size]
+            )
+            if not finished:
+                break
+            _complete(finished)
+        total += len(finished)
+    # The last day or two of check-outs: done once their last slot has ended, e.g. day slots at 17:00.
+    with transaction.atomic():
+        recent = Booking.objects.select_for_update().filter(
+            status=BookingStatus.CONFIRMED, check_out__gt=ended_by, check_out__lte=today,
+        )
+        finished = [booking for booking in recent if _stay_end(booking) <= now]
+        _complete(finished)
+    return total + len(finished)
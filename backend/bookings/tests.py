@@ -0,0 +1,157 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from notifications.models import Notification, NotificationKind, NotificationStatus
+from notifications.services import send_pending
+from outbox.models import OutboxEvent
+from rooms.calendar import RESORT_TZ
+from rooms.models import Room
+from .models import Booking, BookingStatus, WaitlistEntry
+from .tasks import complete_past_bookings
+from .waitlist import release_slots, slot_is_free
+
+
+class WaitlistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.guest = User.objects.create_user('guest@example.com', 'pw', first_name='Guest', last_name='User')
+        self.waiting = User.objects.create_user('waiting@example.com', 'pw', first_name='Wait', last_name='Listed')
+        self.room = Room.objects.create(name='Cottage 1', description='', day_price=Decimal('500'))
+        self.day = timezone.localdate() + timedelta(days=7)
+        self.booking = self.book(self.day)
+
+    def book(self, day, slot='day'):
+        return Booking.objects.create(
+            user=self.guest, room=self.room, check_in=day, check_out=day,
+            slots=[{'date': day.isoformat(), 'slot': slot}], total_price=Decimal('500'),
+        )
+
+    def wait(self, day, slot='day', room=None):
+        return WaitlistEntry.objects.create(user=self.waiting, room=room or self.room, date=day, slot=slot)
+
+    def cancel(self, booking):
+        booking.status = BookingStatus.CANCELLED
+        booking.save()
+        return release_slots([booking])
+
+    def test_cancellation_notifies_matching_entries_only(self):
+        match = self.wait(self.day)
+        self.wait(self.day, slot='night')
+        self.wait(self.day + timedelta(days=1))
+        self.wait(self.day, room=Room.objects.create(name='Cottage 2', description='', day_price=Decimal('500')))
+
+        self.assertEqual(self.cancel(self.booking), 1)
+        notification = Notification.objects.get()
+        self.assertEqual(
+            (notification.kind, notification.waitlist_entry, notification.to_email),
+            (NotificationKind.WAITLIST_OPENING, match, 'waiting@example.com'),
+        )
+
+    def test_past_slots_are_ignored(self):
+        past = timezone.localdate() - timedelta(days=1)
+        self.wait(past)
+        self.assertEqual(self.cancel(self.book(past)), 0)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_release_is_deduplicated(self):
+        self.wait(self.day)
+        self.cancel(self.booking)
+        release_slots([self.booking])
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_cancel_view_releases_slots(self):
+        self.wait(self.day)
+        response = self.client.delete(
+            f'/api/bookings/{self.booking.pk}/', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.guest)}',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Notification.objects.filter(kind=NotificationKind.WAITLIST_OPENING).count(), 1)
+
+    def test_duplicate_join_racing_validation_is_rejected(self):
+        url = '/api/bookings/waitlist/'
+        data = {'room': self.room.pk, 'date': self.day.isoformat(), 'slot': 'day'}
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.waiting)}'}
+        self.assertEqual(self.client.post(url, data, **auth).status_code, 201)
+        # A concurrent request that ran its duplicate check before the first insert.
+        with mock.patch('django.db.models.QuerySet.exists', return_value=False):
+            response = self.client.post(url, data, **auth)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(WaitlistEntry.objects.count(), 1)
+
+    def test_slot_is_free(self):
+        self.assertFalse(slot_is_free(self.room.pk, self.day, 'day'))
+        self.assertTrue(slot_is_free(self.room.pk, self.day, 'night'))
+        Booking.objects.filter(pk=self.booking.pk).update(status=BookingStatus.CANCELLED)
+        self.assertTrue(slot_is_free(self.room.pk, self.day, 'day'))
+
+    def test_opening_skipped_once_slot_is_rebooked(self):
+        entry = self.wait(self.day)
+        self.cancel(self.booking)
+        self.book(self.day)
+        send_pending()
+        self.assertEqual(entry.notifications.get().status, NotificationStatus.SKIPPED)
+        self.assertEqual(mail.outbox, [])
+
+
+class CompletePastBookingsTests(TestCase):
+    TODAY = date(2030, 1, 10)
+
+    def setUp(self):
+        self.guest = User.objects.create_user('guest@example.com', 'pw', first_name='Guest', last_name='User')
+        self.room = Room.objects.create(name='Cottage 1', description='', day_price=Decimal('500'))
+
+    def book(self, days_ago, slot='day', status=BookingStatus.CONFIRMED):
+        day = self.TODAY - timedelta(days=days_ago)
+        return Booking.objects.create(
+            user=self.guest, room=self.room, check_in=day, check_out=day, status=status,
+            slots=[{'date': day.isoformat(), 'slot': slot}], total_price=Decimal('500'),
+        )
+
+    def complete(self, hour, **kwargs):
+        now = datetime.combine(self.TODAY, time(hour), RESORT_TZ)
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            return complete_past_bookings(**kwargs)
+
+    def statuses(self, *bookings):
+        return [Booking.objects.get(pk=b.pk).status for b in bookings]
+
+    def test_completes_in_chunks_and_records_events(self):
+        bookings = [self.book(days_ago) for days_ago in range(3, 8)]
+        self.assertEqual(self.complete(12, chunk_size=2), 5)
+        self.assertEqual(self.statuses(*bookings), [BookingStatus.COMPLETED] * 5)
+        events = OutboxEvent.objects.filter(event_type='booking.status_changed')
+        self.assertEqual(sorted(e.aggregate_id for e in events), sorted(b.pk for b in bookings))
+        self.assertEqual(
+            {(e.payload['previous_status'], e.payload['status']) for e in events},
+            {(BookingStatus.CONFIRMED, BookingStatus.COMPLETED)},
+        )
+        self.assertEqual(self.complete(12), 0)
+
+    def test_only_confirmed_bookings_complete(self):
+        pending = self.book(3, status=BookingStatus.PENDING)
+        cancelled = self.book(3, status=BookingStatus.CANCELLED)
+        self.assertEqual(self.complete(12), 0)
+        self.assertEqual(self.statuses(pending, cancelled), [BookingStatus.PENDING, BookingStatus.CANCELLED])
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_night_slot_completes_the_next_morning(self):
+        night = self.book(1, slot='night')
+        day = self.book(1)
+        self.assertEqual(self.complete(7), 1)
+        self.assertEqual(self.statuses(night, day), [BookingStatus.CONFIRMED, BookingStatus.COMPLETED])
+        self.assertEqual(self.complete(8), 1)
+        self.assertEqual(self.statuses(night), [BookingStatus.COMPLETED])
+
+    def test_day_slot_completes_once_it_ends(self):
+        today = self.book(0)
+        self.assertEqual(self.complete(16), 0)
+        self.assertEqual(self.complete(17), 1)
+        self.assertEqual(self.statuses(today), [BookingStatus.COMPLETED])
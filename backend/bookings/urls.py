@@ -6,5 +6,7 @@ urlpatterns = [
     path('onsite/', views.onsite_booking, name='onsite-booking'),
     path('admin/', views.AdminBookingListView.as_view(), name='admin-booking-list'),
     path('admin/<int:pk>/', views.AdminBookingDetailView.as_view(), name='admin-booking-detail'),
+    path('waitlist/', views.WaitlistListCreateView.as_view(), name='waitlist-list-create'),
+    path('waitlist/<int:pk>/', views.WaitlistDetailView.as_view(), name='waitlist-detail'),
     path('<int:pk>/', views.BookingDetailView.as_view(), name='booking-detail'),
 ]
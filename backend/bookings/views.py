@@ -6,11 +6,13 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 
 from django.contrib.auth import get_user_model
-from django.db.models import F
-from django.utils import timezone
+from django.db import transaction
+from outbox.services import record_booking_event
 from rooms.models import Room
-from .models import Booking, BookingStatus
-from .serializers import BookingSerializer, AdminBookingSerializer
+from .models import ACTIVE_BOOKING_STATUSES, Booking, BookingStatus, WaitlistEntry
+from .serializers import BookingSerializer, AdminBookingSerializer, WaitlistEntrySerializer
+from .waitlist import release_slots
+from vouchers.services import VoucherError, apply_voucher, redeem_voucher
 
 User = get_user_model()
 
@@ -20,7 +22,11 @@ class BookingListCreateView(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Booking.objects.filter(user=self.request.user).select_related('room')
+        return (
+            Booking.objects.filter(user=self.request.user)
+            .select_related('room', 'payment', 'voucher_usage')
+            .prefetch_related('room__images')
+        )
 
 
 class BookingDetailView(generics.RetrieveDestroyAPIView):
@@ -28,7 +34,11 @@ class BookingDetailView(generics.RetrieveDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Booking.objects.filter(user=self.request.user).select_related('room')
+        return (
+            Booking.objects.filter(user=self.request.user)
+            .select_related('room', 'payment', 'voucher_usage')
+            .prefetch_related('room__images')
+        )
 
     def destroy(self, request, *args, **kwargs):
         booking = self.get_object()
@@ -37,8 +47,12 @@ class BookingDetailView(generics.RetrieveDestroyAPIView):
                 {'detail': 'Cannot cancel a confirmed booking with payment. Contact support.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        previous_status = booking.status
         booking.status = BookingStatus.CANCELLED
-        booking.save()
+        with transaction.atomic():
+            booking.save()
+            record_booking_event(booking, 'booking.status_changed', previous_status)
+            release_slots([booking])
         return Response({'detail': 'Booking cancelled.'}, status=status.HTTP_200_OK)
 
 
@@ -133,45 +147,26 @@ def onsite_booking(request):
     voucher = None
 
     if voucher_code:
-        from vouchers.models import Voucher, VoucherUsage
         try:
-            voucher = Voucher.objects.get(code__iexact=voucher_code)
-        except Voucher.DoesNotExist:
-            return Response({'detail': 'Invalid voucher code.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        now = timezone.now()
-        if not voucher.is_active or now < voucher.valid_from or now > voucher.valid_until:
-            return Response({'detail': 'Voucher is not valid.'}, status=status.HTTP_400_BAD_REQUEST)
-        if voucher.max_uses is not None and voucher.times_used >= voucher.max_uses:
-            return Response({'detail': 'Voucher has reached its maximum uses.'}, status=status.HTTP_400_BAD_REQUEST)
-        if voucher.min_booking_amount and total < voucher.min_booking_amount:
-            return Response({'detail': 'Booking amount does not meet voucher minimum.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        if voucher.discount_type == 'percentage':
-            discount_amount = (total * voucher.discount_value / Decimal('100')).quantize(Decimal('0.01'))
-            discount_amount = min(discount_amount, total)
-        else:
-            discount_amount = min(voucher.discount_value, total)
-
+            voucher, discount_amount = apply_voucher(voucher_code, total)
+        except VoucherError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         total = total - discount_amount
 
-    booking = Booking.objects.create(
-        user=user, room=room,
-        check_in=min_date, check_out=max_date,
-        guests=guests, slots=slots,
-        total_price=total, status=BookingStatus.CONFIRMED,
-        special_requests=special_requests,
-    )
-
-    if voucher:
-        from vouchers.models import Voucher, VoucherUsage
-        Voucher.objects.filter(pk=voucher.pk).update(times_used=F('times_used') + 1)
-        VoucherUsage.objects.create(
-            voucher=voucher,
-            booking=booking,
-            user=user,
-            discount_amount=discount_amount,
-        )
+    try:
+        with transaction.atomic():
+            booking = Booking.objects.create(
+                user=user, room=room,
+                check_in=min_date, check_out=max_date,
+                guests=guests, slots=slots,
+                total_price=total, status=BookingStatus.CONFIRMED,
+                special_requests=special_requests,
+            )
+            if voucher:
+                redeem_voucher(voucher, booking, user, discount_amount)
+            record_booking_event(booking, 'booking.created')
+    except VoucherError as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     response_data = {
         'id': booking.id,
@@ -204,3 +199,35 @@ class AdminBookingDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = AdminBookingSerializer
     permission_classes = [IsAdminUser]
     queryset = Booking.objects.select_related('user', 'room').all()
+
+    def perform_update(self, serializer):
+        previous_status = serializer.instance.status
+        with transaction.atomic():
+            booking = serializer.save()
+            if booking.status != previous_status:
+                record_booking_event(booking, 'booking.status_changed', previous_status)
+                if booking.status == BookingStatus.CANCELLED and previous_status in ACTIVE_BOOKING_STATUSES:
+                    release_slots([booking])
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            record_booking_event(instance, 'booking.deleted')
+            if instance.status in ACTIVE_BOOKING_STATUSES:
+                release_slots([instance])
+            instance.delete()
+
+
+class WaitlistListCreateView(generics.ListCreateAPIView):
+    serializer_class = WaitlistEntrySerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return WaitlistEntry.objects.filter(user=self.request.user).select_related('room')
+
+
+class WaitlistDetailView(generics.DestroyAPIView):
+    serializer_class = WaitlistEntrySerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return WaitlistEntry.objects.filter(user=self.request.user)
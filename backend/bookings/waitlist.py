@@ -0,0 +1,52 @@
+"""
+Waitlist matching for freed booking slots.
+
+Every code path that cancels bookings passes them to ``release_slots`` inside
+the cancelling transaction. The freed (room, date, slot) keys of the whole
+batch are matched against the waitlist in one query, and each match becomes a
+queued notification that the notification sender delivers later.
+"""
+
+from datetime import date
+
+from django.utils import timezone
+
+from notifications.models import Notification, NotificationKind
+from .models import ACTIVE_BOOKING_STATUSES, Booking, WaitlistEntry
+
+
+def slot_is_free(room_id, day, slot):
+    bookings = Booking.objects.filter(
+        room_id=room_id, status__in=ACTIVE_BOOKING_STATUSES, check_in__lte=day, check_out__gte=day,
+    ).values_list('slots', flat=True)
+    key = {'date': day.isoformat(), 'slot': slot}
+    return not any(key in slots for slots in bookings)
+
+
+def release_slots(bookings):
+    """Queue waitlist notifications for the upcoming slots of cancelled ``bookings``; returns how many."""
+    today = timezone.localdate()
+    freed = {}
+    for booking in bookings:
+        for entry in booking.slots:
+            day = date.fromisoformat(entry['date'])
+            if day >= today:
+                freed.setdefault((booking.room_id, day, entry['slot']), booking.pk)
+    if not freed:
+        return 0
+
+    # One query for the batch: rooms and dates as IN lists on waitlist_slot_idx, exact keys checked here.
+    candidates = WaitlistEntry.objects.filter(
+        room_id__in={room for room, _, _ in freed},
+        date__in={day for _, day, _ in freed},
+    ).select_related('user')
+    notifications = [
+        Notification(
+            waitlist_entry=entry, kind=NotificationKind.WAITLIST_OPENING, to_email=entry.user.email,
+            dedupe_key=f'waitlist:{entry.pk}:{freed[(entry.room_id, entry.date, entry.slot)]}',
+        )
+        for entry in candidates
+        if (entry.room_id, entry.date, entry.slot) in freed
+    ]
+    Notification.objects.bulk_create(notifications, ignore_conflicts=True)
+    return len(notifications)
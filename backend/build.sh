@@ -6,5 +6,6 @@ cd "$(dirname "$0")"
 pip install -r requirements.txt
 python manage.py collectstatic --no-input
 python manage.py migrate
+python manage.py createcachetable
 python manage.py loaddata fixtures/rooms.json
 python manage.py loaddata fixtures/pricing.json
@@ -31,6 +31,10 @@ class Message(models.Model):
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            # Unread counts per conversation.
+            models.Index(fields=['conversation', 'is_read', 'is_staff_reply'], name='message_unread_idx'),
+        ]
 
     def __str__(self):
         return f'Message from {self.sender.get_full_name()} in "{self.conversation.subject}"'
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from hotel.sparse_fields import SparseFieldsMixin
 from .models import Conversation, Message
 
 
@@ -11,7 +12,7 @@ class MessageSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'sender', 'sender_name', 'is_staff_reply', 'is_read', 'created_at')
 
 
-class ConversationListSerializer(serializers.ModelSerializer):
+class ConversationListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     customer_name = serializers.CharField(source='customer.get_full_name', read_only=True)
     last_message = serializers.SerializerMethodField()
     unread_count = serializers.SerializerMethodField()
@@ -20,6 +21,7 @@ class ConversationListSerializer(serializers.ModelSerializer):
         model = Conversation
         fields = ('id', 'customer', 'customer_name', 'subject', 'status', 'created_at', 'updated_at', 'last_message', 'unread_count')
         read_only_fields = fields
+        compact_fields = ('id', 'customer_name', 'subject', 'status', 'updated_at', 'unread_count')
 
     def get_last_message(self, obj):
         msg = obj.messages.order_by('-created_at').first()
@@ -6,6 +6,7 @@ class News(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField()
     image = models.ImageField(upload_to='news/', blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     published_date = models.DateField()
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -23,6 +24,7 @@ class Event(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
     image = models.ImageField(upload_to='events/', blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     date = models.DateField()
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -39,6 +41,7 @@ class Promotion(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
     image = models.ImageField(upload_to='promotions/', blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     discount_info = models.CharField(max_length=200)
     valid_from = models.DateField()
     valid_until = models.DateField()
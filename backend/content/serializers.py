@@ -1,28 +1,41 @@
 from rest_framework import serializers
+from hotel.image_variants import image_srcset
+from hotel.sparse_fields import SparseFieldsMixin
 from .models import News, Event, Promotion, Pricing
 
 
-class NewsSerializer(serializers.ModelSerializer):
+class ImageSrcsetMixin(serializers.Serializer):
+    image_srcset = serializers.SerializerMethodField()
+
+    def get_image_srcset(self, obj):
+        return image_srcset(obj.image_variants, self.context.get('request'))
+
+
+class NewsSerializer(SparseFieldsMixin, ImageSrcsetMixin, serializers.ModelSerializer):
     class Meta:
         model = News
-        fields = ['id', 'title', 'content', 'image', 'published_date']
+        fields = ['id', 'title', 'content', 'image', 'image_srcset', 'published_date']
+        compact_fields = ['id', 'title', 'image', 'published_date']
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsMixin, ImageSrcsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Event
-        fields = ['id', 'title', 'description', 'image', 'date']
+        fields = ['id', 'title', 'description', 'image', 'image_srcset', 'date']
+        compact_fields = ['id', 'title', 'image', 'date']
 
 
-class PromotionSerializer(serializers.ModelSerializer):
+class PromotionSerializer(SparseFieldsMixin, ImageSrcsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Promotion
-        fields = ['id', 'title', 'description', 'image', 'discount_info', 'valid_from', 'valid_until']
+        fields = ['id', 'title', 'description', 'image', 'image_srcset', 'discount_info', 'valid_from', 'valid_until']
+        compact_fields = ['id', 'title', 'image', 'discount_info', 'valid_from', 'valid_until']
 
 
-class PricingSerializer(serializers.ModelSerializer):
+class PricingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     room_type_display = serializers.CharField(source='get_room_type_display', read_only=True)
 
     class Meta:
         model = Pricing
         fields = ['id', 'room_type', 'room_type_display', 'label', 'day_price', 'night_price', 'notes', 'order']
+        compact_fields = ['id', 'room_type', 'label', 'day_price', 'night_price']
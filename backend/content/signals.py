@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+
+from hotel.image_variants import delete_image_variants, ensure_image_variants
+from hotel.response_cache import bump_model_version
+from .models import News, Event, Promotion, Pricing
+
+for _model in (News, Event, Promotion, Pricing):
+    post_save.connect(bump_model_version, sender=_model, dispatch_uid=f'response-cache-{_model.__name__}')
+    post_delete.connect(bump_model_version, sender=_model, dispatch_uid=f'response-cache-{_model.__name__}')
+
+for _model in (News, Event, Promotion):
+    post_save.connect(ensure_image_variants, sender=_model, dispatch_uid=f'image-variants-{_model.__name__}')
+    post_delete.connect(delete_image_variants, sender=_model, dispatch_uid=f'image-variants-{_model.__name__}')
@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import NewsListView, EventListView, PromotionListView, PricingListView
+from .views import NewsListView, EventListView, PromotionListView, PricingListView, HomepageBundleView
 
 urlpatterns = [
     path('news/', NewsListView.as_view(), name='news-list'),
     path('events/', EventListView.as_view(), name='event-list'),
     path('promotions/', PromotionListView.as_view(), name='promotion-list'),
     path('pricing/', PricingListView.as_view(), name='pricing-list'),
+    path('bundle/', HomepageBundleView.as_view(), name='homepage-bundle'),
 ]
@@ -1,11 +1,18 @@
 from django.utils import timezone
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+from rooms.models import Room, RoomImage
+from rooms.serializers import RoomListSerializer
 from .models import News, Event, Promotion, Pricing
 from .serializers import NewsSerializer, EventSerializer, PromotionSerializer, PricingSerializer
+from hotel.response_cache import CachedResponseMixin
 
 
-class NewsListView(ListAPIView):
+class NewsListView(CachedResponseMixin, ListAPIView):
+    cache_models = (News,)
     serializer_class = NewsSerializer
     permission_classes = [AllowAny]
 
@@ -13,7 +20,8 @@ class NewsListView(ListAPIView):
         return News.objects.filter(is_active=True)
 
 
-class EventListView(ListAPIView):
+class EventListView(CachedResponseMixin, ListAPIView):
+    cache_models = (Event,)
     serializer_class = EventSerializer
     permission_classes = [AllowAny]
 
@@ -21,7 +29,8 @@ class EventListView(ListAPIView):
         return Event.objects.filter(is_active=True, date__gte=timezone.now().date())
 
 
-class PromotionListView(ListAPIView):
+class PromotionListView(CachedResponseMixin, ListAPIView):
+    cache_models = (Promotion,)
     serializer_class = PromotionSerializer
     permission_classes = [AllowAny]
 
@@ -29,10 +38,37 @@ class PromotionListView(ListAPIView):
         return Promotion.objects.filter(is_active=True, valid_until__gte=timezone.now().date())
 
 
-class PricingListView(ListAPIView):
+class PricingListView(CachedResponseMixin, ListAPIView):
+    cache_models = (Pricing,)
     serializer_class = PricingSerializer
     permission_classes = [AllowAny]
     pagination_class = None
 
     def get_queryset(self):
         return Pricing.objects.all()
+
+
+class HomepageBundleView(CachedResponseMixin, APIView):
+    """Rooms, pricing, news, events and promotions for the landing page in one cached response."""
+    cache_models = (Room, RoomImage, News, Event, Promotion, Pricing)
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        return self.serve_cached(request, self.build_bundle, *args, **kwargs)
+
+    def build_bundle(self, request, *args, **kwargs):
+        today = timezone.now().date()
+        limit = api_settings.PAGE_SIZE
+        context = {'request': request}
+        rooms = Room.objects.filter(is_active=True).prefetch_related('images')
+        return Response({
+            'rooms': RoomListSerializer(rooms, many=True, context=context).data,
+            'pricing': PricingSerializer(Pricing.objects.all(), many=True, context=context).data,
+            'news': NewsSerializer(News.objects.filter(is_active=True)[:limit], many=True, context=context).data,
+            'events': EventSerializer(
+                Event.objects.filter(is_active=True, date__gte=today)[:limit], many=True, context=context,
+            ).data,
+            'promotions': PromotionSerializer(
+                Promotion.objects.filter(is_active=True, valid_until__gte=today)[:limit], many=True, context=context,
+            ).data,
+        })
@@ -0,0 +1,302 @@
+"""
+Shared cache backend and per-app key namespaces.
+
+``SQLiteCache`` keeps entries in one SQLite file (WAL mode), so every gunicorn
+worker on the host sees the same throttle counters, cached users and response
+versions without running a cache server. Integers are stored as native SQLite
+integers, which makes ``incr`` a single atomic UPDATE. Services on separate
+hosts share ``DatabaseCache`` instead, Django's database cache with an ``incr``
+that is just as safe.
+
+``NamespacedCache`` prefixes keys with the app name and a per-app version from
+``CACHE_NAMESPACE_VERSIONS``, so one app's entries can be invalidated on
+deploy without touching the others, and counts hits and misses per namespace.
+"""
+
+import base64
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.db import DatabaseCache as DjangoDatabaseCache
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+# Seconds a writer waits for another worker's lock before giving up.
+BUSY_TIMEOUT = 5
+# Expired entries are swept every this many writes per process.
+CULL_EVERY = 1000
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL) WITHOUT ROWID',
+    'CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)',
+)
+
+_NOT_EXPIRED = '(expires IS NULL OR expires > ?)'
+
+
+def _encode(value):
+    # bool is an int subclass but must round-trip as bool.
+    if type(value) is int:
+        return value
+    return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _decode(value):
+    return value if isinstance(value, int) else pickle.loads(value)
+
+
+class SQLiteCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.path = location
+        self._local = threading.local()
+        self._writes = 0
+
+    def _db(self):
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def _expires(self, timeout):
+        expires = self.get_backend_timeout(timeout)
+        return None if expires is None else float(expires)
+
+    def _wrote(self, count=1):
+        self._writes += count
+        if self._writes >= CULL_EVERY:
+            self._writes = 0
+            self._cull()
+
+    def _cull(self):
+        db = self._db()
+        db.execute('DELETE FROM cache WHERE expires <= ?', (time.time(),))
+        (count,) = db.execute('SELECT COUNT(*) FROM cache').fetchone()
+        if count > self._max_entries:
+            # Same policy as Django's database cache: drop 1/CULL_FREQUENCY, soonest to expire first.
+            db.execute(
+                'DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires IS NULL, expires LIMIT ?)',
+                (count // self._cull_frequency,),
+            )
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._db().execute(f'SELECT value FROM cache WHERE key = ? AND {_NOT_EXPIRED}', (key, time.time())).fetchone()
+        return default if row is None else _decode(row[0])
+
+    def get_many(self, keys, version=None):
+        keymap = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not keymap:
+            return {}
+        placeholders = ','.join('?' * len(keymap))
+        rows = self._db().execute(
+            f'SELECT key, value FROM cache WHERE key IN ({placeholders}) AND {_NOT_EXPIRED}',
+            (*keymap, time.time()),
+        )
+        return {keymap[key]: _decode(value) for key, value in rows}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._db().execute(
+            'INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires',
+            (key, _encode(value), self._expires(timeout)),
+        )
+        self._wrote()
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self._expires(timeout)
+        rows = [(self.make_and_validate_key(key, version=version), _encode(value), expires) for key, value in data.items()]
+        db = self._db()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            db.executemany(
+                'INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires',
+                rows,
+            )
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        self._wrote(len(rows))
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        # Inserts, or replaces an expired entry; a live entry is left alone.
+        cursor = self._db().execute(
+            'INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires '
+            'WHERE cache.expires IS NOT NULL AND cache.expires <= ?',
+            (key, _encode(value), self._expires(timeout), time.time()),
+        )
+        self._wrote()
+        return cursor.rowcount == 1
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._db().execute(
+            f'UPDATE cache SET expires = ? WHERE key = ? AND {_NOT_EXPIRED}',
+            (self._expires(timeout), key, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        db = self._db()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = db.execute(
+                f"UPDATE cache SET value = value + ? WHERE key = ? AND typeof(value) = 'integer' AND {_NOT_EXPIRED}",
+                (delta, key, time.time()),
+            )
+            if cursor.rowcount != 1:
+                raise ValueError(f"Key '{key}' not found")
+            (value,) = db.execute('SELECT value FROM cache WHERE key = ?', (key,)).fetchone()
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        return value
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._db().execute(f'SELECT 1 FROM cache WHERE key = ? AND {_NOT_EXPIRED}', (key, time.time())).fetchone()
+        return row is not None
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._db().execute('DELETE FROM cache WHERE key = ?', (key,)).rowcount == 1
+
+    def delete_many(self, keys, version=None):
+        keys = [(self.make_and_validate_key(key, version=version),) for key in keys]
+        self._db().executemany('DELETE FROM cache WHERE key = ?', keys)
+
+    def clear(self):
+        self._db().execute('DELETE FROM cache')
+
+    def stats(self):
+        db = self._db()
+        now = time.time()
+        (entries,) = db.execute(f'SELECT COUNT(*) FROM cache WHERE {_NOT_EXPIRED}', (now,)).fetchone()
+        (expired,) = db.execute('SELECT COUNT(*) FROM cache WHERE expires <= ?', (now,)).fetchone()
+        size = sum(os.path.getsize(p) for p in (self.path, f'{self.path}-wal') if os.path.exists(p))
+        # Keys look like "<KEY_PREFIX>:<version>:<namespace>:..." with the default key function.
+        namespaces = Counter(
+            key.split(':')[2] if key.count(':') >= 3 else '-'
+            for (key,) in db.execute(f'SELECT key FROM cache WHERE {_NOT_EXPIRED}', (now,))
+        )
+        return {'entries': entries, 'expired': expired, 'bytes': size, 'namespaces': dict(namespaces)}
+
+
+class DatabaseCache(DjangoDatabaseCache):
+    def incr(self, key, delta=1, version=None):
+        # The stock incr is a get and a set: concurrent increments get lost and the
+        # entry falls back to the default timeout. This one locks the row and keeps its expiry.
+        key = self.make_and_validate_key(key, version=version)
+        alias = router.db_for_write(self.cache_model_class)
+        connection = connections[alias]
+        quote_name = connection.ops.quote_name
+        table, cache_key, value_column = quote_name(self._table), quote_name('cache_key'), quote_name('value')
+        lock = ' FOR UPDATE' if connection.features.has_select_for_update else ''
+        now = connection.ops.adapt_datetimefield_value(timezone.now().replace(microsecond=0))
+        with transaction.atomic(using=alias), connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT {value_column} FROM {table} WHERE {cache_key} = %s AND {quote_name("expires")} > %s{lock}',
+                [key, now],
+            )
+            row = cursor.fetchone()
+            if row is None:
+                raise ValueError(f"Key '{key}' not found")
+            value = pickle.loads(base64.b64decode(connection.ops.process_clob(row[0]).encode())) + delta
+            encoded = base64.b64encode(pickle.dumps(value, self.pickle_protocol)).decode('latin1')
+            cursor.execute(f'UPDATE {table} SET {value_column} = %s WHERE {cache_key} = %s', [encoded, key])
+        return value
+
+
+# Per-process hit/miss counts by namespace, reported by the cache stats endpoint.
+lookups = Counter()
+_MISSING = object()
+
+
+class NamespacedCache:
+    """``cache`` calls under ``<namespace>:v<version>:`` keys."""
+
+    def __init__(self, namespace, alias='default'):
+        self.namespace = namespace
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, key):
+        version = settings.CACHE_NAMESPACE_VERSIONS.get(self.namespace, 1)
+        return f'{self.namespace}:v{version}:{key}'
+
+    def _count(self, hits, misses):
+        lookups[(self.namespace, 'hits')] += hits
+        lookups[(self.namespace, 'misses')] += misses
+
+    def get(self, key, default=None):
+        value = self.cache.get(self.key(key), _MISSING)
+        self._count(value is not _MISSING, value is _MISSING)
+        return default if value is _MISSING else value
+
+    def get_many(self, keys):
+        keymap = {self.key(key): key for key in keys}
+        found = self.cache.get_many(keymap)
+        self._count(len(found), len(keymap) - len(found))
+        return {keymap[key]: value for key, value in found.items()}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self.cache.set(self.key(key), value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT):
+        return self.cache.add(self.key(key), value, timeout)
+
+    def delete(self, key):
+        return self.cache.delete(self.key(key))
+
+    def incr(self, key, delta=1):
+        return self.cache.incr(self.key(key), delta)
+
+    def bump(self, key, initial=1):
+        """Increment a never-expiring counter, creating it with ``initial`` if missing."""
+        while True:
+            try:
+                return self.incr(key)
+            except ValueError:
+                # Only one of several concurrent creators wins the add; the others increment.
+                if self.add(key, initial, None):
+                    return initial
+
+
+def cache_stats():
+    """Backend, location and storage stats per configured cache, plus this worker's hit rates."""
+    backends = {}
+    for alias, config in settings.CACHES.items():
+        backend = caches[alias]
+        backends[alias] = {
+            'backend': config['BACKEND'],
+            'location': config.get('LOCATION', ''),
+            'stats': backend.stats() if hasattr(backend, 'stats') else None,
+        }
+    namespaces = {}
+    for (namespace, kind), count in sorted(lookups.items()):
+        namespaces.setdefault(namespace, {'hits': 0, 'misses': 0})[kind] = count
+    return {'caches': backends, 'worker': os.getpid(), 'lookups': namespaces}
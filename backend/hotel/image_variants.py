@@ -0,0 +1,151 @@
+"""
+Responsive derivatives (thumbnail / card / full, WebP + JPEG) for uploaded images.
+
+Variants are written next to the original through the default storage and
+recorded in the model's ``image_variants`` JSON field, so serializers can build
+a ``srcset`` without touching storage. ``render_variants`` only deals in bytes
+so it can run in a process pool (see the ``generate_image_variants`` command).
+Uploads are rendered by the task queue rather than in the admin request.
+"""
+
+import io
+import logging
+import os
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from tasks.services import task
+from .response_cache import bump_version
+
+logger = logging.getLogger(__name__)
+
+VARIANT_WIDTHS = {'thumbnail': 320, 'card': 800, 'full': 1600}
+VARIANT_FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+VARIANT_QUALITY = 80
+
+
+def render_variants(data):
+    """Return ``[(variant, width, ext, bytes), ...]`` for the original image bytes."""
+    with Image.open(io.BytesIO(data)) as original:
+        original = ImageOps.exif_transpose(original)
+        rendered = []
+        for variant, width in VARIANT_WIDTHS.items():
+            image = original.copy()
+            # thumbnail() never upscales, so small uploads keep their size.
+            image.thumbnail((width, width * 4), Image.Resampling.LANCZOS)
+            for ext, fmt in VARIANT_FORMATS.items():
+                out = io.BytesIO()
+                frame = image
+                if fmt == 'JPEG' and frame.mode != 'RGB':
+                    frame = frame.convert('RGBA')
+                    background = Image.new('RGB', frame.size, (255, 255, 255))
+                    background.paste(frame, mask=frame.getchannel('A'))
+                    frame = background
+                elif frame.mode not in ('RGB', 'RGBA'):
+                    frame = frame.convert('RGBA')
+                frame.save(out, fmt, quality=VARIANT_QUALITY, optimize=True)
+                rendered.append((variant, image.width, ext, out.getvalue()))
+        return rendered
+
+
+def variant_name(source, variant, ext):
+    base, _ = os.path.splitext(source)
+    return f'{base}__{variant}.{ext}'
+
+
+def needs_variants(instance, field='image'):
+    file = getattr(instance, field)
+    return bool(file) and instance.image_variants.get('source') != file.name
+
+
+def read_source(instance, field='image'):
+    file = getattr(instance, field)
+    with file.open('rb'):
+        return file.read()
+
+
+def save_variants(instance, rendered, field='image'):
+    """Store rendered variants next to the original and record them on ``instance``."""
+    source = getattr(instance, field).name
+    delete_variants(instance.image_variants)
+    variants = {}
+    for variant, width, ext, content in rendered:
+        entry = variants.setdefault(variant, {'width': width})
+        entry[ext] = default_storage.save(variant_name(source, variant, ext), ContentFile(content))
+    instance.image_variants = {'source': source, 'variants': variants}
+    type(instance).objects.filter(pk=instance.pk).update(image_variants=instance.image_variants)
+    # update() skips post_save, so invalidate cached API responses here.
+    bump_version(type(instance))
+
+
+def delete_variants(image_variants):
+    for entry in image_variants.get('variants', {}).values():
+        for ext in VARIANT_FORMATS:
+            if entry.get(ext):
+                try:
+                    default_storage.delete(entry[ext])
+                except Exception:
+                    # A missing old file must not block regeneration.
+                    logger.warning('Could not delete image variant %s', entry[ext])
+
+
+def generate_variants(instance, field='image'):
+    try:
+        rendered = render_variants(read_source(instance, field))
+    except (OSError, UnidentifiedImageError):
+        logger.exception('Could not generate variants for %s #%s', type(instance).__name__, instance.pk)
+        return
+    save_variants(instance, rendered, field)
+
+
+@task(max_attempts=2)
+def build_image_variants(model_label, pk):
+    instance = apps.get_model(model_label).objects.filter(pk=pk).first()
+    # The image may have been replaced or removed while the task was queued.
+    if instance is not None and needs_variants(instance):
+        generate_variants(instance)
+
+
+def ensure_image_variants(sender, instance, raw=False, **kwargs):
+    """post_save receiver: build variants when the image file changed."""
+    if raw:
+        return
+    if not instance.image:
+        if instance.image_variants:
+            delete_variants(instance.image_variants)
+            sender.objects.filter(pk=instance.pk).update(image_variants={})
+        return
+    if needs_variants(instance):
+        build_image_variants.delay(sender._meta.label, instance.pk)
+
+
+def delete_image_variants(sender, instance, **kwargs):
+    """post_delete receiver: remove the variant files once the deletion commits."""
+    if instance.image_variants:
+        variants = instance.image_variants
+        transaction.on_commit(lambda: delete_variants(variants))
+
+
+def image_srcset(image_variants, request=None):
+    """``{'webp': 'url 320w, url 800w, ...', 'jpeg': ...}`` or None when no variants exist."""
+    variants = image_variants.get('variants') if image_variants else None
+    if not variants:
+        return None
+    srcset = {}
+    for ext in VARIANT_FORMATS:
+        parts = []
+        widths = set()
+        for entry in sorted(variants.values(), key=lambda e: e['width']):
+            # Small originals produce several variants of the same width.
+            if entry.get(ext) and entry['width'] not in widths:
+                widths.add(entry['width'])
+                url = default_storage.url(entry[ext])
+                if request:
+                    url = request.build_absolute_uri(url)
+                parts.append(f'{url} {entry["width"]}w')
+        srcset[ext] = ', '.join(parts)
+    return srcset
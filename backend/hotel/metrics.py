@@ -0,0 +1,270 @@
+"""
+Per-route request metrics shared across gunicorn workers.
+
+``MetricsMiddleware`` records latency and response-size histograms, DB query
+counts and DB time per resolved URL name, plus the slowest SQL statements by
+fingerprint. Each worker aggregates in memory and periodically writes a
+snapshot to ``METRICS_DIR/<pid>-<start>.json``; ``render_metrics`` merges the
+snapshots of every worker into Prometheus text format.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# How often a worker writes its snapshot; the scrape itself always flushes first.
+FLUSH_SECONDS = 10
+# Snapshots of workers that stopped writing this long ago are removed.
+STALE_SECONDS = 24 * 3600
+# Distinct SQL fingerprints kept per worker, and how many the endpoint reports.
+SQL_FINGERPRINT_LIMIT = 200
+TOP_SQL = 10
+FINGERPRINT_MAX_LENGTH = 500
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_SQL_LITERALS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%s'), '?'),
+    # IN (?, ?, ?) with any number of items is one statement shape.
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),
+    (re.compile(r'\s+'), ' '),
+)
+
+
+def fingerprint(sql):
+    for pattern, replacement in _SQL_LITERALS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()[:FINGERPRINT_MAX_LENGTH]
+
+
+def _new_series():
+    return {
+        'count': 0,
+        'duration_sum': 0.0,
+        'duration_buckets': [0] * len(LATENCY_BUCKETS),
+        'size_sum': 0,
+        'size_count': 0,
+        'size_buckets': [0] * len(SIZE_BUCKETS),
+        'db_queries': 0,
+        'db_seconds': 0.0,
+    }
+
+
+def _observe(buckets, bounds, value):
+    for i, bound in enumerate(bounds):
+        if value <= bound:
+            buckets[i] += 1
+            return
+
+
+class MetricsRegistry:
+    """In-process aggregates for one worker, flushed to a snapshot file."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.series = defaultdict(_new_series)
+        # fingerprint -> [calls, total seconds, max seconds]
+        self.sql = {}
+        self.last_flush = time.monotonic()
+        self.filename = f'{os.getpid()}-{time.time_ns()}.json'
+
+    def record(self, method, route, status, duration, size, queries):
+        key = f'{method}|{route}|{status // 100}xx'
+        with self.lock:
+            series = self.series[key]
+            series['count'] += 1
+            series['duration_sum'] += duration
+            _observe(series['duration_buckets'], LATENCY_BUCKETS, duration)
+            if size is not None:
+                series['size_count'] += 1
+                series['size_sum'] += size
+                _observe(series['size_buckets'], SIZE_BUCKETS, size)
+            series['db_queries'] += len(queries)
+            for sql, seconds in queries:
+                series['db_seconds'] += seconds
+                self._record_sql(fingerprint(sql), seconds)
+
+    def _record_sql(self, fp, seconds):
+        entry = self.sql.get(fp)
+        if entry is None:
+            if len(self.sql) >= SQL_FINGERPRINT_LIMIT:
+                # Make room by forgetting the statement with the least total time.
+                del self.sql[min(self.sql, key=lambda k: self.sql[k][1])]
+            entry = self.sql[fp] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+
+    def snapshot(self):
+        with self.lock:
+            return json.dumps({'series': self.series, 'sql': self.sql})
+
+    def flush(self, force=False):
+        if not force and time.monotonic() - self.last_flush < FLUSH_SECONDS:
+            return
+        self.last_flush = time.monotonic()
+        directory = metrics_dir()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, self.filename)
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            f.write(self.snapshot())
+        # Readers only ever see a complete file.
+        os.replace(tmp, path)
+
+
+registry = MetricsRegistry()
+
+
+def metrics_dir():
+    return settings.METRICS_DIR
+
+
+class QueryTimer:
+    """``connection.execute_wrapper`` callback collecting ``(sql, seconds)`` pairs."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+
+class MetricsMiddleware:
+    """
+    Record latency, response size and DB usage for every request.
+
+    Streaming responses are timed until the response object is returned and
+    have no size, since the body is produced after the middleware finishes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match and match.view_name else 'unmatched'
+        size = None if response.streaming else len(response.content)
+        registry.record(request.method, route, response.status_code, duration, size, timer.queries)
+        registry.flush()
+        return response
+
+
+def _load_snapshots():
+    directory = metrics_dir()
+    snapshots = []
+    now = time.time()
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.json'):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            if now - os.path.getmtime(path) > STALE_SECONDS:
+                os.remove(path)
+                continue
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            # Another worker may be replacing or pruning the file right now.
+            continue
+    return snapshots
+
+
+def _merge(snapshots):
+    series = defaultdict(_new_series)
+    sql = defaultdict(lambda: [0, 0.0, 0.0])
+    for snapshot in snapshots:
+        for key, values in snapshot['series'].items():
+            merged = series[key]
+            for field, value in values.items():
+                if isinstance(value, list):
+                    merged[field] = [a + b for a, b in zip(merged[field], value)]
+                else:
+                    merged[field] += value
+        for fp, (calls, total, longest) in snapshot['sql'].items():
+            entry = sql[fp]
+            entry[0] += calls
+            entry[1] += total
+            entry[2] = max(entry[2], longest)
+    return series, sql
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _histogram(lines, name, labels, bounds, buckets, total, count):
+    cumulative = 0
+    for bound, hits in zip(bounds, buckets):
+        cumulative += hits
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+    lines.append(f'{name}_sum{{{labels}}} {total}')
+    lines.append(f'{name}_count{{{labels}}} {count}')
+
+
+def render_metrics():
+    """Prometheus text exposition of all workers' metrics."""
+    registry.flush(force=True)
+    series, sql = _merge(_load_snapshots())
+
+    latency = ['# HELP hotel_http_request_duration_seconds Request latency by route.',
+               '# TYPE hotel_http_request_duration_seconds histogram']
+    size = ['# HELP hotel_http_response_size_bytes Response body size by route.',
+            '# TYPE hotel_http_response_size_bytes histogram']
+    queries = ['# HELP hotel_db_queries_total Database queries executed by route.',
+               '# TYPE hotel_db_queries_total counter']
+    db_time = ['# HELP hotel_db_query_seconds_total Time spent in database queries by route.',
+               '# TYPE hotel_db_query_seconds_total counter']
+    for key in sorted(series):
+        values = series[key]
+        method, route, status = key.split('|')
+        labels = _labels(method=method, route=route, status=status)
+        _histogram(latency, 'hotel_http_request_duration_seconds', labels, LATENCY_BUCKETS,
+                   values['duration_buckets'], values['duration_sum'], values['count'])
+        _histogram(size, 'hotel_http_response_size_bytes', labels, SIZE_BUCKETS,
+                   values['size_buckets'], values['size_sum'], values['size_count'])
+        queries.append(f'hotel_db_queries_total{{{labels}}} {values["db_queries"]}')
+        db_time.append(f'hotel_db_query_seconds_total{{{labels}}} {values["db_seconds"]}')
+
+    slowest = sorted(sql.items(), key=lambda item: item[1][1], reverse=True)[:TOP_SQL]
+    statements = [
+        f'# HELP hotel_sql_statement_seconds_total Total time of the {TOP_SQL} most expensive SQL fingerprints.',
+        '# TYPE hotel_sql_statement_seconds_total counter',
+    ]
+    calls = ['# HELP hotel_sql_statement_calls_total Executions of the most expensive SQL fingerprints.',
+             '# TYPE hotel_sql_statement_calls_total counter']
+    longest = ['# HELP hotel_sql_statement_max_seconds Slowest single execution of each fingerprint.',
+               '# TYPE hotel_sql_statement_max_seconds gauge']
+    for fp, (count, total, maximum) in slowest:
+        labels = _labels(fingerprint=fp)
+        statements.append(f'hotel_sql_statement_seconds_total{{{labels}}} {total}')
+        calls.append(f'hotel_sql_statement_calls_total{{{labels}}} {count}')
+        longest.append(f'hotel_sql_statement_max_seconds{{{labels}}} {maximum}')
+
+    return '\n'.join(latency + size + queries + db_time + statements + calls + longest) + '\n'
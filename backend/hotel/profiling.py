@@ -0,0 +1,173 @@
+"""
+Opt-in profiling of single requests for staff.
+
+Send ``X-Profile: 1`` or add ``?profile=1`` with a staff JWT and the request
+runs under cProfile with every SQL statement timed. The slowest statements
+are EXPLAINed and the result is kept in a bounded ring under ``PROFILE_DIR``
+(``<id>.json`` summary plus ``<id>.prof`` for snakeviz / pstats). The id is
+returned in the ``X-Profile-Id`` response header. Requests without the flag
+only pay for the header/query-string lookup.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import secrets
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+
+from accounts.authentication import CachedJWTAuthentication
+
+PROFILE_RING_SIZE = 20
+EXPLAIN_SLOWEST = 5
+TOP_FUNCTIONS = 40
+SUMMARY_FIELDS = ('id', 'created_at', 'method', 'path', 'status', 'seconds', 'sql_count', 'sql_seconds')
+
+
+def profile_dir():
+    return settings.PROFILE_DIR
+
+
+def _wants_profile(request):
+    return request.META.get('HTTP_X_PROFILE') == '1' or request.GET.get('profile') == '1'
+
+
+def _is_staff(request):
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        try:
+            result = CachedJWTAuthentication().authenticate(request)
+        except APIException:
+            return False
+        user = result[0] if result else None
+    return bool(user and user.is_staff)
+
+
+class SQLRecorder:
+    """``connection.execute_wrapper`` callback keeping each statement, params and duration."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.statements.append((sql, params, many, time.perf_counter() - start))
+
+
+def explain(sql, params):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            return [' '.join(str(col) for col in row) for row in cursor.fetchall()]
+    except DatabaseError as exc:
+        return [f'EXPLAIN failed: {exc}']
+
+
+def _function_stats(profiler):
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+    return out.getvalue()
+
+
+def _prune_ring(directory):
+    ids = sorted({name.split('.')[0] for name in os.listdir(directory) if name.endswith('.json')})
+    for stale in ids[:-PROFILE_RING_SIZE]:
+        for ext in ('json', 'prof'):
+            try:
+                os.remove(os.path.join(directory, f'{stale}.{ext}'))
+            except FileNotFoundError:
+                pass
+
+
+def save_profile(request, response, profiler, recorder, duration):
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    created = timezone.now()
+    profile_id = f'{created:%Y%m%d%H%M%S%f}-{secrets.token_hex(4)}'
+
+    statements = [
+        {'sql': sql, 'params': None if many else [str(p) for p in params or ()], 'seconds': seconds}
+        for sql, params, many, seconds in recorder.statements
+    ]
+    slowest = sorted(
+        (s for s in recorder.statements if not s[2] and s[0].lstrip().upper().startswith('SELECT')),
+        key=lambda s: s[3],
+        reverse=True,
+    )[:EXPLAIN_SLOWEST]
+    plans = [{'sql': sql, 'seconds': seconds, 'plan': explain(sql, params)} for sql, params, _, seconds in slowest]
+
+    summary = {
+        'id': profile_id,
+        'created_at': created.isoformat(),
+        'method': request.method,
+        'path': request.get_full_path(),
+        'status': response.status_code,
+        'seconds': duration,
+        'sql_count': len(statements),
+        'sql_seconds': sum(s['seconds'] for s in statements),
+        'sql': statements,
+        'explain': plans,
+        'functions': _function_stats(profiler),
+    }
+    with open(os.path.join(directory, f'{profile_id}.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+    profiler.dump_stats(os.path.join(directory, f'{profile_id}.prof'))
+    _prune_ring(directory)
+    return profile_id
+
+
+def list_profiles():
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        profiles.append({key: data[key] for key in SUMMARY_FIELDS})
+    return profiles
+
+
+def profile_path(profile_id, ext):
+    """Path of a stored artifact, or None for unknown/invalid ids."""
+    if not profile_id.replace('-', '').isalnum():
+        return None
+    path = os.path.join(profile_dir(), f'{profile_id}.{ext}')
+    return path if os.path.exists(path) else None
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not _wants_profile(request) or not _is_staff(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        recorder = SQLRecorder()
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        duration = time.perf_counter() - start
+        response['X-Profile-Id'] = save_profile(request, response, profiler, recorder, duration)
+        return response
@@ -0,0 +1,62 @@
+"""
+JSON renderer/parser backed by orjson when it is installed.
+
+orjson serialises dicts, lists, str, int, float, bool, date, datetime and UUID
+in C, so large ``values()`` payloads (admin dashboard, availability) skip the
+per-object ``default`` round trip of the stdlib encoder. Anything else is
+handed to DRF's own encoder, so the output matches the stdlib renderer.
+Without orjson both classes behave exactly like DRF's defaults.
+"""
+
+import decimal
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_drf_encoder = JSONEncoder()
+
+
+def _default(obj):
+    if isinstance(obj, decimal.Decimal):
+        # Same as DRF's JSONEncoder for raw Decimals.
+        return float(obj)
+    return _drf_encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        renderer_context = renderer_context or {}
+        options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context):
+            options |= orjson.OPT_INDENT_2
+        try:
+            ret = orjson.dumps(data, default=_default, option=options)
+        except (orjson.JSONEncodeError, TypeError):
+            # e.g. integers beyond 64 bits: let the stdlib encoder deal with it.
+            return super().render(data, accepted_media_type, renderer_context)
+        # Match DRF: escape the JavaScript line terminators.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
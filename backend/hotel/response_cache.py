@@ -0,0 +1,110 @@
+"""
+Versioned response cache for anonymous, read-mostly API views.
+
+Each cached view lists the models its output depends on. Every model has a
+version counter in the cache that is bumped from post_save/post_delete, and
+the versions are part of the cache key, so a change to any listed model makes
+old entries unreachable instead of having to find and delete them.
+"""
+
+import hashlib
+import time
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .cache import NamespacedCache
+
+VERSION_KEY = 'version:{}'
+RESPONSE_CACHE_TIMEOUT = 300
+
+cache = NamespacedCache('response-cache')
+
+
+def _label(model):
+    return (model if isinstance(model, str) else model._meta.label_lower).lower()
+
+
+def get_versions(models):
+    keys = [VERSION_KEY.format(_label(m)) for m in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Never restart at 0 after an eviction, or stale entries would match again.
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model):
+    cache.bump(VERSION_KEY.format(_label(model)), initial=time.time_ns())
+
+
+def bump_model_version(sender, **kwargs):
+    """post_save / post_delete receiver."""
+    bump_version(sender)
+
+
+def _etag_matches(request, etag):
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    tags = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return etag in tags or '*' in tags
+
+
+def _not_modified(etag):
+    response = HttpResponseNotModified()
+    response['ETag'] = etag
+    return response
+
+
+class CachedResponseMixin:
+    """
+    Serve GET responses of a DRF view from the cache, with a strong ETag and
+    304 responses for matching ``If-None-Match``. Set ``cache_models`` to the
+    models the response is built from.
+    """
+
+    cache_models = ()
+    cache_timeout = RESPONSE_CACHE_TIMEOUT
+
+    def get_response_cache_key(self, request):
+        parts = [
+            request.get_host(),
+            request.get_full_path(),
+            # Date-filtered views (upcoming events, running promotions) roll over at midnight.
+            timezone.now().date().isoformat(),
+            *map(str, get_versions(self.cache_models)),
+        ]
+        return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        return self.serve_cached(request, super().get, *args, **kwargs)
+
+    def serve_cached(self, request, handler, *args, **kwargs):
+        """Return the cached response for ``request`` or build it with ``handler``."""
+        self._response_cache_key = None
+        if request.accepted_renderer.format == 'json':
+            key = self.get_response_cache_key(request)
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type, etag = cached
+                if _etag_matches(request, etag):
+                    return _not_modified(etag)
+                response = HttpResponse(content, content_type=content_type)
+                response['ETag'] = etag
+                return response
+            self._response_cache_key = key
+        return handler(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, '_response_cache_key', None)
+        if key and isinstance(response, Response) and response.status_code == 200:
+            response.render()
+            etag = '"{}"'.format(hashlib.sha1(response.content).hexdigest())
+            response['ETag'] = etag
+            cache.set(key, (response.content, response['Content-Type'], etag), self.cache_timeout)
+            if _etag_matches(request, etag):
+                return _not_modified(etag)
+        return response
@@ -1,7 +1,9 @@
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 import dj_database_url
+from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -36,11 +38,16 @@ INSTALLED_APPS = [
     'analytics',
     'vouchers',
     'chat',
+    'tasks',
+    'outbox',
+    'notifications',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'hotel.metrics.MetricsMiddleware',
+    'hotel.profiling.ProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -128,7 +135,16 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'hotel.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'hotel.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -141,8 +157,8 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'hotel.throttling.SlidingWindowAnonRateThrottle',
+        'hotel.throttling.SlidingWindowUserRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
@@ -161,16 +177,85 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Shared cache: throttles, cached users and response versions must agree across
+# gunicorn workers and the task worker. The SQLite backend needs no extra service
+# but only reaches processes on one host; 'database' shares the cache through the
+# main database and needs `manage.py createcachetable`, 'redis' needs CACHE_LOCATION=redis://...
+CACHE_BACKENDS = {
+    'sqlite': 'hotel.cache.SQLiteCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'database': 'hotel.cache.DatabaseCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+}
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'sqlite')
+CACHE_DEFAULT_LOCATIONS = {
+    'sqlite': os.path.join(tempfile.gettempdir(), 'hotel-cache.sqlite3'),
+    'file': os.path.join(tempfile.gettempdir(), 'hotel-cache'),
+    'database': 'hotel_cache',
+    'redis': 'redis://127.0.0.1:6379/1',
+    'locmem': '',
+}
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.environ.get('CACHE_LOCATION', CACHE_DEFAULT_LOCATIONS[CACHE_BACKEND]),
+        'KEY_PREFIX': 'hotel',
+        # Bump CACHE_VERSION to invalidate every key at once.
+        'VERSION': int(os.environ.get('CACHE_VERSION', '1')),
+        'TIMEOUT': 300,
+        # The redis client rejects Django's culling options.
+        'OPTIONS': {} if CACHE_BACKEND == 'redis' else {'MAX_ENTRIES': 100000},
+    },
+}
+# Per-app key versions for hotel.cache.NamespacedCache; bump one to drop that app's keys.
+CACHE_NAMESPACE_VERSIONS = {}
+
+# Seconds an authenticated user stays cached; saves invalidate it immediately.
+JWT_USER_CACHE_TIMEOUT = 300
+
+# Run @task functions inline instead of queueing them for `manage.py run_tasks`.
+TASKS_EAGER = os.environ.get('TASKS_EAGER', 'False') == 'True'
+
+# Per-worker metric snapshots, merged by /api/analytics/metrics/.
+METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'hotel-metrics'))
+
+# Ring of staff-requested request profiles (X-Profile: 1 or ?profile=1).
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'hotel-profiles'))
+
 CORS_ALLOWED_ORIGINS = os.environ.get(
     'CORS_ALLOWED_ORIGINS',
     'http://localhost:3000,http://127.0.0.1:3000'
 ).split(',')
 
 CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = (*default_headers, 'x-profile')
+CORS_EXPOSE_HEADERS = ['X-Profile-Id']
 
 
 FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
 
+# Guest emails are sent by the task worker. 'console' prints them and 'file'
+# writes them to EMAIL_FILE_PATH; set EMAIL_BACKEND=smtp and EMAIL_HOST* to deliver.
+EMAIL_BACKENDS = {
+    'smtp': 'django.core.mail.backends.smtp.EmailBackend',
+    'console': 'django.core.mail.backends.console.EmailBackend',
+    'file': 'django.core.mail.backends.filebased.EmailBackend',
+    'locmem': 'django.core.mail.backends.locmem.EmailBackend',
+}
+# A full dotted path to any other backend works too.
+EMAIL_BACKEND = EMAIL_BACKENDS.get(os.environ.get('EMAIL_BACKEND', 'console'), os.environ.get('EMAIL_BACKEND'))
+EMAIL_FILE_PATH = os.environ.get('EMAIL_FILE_PATH', os.path.join(tempfile.gettempdir(), 'hotel-emails'))
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', '587'))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'True') == 'True'
+EMAIL_TIMEOUT = 30
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'Adel Beach Resort <noreply@localhost>')
+# Most SMTP relays cap sends per minute; the sender task runs every minute and stops at this many.
+EMAIL_RATE_PER_MINUTE = int(os.environ.get('EMAIL_RATE_PER_MINUTE', '30'))
+
 # Security headers (always on)
 SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = 'DENY'
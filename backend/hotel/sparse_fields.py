@@ -0,0 +1,47 @@
+from rest_framework.serializers import ListSerializer
+
+TRUTHY = ('1', 'true', 'yes')
+
+
+def _split(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsMixin:
+    """
+    Let GET requests trim a serializer's output before anything is evaluated:
+
+    - ``?fields=id,name`` keeps only the named fields
+    - ``?compact=1`` keeps ``Meta.compact_fields``
+    - ``?expand=images`` adds fields back on top of either
+
+    Dropped fields are removed in ``get_fields()``, so their
+    SerializerMethodFields and nested serializers never run. Only the
+    top-level serializer reacts; nested ones keep their full shape.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        wanted = self._requested_fields()
+        if wanted:
+            for name in list(fields):
+                if name not in wanted:
+                    del fields[name]
+        return fields
+
+    def _requested_fields(self):
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return None
+        parent = getattr(self, 'parent', None)
+        if parent is not None and not (isinstance(parent, ListSerializer) and parent.parent is None):
+            return None
+
+        params = request.query_params
+        if params.get('fields'):
+            wanted = _split(params['fields'])
+        elif params.get('compact', '').lower() in TRUTHY:
+            wanted = set(getattr(self.Meta, 'compact_fields', ()))
+        else:
+            return None
+        return wanted | _split(params.get('expand', ''))
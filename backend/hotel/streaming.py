@@ -0,0 +1,52 @@
+"""Helpers for building large downloads as StreamingHttpResponse bodies."""
+
+import csv
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Flush to the client (and the gzip compressor) roughly every 64 KiB.
+CHUNK_BYTES = 64 * 1024
+
+
+class Echo:
+    """Pseudo-buffer for csv.writer: hands each row straight back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def jsonl_lines(columns, rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+def buffered(lines, size=CHUNK_BYTES):
+    """Join small text lines into byte chunks of about ``size`` bytes."""
+    buffer, length = [], 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        length += len(data)
+        if length >= size:
+            yield b''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def gzipped(chunks):
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
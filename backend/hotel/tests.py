@@ -0,0 +1,184 @@
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from .cache import DatabaseCache, NamespacedCache, SQLiteCache
+from .throttling import SlidingWindowScopedRateThrottle
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.location = os.path.join(directory.name, 'cache.sqlite3')
+        self.cache = SQLiteCache(self.location, {})
+
+    def test_add_keeps_live_entry(self):
+        self.assertTrue(self.cache.add('key', 'first'))
+        self.assertFalse(self.cache.add('key', 'second'))
+        self.assertEqual(self.cache.get('key'), 'first')
+
+    def test_add_replaces_expired_entry(self):
+        self.cache.set('key', 'old', 0.05)
+        time.sleep(0.1)
+        self.assertTrue(self.cache.add('key', 'new'))
+        self.assertEqual(self.cache.get('key'), 'new')
+
+    def test_entries_expire(self):
+        self.cache.set('key', {'a': 1}, 0.05)
+        self.assertEqual(self.cache.get('key'), {'a': 1})
+        time.sleep(0.1)
+        self.assertIsNone(self.cache.get('key'))
+        self.assertFalse(self.cache.has_key('key'))
+
+    def test_incr(self):
+        self.cache.set('count', 1)
+        self.assertEqual(self.cache.incr('count', 5), 6)
+        self.assertEqual(self.cache.decr('count'), 5)
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+
+    def test_incr_ignores_expired_counter(self):
+        self.cache.set('count', 1, 0.05)
+        time.sleep(0.1)
+        with self.assertRaises(ValueError):
+            self.cache.incr('count')
+
+    def test_concurrent_incr_loses_nothing(self):
+        self.cache.set('count', 0, None)
+
+        def work():
+            for _ in range(50):
+                self.cache.incr('count')
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.cache.get('count'), 400)
+
+FAR_FUTURE = datetime(2999, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class DatabaseCacheTests(TestCase):
+    def setUp(self):
+        self.cache = DatabaseCache('test_cache', {})
+        call_command('createcachetable', 'test_cache')
+
+    def test_incr_keeps_expiry(self):
+        self.cache.set('count', 1, None)
+        self.assertEqual(self.cache.incr('count', 5), 6)
+        self.assertEqual(self.cache.get('count'), 6)
+        # Django's incr would have reset the entry to the default 300 s timeout.
+        with mock.patch('django.core.cache.backends.db.tz_now', return_value=FAR_FUTURE):
+            self.assertEqual(self.cache.get('count'), 6)
+
+    def test_incr_missing_or_expired(self):
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+        self.cache.set('count', 1, 1)
+        with mock.patch('hotel.cache.timezone.now', return_value=FAR_FUTURE):
+            with self.assertRaises(ValueError):
+                self.cache.incr('count')
+
+
+class NamespacedCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(CACHES={'default': {
+            'BACKEND': 'hotel.cache.SQLiteCache', 'LOCATION': os.path.join(directory.name, 'cache.sqlite3'),
+        }})
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.cache = NamespacedCache('tests')
+
+    def test_bump_creates_with_initial(self):
+        self.assertEqual(self.cache.bump('version', initial=100), 100)
+        self.assertEqual(self.cache.bump('version', initial=100), 101)
+
+    def test_racing_bumps_of_missing_key_both_count(self):
+        barrier = threading.Barrier(2)
+        racing = set()
+        real_incr = NamespacedCache.incr
+
+        def incr(cache, key, delta=1):
+            # Both threads find the key missing before either creates it.
+            if threading.get_ident() not in racing:
+                racing.add(threading.get_ident())
+                barrier.wait()
+                raise ValueError(key)
+            return real_incr(cache, key, delta)
+
+        with mock.patch.object(NamespacedCache, 'incr', incr):
+            threads = [threading.Thread(target=self.cache.bump, args=('version',)) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(self.cache.get('version'), 2)
+
+    @override_settings(CACHE_NAMESPACE_VERSIONS={'tests': 2})
+    def test_namespace_version_hides_old_keys(self):
+        self.cache.cache.set('tests:v1:key', 'old')
+        self.assertIsNone(self.cache.get('key'))
+
+
+class MinuteThrottle(SlidingWindowScopedRateThrottle):
+    scope = 'tests'
+    rate = '3/min'
+
+    def __init__(self, now):
+        super().__init__()
+        self.timer = lambda: now
+
+
+class SlidingWindowThrottleTests(SimpleTestCase):
+    # A window boundary: divisible by the 60 s window.
+    START = 1_800_000_000
+
+    def setUp(self):
+        cache.clear()
+        self.request = Request(APIRequestFactory().get('/', REMOTE_ADDR='10.0.0.1'))
+        self.request.user = AnonymousUser()
+
+    def allow(self, offset):
+        throttle = MinuteThrottle(self.START + offset)
+        return throttle.allow_request(self.request, None), throttle.wait()
+
+    def test_rejects_past_rate_within_window(self):
+        self.assertEqual([self.allow(0)[0] for _ in range(3)], [True] * 3)
+        allowed, wait = self.allow(10)
+        self.assertFalse(allowed)
+        self.assertEqual(wait, 50)
+
+    def test_previous_window_counts_at_boundary(self):
+        for _ in range(3):
+            self.allow(0)
+        # Just after the boundary the previous window still counts in full.
+        self.assertFalse(self.allow(60)[0])
+        # Half way through, half of it has slid out.
+        self.assertTrue(self.allow(90)[0])
+        allowed, wait = self.allow(90)
+        self.assertFalse(allowed)
+        self.assertGreater(wait, 0)
+        self.assertLessEqual(wait, 30)
+
+    def test_rejections_do_not_use_up_the_window(self):
+        for _ in range(3):
+            self.allow(0)
+        for _ in range(5):
+            self.allow(60)
+        # Only accepted requests count: the 60 s window holds none.
+        self.assertTrue(self.allow(120)[0])
@@ -0,0 +1,82 @@
+"""
+Approximate sliding-window throttles backed by two counters per key.
+
+DRF's ``SimpleRateThrottle`` keeps every request timestamp of the window in
+one cache entry and rewrites it on each request. These throttles keep one
+integer per fixed window instead and estimate the sliding count as
+
+    previous_window * (share of the previous window still in range) + current_window
+
+The current counter is bumped with an atomic ``incr`` in the shared cache, so
+concurrent workers cannot both take the last slot. Rates are configured
+exactly as before (``DEFAULT_THROTTLE_RATES``).
+"""
+
+from rest_framework.throttling import AnonRateThrottle, SimpleRateThrottle, UserRateThrottle
+
+
+class SlidingWindowMixin:
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window, elapsed = divmod(now, self.duration)
+        current_key = f'{self.key}:{int(window)}'
+        count = self._increment(current_key)
+        previous = self.cache.get(f'{self.key}:{int(window) - 1}', 0)
+        remaining_share = 1 - elapsed / self.duration
+
+        if previous * remaining_share + count <= self.num_requests:
+            return True
+        # Rejected requests do not use up the window.
+        self.cache.decr(current_key)
+        self._wait = self._wait_time(previous, count - 1, elapsed, remaining_share)
+        return False
+
+    def _increment(self, key):
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Keep the counter for two windows: it is "previous" for the next one.
+            if self.cache.add(key, 1, self.duration * 2):
+                return 1
+            return self.cache.incr(key)
+
+    def _wait_time(self, previous, count, elapsed, remaining_share):
+        until_next_window = self.duration - elapsed
+        if not previous or count + 1 > self.num_requests:
+            return until_next_window
+        # The previous window's share decays linearly; wait until one slot frees up.
+        excess = previous * remaining_share + count + 1 - self.num_requests
+        return min(until_next_window, excess * self.duration / previous)
+
+    def wait(self):
+        return getattr(self, '_wait', None)
+
+
+class SlidingWindowAnonRateThrottle(SlidingWindowMixin, AnonRateThrottle):
+    pass
+
+
+class SlidingWindowUserRateThrottle(SlidingWindowMixin, UserRateThrottle):
+    pass
+
+
+class SlidingWindowScopedRateThrottle(SlidingWindowMixin, SimpleRateThrottle):
+    """
+    Throttle with a fixed ``scope`` set on the subclass, keyed by user or IP.
+
+    Unlike DRF's ``ScopedRateThrottle`` it does not read ``throttle_scope``
+    from the view, so it also applies to ``@api_view`` functions.
+    """
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'to_email', 'booking', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status', 'kind')
+    search_fields = ('to_email', 'booking__id')
+    raw_id_fields = ('booking', 'waitlist_entry')
+    readonly_fields = ('dedupe_key', 'attempts', 'last_error', 'created_at', 'sent_at')
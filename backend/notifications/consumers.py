@@ -0,0 +1,31 @@
+from bookings.models import Booking, BookingStatus
+from outbox.services import consumer
+from .models import NotificationKind
+from .services import queue_notification
+
+STATUS_KINDS = {
+    BookingStatus.CONFIRMED: NotificationKind.BOOKING_CONFIRMED,
+    BookingStatus.CANCELLED: NotificationKind.BOOKING_CANCELLED,
+}
+
+
+def kind_for_event(event):
+    status = event.payload.get('status')
+    if event.event_type == 'booking.created':
+        # Walk-in bookings are created already confirmed.
+        return STATUS_KINDS.get(status, NotificationKind.BOOKING_RECEIVED)
+    if event.event_type == 'booking.status_changed':
+        return STATUS_KINDS.get(status)
+    if event.event_type == 'payment.submitted':
+        return NotificationKind.PAYMENT_RECEIVED
+    return None
+
+
+@consumer('notifications')
+def queue_guest_email(event):
+    kind = kind_for_event(event)
+    if kind is None:
+        return
+    booking = Booking.objects.select_related('user').filter(pk=event.payload['booking_id']).first()
+    if booking is not None:
+        queue_notification(booking, kind, f'event:{event.pk}')
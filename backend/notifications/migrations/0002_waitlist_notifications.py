@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0006_waitlist'),
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='waitlist_entry',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='bookings.waitlistentry'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='booking',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='bookings.booking'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='kind',
+            field=models.CharField(choices=[('booking_received', 'Booking received'), ('booking_confirmed', 'Booking confirmed'), ('booking_cancelled', 'Booking cancelled'), ('payment_received', 'Payment proof received'), ('payment_reminder', 'Payment reminder'), ('waitlist_opening', 'Waitlisted slot available')], max_length=30),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import models
+
+
+class NotificationKind(models.TextChoices):
+    BOOKING_RECEIVED = 'booking_received', 'Booking received'
+    BOOKING_CONFIRMED = 'booking_confirmed', 'Booking confirmed'
+    BOOKING_CANCELLED = 'booking_cancelled', 'Booking cancelled'
+    PAYMENT_RECEIVED = 'payment_received', 'Payment proof received'
+    PAYMENT_REMINDER = 'payment_reminder', 'Payment reminder'
+    WAITLIST_OPENING = 'waitlist_opening', 'Waitlisted slot available'
+
+
+class NotificationStatus(models.TextChoices):
+    QUEUED = 'queued', 'Queued'
+    SENT = 'sent', 'Sent'
+    SKIPPED = 'skipped', 'Skipped'
+    FAILED = 'failed', 'Failed'
+
+
+class Notification(models.Model):
+    booking = models.ForeignKey(
+        'bookings.Booking', null=True, blank=True, on_delete=models.CASCADE, related_name='notifications',
+    )
+    waitlist_entry = models.ForeignKey(
+        'bookings.WaitlistEntry', null=True, blank=True, on_delete=models.CASCADE, related_name='notifications',
+    )
+    kind = models.CharField(max_length=30, choices=NotificationKind.choices)
+    to_email = models.EmailField()
+    status = models.CharField(max_length=20, choices=NotificationStatus.choices, default=NotificationStatus.QUEUED)
+    # "event:<outbox id>", "reminder:<booking id>" or "waitlist:<entry id>:<freeing booking id>",
+    # so redelivered events and repeated sweeps queue nothing twice.
+    dedupe_key = models.CharField(max_length=100, unique=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='notification_status_idx'),
+            models.Index(fields=['booking', 'kind'], name='notification_booking_kind_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_kind_display()} to {self.to_email} ({self.status})'
@@ -0,0 +1,158 @@
+"""
+Guest emails for booking events, payment-deadline reminders and waitlist openings.
+
+Requests never talk to SMTP: the outbox consumer, the reminder sweep and the
+waitlist matcher only insert ``Notification`` rows, and ``send_pending`` (a
+periodic task) renders them with one compiled template per kind and sends the
+batch through a single open mail connection, at most ``EMAIL_RATE_PER_MINUTE``
+per run.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Exists, OuterRef
+from django.template.loader import get_template
+from django.utils import timezone
+
+from bookings.models import Booking, BookingStatus
+from bookings.tasks import PAYMENT_DEADLINE_HOURS
+from bookings.waitlist import slot_is_free
+from .models import Notification, NotificationKind, NotificationStatus
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+# Reminders go out once this many hours of the payment window are left.
+REMINDER_HOURS_BEFORE = 6
+# onsite_booking gives walk-in guests without an email a placeholder address.
+PLACEHOLDER_DOMAIN = 'onsite.local'
+
+SUBJECTS = {
+    NotificationKind.BOOKING_RECEIVED: 'We received your booking #{booking.pk}',
+    NotificationKind.BOOKING_CONFIRMED: 'Your booking #{booking.pk} is confirmed',
+    NotificationKind.BOOKING_CANCELLED: 'Your booking #{booking.pk} was cancelled',
+    NotificationKind.PAYMENT_RECEIVED: 'Payment proof received for booking #{booking.pk}',
+    NotificationKind.PAYMENT_REMINDER: 'Reminder: booking #{booking.pk} awaits payment',
+    NotificationKind.WAITLIST_OPENING: '{entry.room.name} is available on {entry.date:%b %d, %Y}',
+}
+# A queued message whose booking or slot has since moved on is skipped instead of sent.
+STILL_RELEVANT = {
+    NotificationKind.BOOKING_RECEIVED: lambda n: n.booking.status == BookingStatus.PENDING,
+    NotificationKind.BOOKING_CONFIRMED: lambda n: n.booking.status == BookingStatus.CONFIRMED,
+    NotificationKind.BOOKING_CANCELLED: lambda n: n.booking.status == BookingStatus.CANCELLED,
+    NotificationKind.PAYMENT_REMINDER: lambda n: (
+        n.booking.status == BookingStatus.PENDING and not hasattr(n.booking, 'payment')
+    ),
+    NotificationKind.WAITLIST_OPENING: lambda n: slot_is_free(
+        n.waitlist_entry.room_id, n.waitlist_entry.date, n.waitlist_entry.slot,
+    ),
+}
+
+
+def queue_notification(booking, kind, dedupe_key):
+    email = booking.user.email
+    if not email or email.endswith(f'@{PLACEHOLDER_DOMAIN}'):
+        return None
+    notification, _ = Notification.objects.get_or_create(
+        dedupe_key=dedupe_key, defaults={'booking': booking, 'kind': kind, 'to_email': email},
+    )
+    return notification
+
+
+def reminder_candidates(now=None):
+    """Unpaid pending bookings inside the reminder window that have not been reminded yet."""
+    now = now or timezone.now()
+    # Range on created_at with status fixed: served by booking_status_created_idx.
+    return Booking.objects.filter(
+        status=BookingStatus.PENDING,
+        created_at__gt=now - timedelta(hours=PAYMENT_DEADLINE_HOURS),
+        created_at__lte=now - timedelta(hours=PAYMENT_DEADLINE_HOURS - REMINDER_HOURS_BEFORE),
+        payment__isnull=True,
+    ).exclude(
+        Exists(Notification.objects.filter(booking=OuterRef('pk'), kind=NotificationKind.PAYMENT_REMINDER)),
+    )
+
+
+def queue_payment_reminders(now=None):
+    bookings = reminder_candidates(now).select_related('user')
+    created = Notification.objects.bulk_create([
+        Notification(
+            booking=booking, kind=NotificationKind.PAYMENT_REMINDER,
+            to_email=booking.user.email, dedupe_key=f'reminder:{booking.pk}',
+        )
+        for booking in bookings
+        if booking.user.email and not booking.user.email.endswith(f'@{PLACEHOLDER_DOMAIN}')
+    ], ignore_conflicts=True)
+    return len(created)
+
+
+def _context(notification):
+    entry = notification.waitlist_entry
+    if entry is not None:
+        return {
+            'entry': entry,
+            'guest_name': entry.user.first_name or entry.user.email,
+            'room_url': f'{settings.FRONTEND_URL}/rooms/{entry.room_id}',
+        }
+    booking = notification.booking
+    return {
+        'booking': booking,
+        'guest_name': booking.user.first_name or booking.user.email,
+        'payment_deadline': booking.created_at + timedelta(hours=PAYMENT_DEADLINE_HOURS),
+        'checkout_url': f'{settings.FRONTEND_URL}/checkout?booking={booking.pk}',
+        'dashboard_url': f'{settings.FRONTEND_URL}/dashboard',
+    }
+
+
+def send_pending(limit=None):
+    """Send up to ``limit`` queued notifications over one connection; returns the number sent."""
+    batch = list(
+        Notification.objects.filter(status=NotificationStatus.QUEUED)
+        .select_related(
+            'booking__user', 'booking__room', 'booking__payment', 'waitlist_entry__user', 'waitlist_entry__room',
+        )
+        .order_by('pk')[:limit or settings.EMAIL_RATE_PER_MINUTE]
+    )
+    if not batch:
+        return 0
+    templates = {kind: get_template(f'notifications/{kind}.txt') for kind in {n.kind for n in batch}}
+
+    sent = 0
+    with get_connection() as connection:
+        for notification in batch:
+            relevant = STILL_RELEVANT.get(notification.kind)
+            if relevant and not relevant(notification):
+                Notification.objects.filter(pk=notification.pk).update(status=NotificationStatus.SKIPPED)
+                continue
+            context = _context(notification)
+            message = EmailMessage(
+                SUBJECTS[notification.kind].format(**context),
+                templates[notification.kind].render(context),
+                to=[notification.to_email],
+                connection=connection,
+            )
+            try:
+                connection.send_messages([message])
+            except Exception as e:
+                logger.exception('Could not send %s', notification)
+                attempts = notification.attempts + 1
+                Notification.objects.filter(pk=notification.pk).update(
+                    attempts=attempts, last_error=str(e),
+                    status=NotificationStatus.FAILED if attempts >= MAX_ATTEMPTS else NotificationStatus.QUEUED,
+                )
+                # Start a fresh session in case the server dropped this one.
+                connection.close()
+                try:
+                    connection.open()
+                except Exception:
+                    logger.exception('Mail server unavailable; leaving the rest of the batch queued')
+                    break
+                continue
+            Notification.objects.filter(pk=notification.pk).update(
+                status=NotificationStatus.SENT, sent_at=timezone.now(), attempts=notification.attempts + 1,
+            )
+            sent += 1
+    return sent
@@ -0,0 +1,14 @@
+from datetime import timedelta
+
+from tasks.services import task
+from .services import queue_payment_reminders, send_pending
+
+
+@task(every=timedelta(minutes=1), max_attempts=1)
+def send_notifications():
+    return send_pending()
+
+
+@task(every=timedelta(minutes=15))
+def queue_reminders():
+    return queue_payment_reminders()
@@ -0,0 +1,70 @@
+from datetime import date
+from decimal import Decimal
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase
+
+from accounts.models import User
+from bookings.models import Booking, BookingStatus
+from rooms.models import Room
+
+from .models import Notification, NotificationKind, NotificationStatus
+from .services import MAX_ATTEMPTS, PLACEHOLDER_DOMAIN, queue_notification, send_pending
+
+LOCMEM_SEND = 'django.core.mail.backends.locmem.EmailBackend.send_messages'
+
+
+class SendPendingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('guest@example.com', 'pw', first_name='Guest', last_name='User')
+        room = Room.objects.create(name='Cottage 1', description='', day_price=Decimal('500'))
+        self.booking = Booking.objects.create(
+            user=self.user, room=room, check_in=date(2030, 1, 1), check_out=date(2030, 1, 1),
+            slots=[{'date': '2030-01-01', 'slot': 'day'}], total_price=Decimal('500'),
+        )
+
+    def status(self, notification):
+        notification.refresh_from_db()
+        return notification.status
+
+    def test_received_email_skipped_once_booking_is_cancelled(self):
+        received = queue_notification(self.booking, NotificationKind.BOOKING_RECEIVED, 'event:1')
+        Booking.objects.filter(pk=self.booking.pk).update(status=BookingStatus.CANCELLED)
+        cancelled = queue_notification(self.booking, NotificationKind.BOOKING_CANCELLED, 'event:2')
+
+        self.assertEqual(send_pending(), 1)
+        self.assertEqual(self.status(received), NotificationStatus.SKIPPED)
+        self.assertEqual(self.status(cancelled), NotificationStatus.SENT)
+        self.assertEqual([m.subject for m in mail.outbox], [f'Your booking #{self.booking.pk} was cancelled'])
+
+    def test_failed_send_is_retried(self):
+        notification = queue_notification(self.booking, NotificationKind.BOOKING_RECEIVED, 'event:1')
+        with mock.patch(LOCMEM_SEND, side_effect=SMTPException('relay down')), self.assertLogs('notifications'):
+            self.assertEqual(send_pending(), 0)
+        notification.refresh_from_db()
+        self.assertEqual((notification.status, notification.attempts), (NotificationStatus.QUEUED, 1))
+        self.assertIn('relay down', notification.last_error)
+
+        self.assertEqual(send_pending(), 1)
+        self.assertEqual(self.status(notification), NotificationStatus.SENT)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_gives_up_after_max_attempts(self):
+        notification = queue_notification(self.booking, NotificationKind.BOOKING_RECEIVED, 'event:1')
+        with mock.patch(LOCMEM_SEND, side_effect=SMTPException('relay down')), self.assertLogs('notifications'):
+            for _ in range(MAX_ATTEMPTS + 1):
+                send_pending()
+        notification.refresh_from_db()
+        self.assertEqual((notification.status, notification.attempts), (NotificationStatus.FAILED, MAX_ATTEMPTS))
+
+    def test_dedupe_key_and_placeholder_addresses(self):
+        first = queue_notification(self.booking, NotificationKind.BOOKING_RECEIVED, 'event:1')
+        self.assertEqual(queue_notification(self.booking, NotificationKind.BOOKING_RECEIVED, 'event:1'), first)
+
+        self.user.email = f'walkin@{PLACEHOLDER_DOMAIN}'
+        self.user.save()
+        self.booking.refresh_from_db()
+        self.assertIsNone(queue_notification(self.booking, NotificationKind.BOOKING_CONFIRMED, 'event:2'))
+        self.assertEqual(Notification.objects.count(), 1)
@@ -0,0 +1,36 @@
+from django.contrib import admin, messages
+from .models import ConsumerOffset, OutboxEvent, ParkedEvent
+from .services import replay_parked
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'event_type', 'aggregate_type', 'aggregate_id', 'created_at')
+    list_filter = ('event_type', 'aggregate_type')
+    search_fields = ('=aggregate_id',)
+    readonly_fields = ('aggregate_type', 'aggregate_id', 'event_type', 'payload', 'created_at')
+
+
+@admin.register(ConsumerOffset)
+class ConsumerOffsetAdmin(admin.ModelAdmin):
+    list_display = ('consumer', 'last_event_id', 'failures', 'updated_at')
+    readonly_fields = ('last_error', 'gaps', 'locked_until', 'updated_at')
+
+
+@admin.register(ParkedEvent)
+class ParkedEventAdmin(admin.ModelAdmin):
+    list_display = ('event', 'consumer', 'parked_at')
+    list_filter = ('consumer',)
+    readonly_fields = ('consumer', 'event', 'error', 'parked_at')
+    actions = ['replay']
+
+    @admin.action(description='Replay to the consumer')
+    def replay(self, request, queryset):
+        replayed = 0
+        for parked in queryset.select_related('event'):
+            try:
+                replay_parked(parked)
+                replayed += 1
+            except Exception as e:
+                self.message_user(request, f'Event #{parked.event_id} failed again: {e}', messages.ERROR)
+        self.message_user(request, f'Replayed {replayed} event(s).')
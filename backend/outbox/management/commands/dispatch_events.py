@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from outbox.services import BATCH_SIZE, consumers, dispatch_events
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending outbox events to every registered consumer.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if not consumers:
+            self.stdout.write('No outbox consumers registered.')
+            return
+        for name, delivered in dispatch_events(options['batch_size']).items():
+            self.stdout.write(f'{name}: delivered {delivered} event(s).')
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.2 on 2026-10-19 18:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outbox', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='consumeroffset',
+            name='gaps',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.CreateModel(
+            name='ParkedEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('consumer', models.CharField(max_length=100)),
+                ('error', models.TextField()),
+                ('parked_at', models.DateTimeField(auto_now_add=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='parkings', to='outbox.outboxevent')),
+            ],
+            options={
+                'ordering': ['-parked_at'],
+                'constraints': [models.UniqueConstraint(fields=('consumer', 'event'), name='outbox_parked_once_per_consumer')],
+            },
+        ),
+    ]
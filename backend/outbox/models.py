@@ -0,0 +1,54 @@
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    aggregate_type = models.CharField(max_length=50)
+    aggregate_id = models.PositiveBigIntegerField()
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['aggregate_type', 'aggregate_id'], name='outbox_aggregate_idx'),
+            models.Index(fields=['created_at'], name='outbox_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'#{self.pk} {self.event_type} {self.aggregate_type}:{self.aggregate_id}'
+
+
+class ConsumerOffset(models.Model):
+    consumer = models.CharField(max_length=100, unique=True)
+    last_event_id = models.PositiveBigIntegerField(default=0, help_text='Highest event id delivered to this consumer.')
+    failures = models.PositiveIntegerField(default=0, help_text='Consecutive failed deliveries of the next event.')
+    # [[event id, first seen (epoch seconds)], ...] for ids skipped below last_event_id
+    # that may still commit; delivered when they appear.
+    gaps = models.JSONField(default=list, blank=True)
+    last_error = models.TextField(blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['consumer']
+
+    def __str__(self):
+        return f'{self.consumer} @ {self.last_event_id}'
+
+
+class ParkedEvent(models.Model):
+    """An event a consumer kept failing on, set aside so later events can flow."""
+    consumer = models.CharField(max_length=100)
+    event = models.ForeignKey(OutboxEvent, on_delete=models.PROTECT, related_name='parkings')
+    error = models.TextField()
+    parked_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-parked_at']
+        constraints = [
+            models.UniqueConstraint(fields=['consumer', 'event'], name='outbox_parked_once_per_consumer'),
+        ]
+
+    def __str__(self):
+        return f'{self.consumer}: event #{self.event_id}'
@@ -0,0 +1,212 @@
+"""
+Transactional outbox for booking and payment domain events.
+
+``record_event`` writes an ``OutboxEvent`` row through the caller's database
+connection, so the event commits or rolls back together with the status
+change it describes. Integrations register a handler with ``@consumer`` and
+``dispatch_events`` feeds each consumer the events after its stored offset,
+in id order and in batches. The offset only moves past events whose handler
+returned, so delivery is at-least-once: handlers must tolerate seeing an
+event twice (``event.pk`` is a stable idempotency key).
+
+An event whose handler keeps failing blocks its consumer for MAX_FAILURES
+attempts and is then parked as a ``ParkedEvent`` for a replay from the admin.
+Ids become visible at COMMIT, not INSERT, so the dispatcher remembers ids it
+skipped over and delivers them if they commit within GAP_TIMEOUT. Events of a
+transaction that stays open longer than that are never delivered: keep
+transactions that record events short.
+"""
+
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .models import ConsumerOffset, OutboxEvent, ParkedEvent
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+# Ids are handed out at INSERT but become visible at COMMIT, so a fresh event
+# can still have an uncommitted lower-id sibling; wait this long before
+# delivering past it, which keeps the usual case in id order.
+SETTLE_DELAY = timedelta(seconds=2)
+# Skipped ids are watched this long for a late commit, then taken as rolled back.
+GAP_TIMEOUT = timedelta(minutes=15)
+# Wider jumps in ids are not watched.
+MAX_GAP_IDS = 100
+# Consecutive failures on one event before it is parked and the consumer moves on.
+MAX_FAILURES = 5
+# A dispatcher holds a consumer this long; a crashed one is taken over after it.
+LEASE = timedelta(minutes=5)
+# Delivered events are kept this long for inspection and replays.
+KEEP_DAYS = 30
+
+consumers = {}
+
+
+def consumer(name):
+    """Register ``handler(event)`` to receive every outbox event under ``name``."""
+    def decorator(handler):
+        consumers[name] = handler
+        return handler
+    return decorator
+
+
+def record_event(aggregate_type, aggregate_id, event_type, payload):
+    """Write one event. Call it inside the transaction that makes the change, after the change."""
+    return OutboxEvent.objects.create(
+        aggregate_type=aggregate_type, aggregate_id=aggregate_id, event_type=event_type, payload=payload,
+    )
+
+
+def record_events(rows):
+    """Bulk ``record_event`` for ``[(aggregate_type, aggregate_id, event_type, payload), ...]``."""
+    return OutboxEvent.objects.bulk_create([
+        OutboxEvent(aggregate_type=t, aggregate_id=pk, event_type=e, payload=p) for t, pk, e, p in rows
+    ])
+
+
+def booking_payload(booking, previous_status=None):
+    payload = {
+        'booking_id': booking.pk,
+        'user_id': booking.user_id,
+        'room_id': booking.room_id,
+        'status': booking.status,
+        'check_in': str(booking.check_in),
+        'check_out': str(booking.check_out),
+        'total_price': str(booking.total_price),
+    }
+    if previous_status is not None:
+        payload['previous_status'] = previous_status
+    return payload
+
+
+def record_booking_event(booking, event_type, previous_status=None):
+    return record_event('booking', booking.pk, event_type, booking_payload(booking, previous_status))
+
+
+def record_payment_event(payment, event_type, previous_status=None):
+    payload = {
+        'payment_id': payment.pk,
+        'booking_id': payment.booking_id,
+        'status': payment.status,
+        'payment_type': payment.payment_type,
+        'amount': str(payment.amount),
+        'currency': payment.currency,
+    }
+    if previous_status is not None:
+        payload['previous_status'] = previous_status
+    return record_event('payment', payment.pk, event_type, payload)
+
+
+def _acquire(name):
+    offset, _ = ConsumerOffset.objects.get_or_create(consumer=name)
+    now = timezone.now()
+    leased = ConsumerOffset.objects.filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now), pk=offset.pk,
+    ).update(locked_until=now + LEASE)
+    if not leased:
+        return None
+    offset.refresh_from_db()
+    return offset
+
+
+def _deliver(offset, handler, event):
+    """Hand one event to a consumer; returns False when the consumer has to stop at it."""
+    try:
+        handler(event)
+    except Exception:
+        logger.exception('Outbox consumer %s failed on event %s', offset.consumer, event.pk)
+        offset.failures += 1
+        offset.last_error = traceback.format_exc()
+        if offset.failures < MAX_FAILURES:
+            return False
+        ParkedEvent.objects.get_or_create(consumer=offset.consumer, event=event, defaults={'error': offset.last_error})
+        logger.error('Outbox consumer %s parked event %s after %s failures', offset.consumer, event.pk, offset.failures)
+    else:
+        offset.last_error = ''
+    offset.failures = 0
+    return True
+
+
+def _watch_gap(offset, event_id):
+    # A new consumer starts at 0; what lies below its first event is history, not a gap.
+    if offset.last_event_id and 0 < event_id - offset.last_event_id - 1 <= MAX_GAP_IDS:
+        seen = timezone.now().timestamp()
+        offset.gaps.extend([pk, seen] for pk in range(offset.last_event_id + 1, event_id))
+
+
+def _deliver_gaps(offset, handler):
+    """Deliver watched ids that have committed since; returns ``(delivered, blocked)``."""
+    watched = dict(offset.gaps)
+    events = list(OutboxEvent.objects.filter(pk__in=watched).order_by('pk'))
+    delivered, blocked = 0, False
+    for event in events:
+        if not _deliver(offset, handler, event):
+            blocked = True
+            break
+        del watched[event.pk]
+        delivered += 1
+    committed = {event.pk for event in events}
+    cutoff = (timezone.now() - GAP_TIMEOUT).timestamp()
+    offset.gaps = [[pk, seen] for pk, seen in sorted(watched.items()) if pk in committed or seen > cutoff]
+    return delivered, blocked
+
+
+def dispatch_consumer(name, handler, batch_size=BATCH_SIZE):
+    """Deliver pending events to one consumer until caught up or a handler fails. Returns the count."""
+    offset = _acquire(name)
+    if offset is None:
+        return 0
+    fields = ['last_event_id', 'failures', 'last_error', 'gaps', 'updated_at']
+    try:
+        delivered, blocked = _deliver_gaps(offset, handler) if offset.gaps else (0, False)
+        if blocked:
+            offset.save(update_fields=fields)
+        # A failed event blocks the consumer so later events of the same aggregate stay in order.
+        while not blocked:
+            events = list(
+                OutboxEvent.objects.filter(pk__gt=offset.last_event_id, created_at__lte=timezone.now() - SETTLE_DELAY)
+                .order_by('pk')[:batch_size]
+            )
+            for event in events:
+                if not _deliver(offset, handler, event):
+                    blocked = True
+                    break
+                _watch_gap(offset, event.pk)
+                offset.last_event_id = event.pk
+                delivered += 1
+            offset.save(update_fields=fields)
+            if len(events) < batch_size:
+                break
+    finally:
+        ConsumerOffset.objects.filter(pk=offset.pk).update(locked_until=None)
+    return delivered
+
+
+def dispatch_events(batch_size=BATCH_SIZE):
+    """Drain the outbox for every registered consumer; returns ``{consumer: delivered}``."""
+    return {name: dispatch_consumer(name, handler, batch_size) for name, handler in consumers.items()}
+
+
+def replay_parked(parked):
+    """Hand a parked event to its consumer again and drop the parking; raises if the handler fails."""
+    consumers[parked.consumer](parked.event)
+    parked.delete()
+
+
+def prune_events():
+    """Delete events older than KEEP_DAYS that every registered consumer has seen."""
+    cutoff = timezone.now() - timedelta(days=KEEP_DAYS)
+    # Parked events stay until they are replayed.
+    events = OutboxEvent.objects.filter(created_at__lt=cutoff, parkings__isnull=True)
+    if consumers:
+        lowest = ConsumerOffset.objects.filter(consumer__in=consumers).aggregate(lowest=Min('last_event_id'))['lowest']
+        if lowest is None or ConsumerOffset.objects.filter(consumer__in=consumers).count() < len(consumers):
+            return 0
+        events = events.filter(pk__lte=lowest)
+    deleted, _ = events.delete()
+    return deleted
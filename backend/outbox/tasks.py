@@ -0,0 +1,14 @@
+from datetime import timedelta
+
+from tasks.services import task
+from .services import dispatch_events, prune_events
+
+
+@task(every=timedelta(seconds=30), max_attempts=1)
+def dispatch_outbox():
+    return dispatch_events()
+
+
+@task(every=timedelta(days=1))
+def prune_outbox():
+    return prune_events()
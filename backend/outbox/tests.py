@@ -0,0 +1,99 @@
+from contextlib import nullcontext
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import ConsumerOffset, OutboxEvent, ParkedEvent
+from .services import GAP_TIMEOUT, MAX_FAILURES, consumers, dispatch_consumer, record_event, replay_parked
+
+
+def event(pk=None):
+    if pk is None:
+        return record_event('booking', 1, 'booking.test', {})
+    return OutboxEvent.objects.create(pk=pk, aggregate_type='booking', aggregate_id=1, event_type='booking.test')
+
+
+@mock.patch('outbox.services.SETTLE_DELAY', timedelta(0))
+class DispatchTests(TestCase):
+    def setUp(self):
+        self.seen = []
+        self.failing = set()
+
+    def handler(self, outbox_event):
+        if outbox_event.pk in self.failing:
+            raise RuntimeError('handler failed')
+        self.seen.append(outbox_event.pk)
+
+    def dispatch(self, batch_size=100):
+        # Handler failures are logged; keep them out of the test output.
+        with self.assertLogs('outbox.services', 'ERROR') if self.failing else nullcontext():
+            return dispatch_consumer('test', self.handler, batch_size)
+
+    def offset(self):
+        return ConsumerOffset.objects.get(consumer='test')
+
+    def test_offset_advances_in_order_across_batches(self):
+        events = [event().pk for _ in range(5)]
+        self.assertEqual(self.dispatch(batch_size=2), 5)
+        self.assertEqual(self.seen, events)
+        self.assertEqual(self.offset().last_event_id, events[-1])
+        self.assertEqual(self.dispatch(), 0)
+
+    def test_failure_blocks_later_events(self):
+        first, second, third = (event().pk for _ in range(3))
+        self.failing = {second}
+        self.assertEqual(self.dispatch(), 1)
+        self.assertEqual(self.dispatch(), 0)
+        offset = self.offset()
+        self.assertEqual((offset.last_event_id, offset.failures), (first, 2))
+        self.assertIn('handler failed', offset.last_error)
+
+        self.failing = set()
+        self.assertEqual(self.dispatch(), 2)
+        self.assertEqual(self.seen, [first, second, third])
+        self.assertEqual(self.offset().failures, 0)
+
+    def test_poison_event_parked_after_max_failures(self):
+        first, poison, third = (event().pk for _ in range(3))
+        self.failing = {poison}
+        for _ in range(MAX_FAILURES):
+            self.dispatch()
+        self.assertEqual(self.seen, [first, third])
+        self.assertEqual(self.offset().last_event_id, third)
+        parked = ParkedEvent.objects.get(consumer='test')
+        self.assertEqual(parked.event_id, poison)
+
+        self.failing = set()
+        with mock.patch.dict(consumers, {'test': self.handler}):
+            replay_parked(parked)
+        self.assertEqual(self.seen[-1], poison)
+        self.assertFalse(ParkedEvent.objects.exists())
+
+    def test_late_commit_below_offset_is_delivered(self):
+        first = event().pk
+        # The id in between is still in an open transaction.
+        third = event(first + 2).pk
+        self.dispatch()
+        self.assertEqual(self.seen, [first, third])
+        self.assertEqual([pk for pk, _ in self.offset().gaps], [first + 1])
+
+        event(first + 1)
+        self.assertEqual(self.dispatch(), 1)
+        self.assertEqual(self.seen, [first, third, first + 1])
+        self.assertEqual(self.offset().gaps, [])
+
+    def test_gap_given_up_after_timeout(self):
+        event()
+        self.dispatch()
+        stale = (timezone.now() - GAP_TIMEOUT - timedelta(minutes=1)).timestamp()
+        ConsumerOffset.objects.filter(consumer='test').update(gaps=[[10 ** 9, stale]])
+        self.dispatch()
+        self.assertEqual(self.offset().gaps, [])
+
+    def test_leased_consumer_is_skipped(self):
+        event()
+        ConsumerOffset.objects.create(consumer='test', locked_until=timezone.now() + timedelta(minutes=1))
+        self.assertEqual(self.dispatch(), 0)
+        self.assertEqual(self.seen, [])
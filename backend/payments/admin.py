@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.utils.safestring import mark_safe
+from outbox.services import record_payment_event
 from .models import Payment
 
 
@@ -15,3 +16,8 @@ class PaymentAdmin(admin.ModelAdmin):
         if obj.proof_of_payment:
             return mark_safe(f'<img src="{obj.proof_of_payment.url}" style="max-height:400px; max-width:100%;" />')
         return '-'
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and 'status' in form.changed_data:
+            record_payment_event(obj, 'payment.status_changed', form.initial.get('status'))
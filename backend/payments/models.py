@@ -24,5 +24,11 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Revenue and pending-payment queries on the dashboard.
+            models.Index(fields=['status', 'created_at'], name='payment_status_created_idx'),
+        ]
+
     def __str__(self):
         return f'Payment for Booking #{self.booking_id} - {self.status}'
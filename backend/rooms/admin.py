@@ -14,6 +14,7 @@ class RoomAdmin(admin.ModelAdmin):
     list_display = ('name', 'room_type', 'day_price', 'night_price', 'is_day_only', 'capacity', 'is_active')
     list_filter = ('room_type', 'is_active')
     search_fields = ('name',)
+    readonly_fields = ('primary_image',)
     inlines = [RoomImageInline]
 
 
@@ -0,0 +1,153 @@
+"""
+Per-room iCalendar feeds of booked slots.
+
+Every booked (date, slot) of a pending, confirmed or completed booking
+becomes a VEVENT. Events are precomputed per room and date in ``CalendarDay``
+rows, and the ``calendar`` outbox consumer recomputes only the dates a
+booking change touches. The feed is assembled from those rows and cached as bytes, together
+with its ETag and Last-Modified, under the room's ``RoomCalendar.last_modified``.
+The consumer runs in the task worker, whose cache the web service may not
+share, so the key comes from the database rather than a cache version. A client
+polling the feed therefore costs one indexed lookup and a cache read, or a 304.
+"""
+
+import hashlib
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.db import transaction
+from django.utils import timezone
+
+from bookings.models import Booking, BookingStatus
+from hotel.cache import NamespacedCache
+from hotel.response_cache import get_versions
+from .models import CalendarDay, Room, RoomCalendar
+
+RESORT_TZ = ZoneInfo('Asia/Manila')
+# Local start and end hour; the night slot ends the next morning.
+SLOT_HOURS = {'day': (8, 17), 'night': (17, 8)}
+# Completed stays stay on the feed, so completing a booking does not change it.
+BOOKED_STATUSES = (BookingStatus.CONFIRMED, BookingStatus.PENDING, BookingStatus.COMPLETED)
+# Feeds show bookings from this many days back onwards.
+PAST_DAYS = 30
+FEED_TIMEOUT = 60 * 60 * 24
+PRODID = '-//Adel Beach Resort//Room Availability//EN'
+
+cache = NamespacedCache('calendar')
+
+
+def _feed_key(room_id, today, last_modified):
+    (room_version,) = get_versions([Room])
+    return f'feed:{room_id}:{today}:{last_modified.timestamp()}:{room_version}'
+
+
+def _utc(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def slot_end(day, slot):
+    start_hour, end_hour = SLOT_HOURS[slot]
+    return datetime.combine(day + timedelta(days=end_hour <= start_hour), time(end_hour), RESORT_TZ)
+
+
+def slot_event(booking_id, status, created_at, day, slot):
+    start = datetime.combine(day, time(SLOT_HOURS[slot][0]), RESORT_TZ)
+    end = slot_end(day, slot)
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:booking-{booking_id}-{day:%Y%m%d}-{slot}@adel-beach-resort',
+        f'DTSTAMP:{_utc(created_at)}',
+        f'DTSTART:{_utc(start)}',
+        f'DTEND:{_utc(end)}',
+        f'SUMMARY:Booked ({slot})',
+        f'STATUS:{"TENTATIVE" if status == BookingStatus.PENDING else "CONFIRMED"}',
+        'TRANSP:OPAQUE',
+        'END:VEVENT',
+    ]
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def compute_days(room_id, start=None, end=None):
+    """``{date: events}`` for the booked slots of a room, optionally limited to ``start``..``end``."""
+    bookings = Booking.objects.filter(room_id=room_id, status__in=BOOKED_STATUSES)
+    if start is not None:
+        bookings = bookings.filter(check_in__lte=end, check_out__gte=start)
+    days = defaultdict(list)
+    for pk, status, created_at, slots in bookings.values_list('pk', 'status', 'created_at', 'slots').iterator():
+        for entry in slots:
+            day = date.fromisoformat(entry['date'])
+            if start is None or start <= day <= end:
+                days[day].append((entry['slot'] != 'day', pk, slot_event(pk, status, created_at, day, entry['slot'])))
+    return {day: ''.join(event for *_, event in sorted(events)) for day, events in days.items()}
+
+
+def rebuild_room(room_id):
+    """Recompute every day of a room's calendar from its bookings."""
+    with transaction.atomic():
+        # Serialises concurrent first requests for the same room.
+        Room.objects.select_for_update().filter(pk=room_id).first()
+        days = compute_days(room_id)
+        CalendarDay.objects.filter(room_id=room_id).delete()
+        CalendarDay.objects.bulk_create(
+            [CalendarDay(room_id=room_id, date=day, events=events) for day, events in days.items()],
+            batch_size=500,
+        )
+        RoomCalendar.objects.update_or_create(room_id=room_id, defaults={'last_modified': timezone.now()})
+
+
+def refresh_dates(room_id, start, end):
+    """Recompute the calendar days ``start``..``end`` of a room; returns whether anything changed."""
+    if not RoomCalendar.objects.filter(room_id=room_id).exists():
+        # Never built: the first feed request builds it in full.
+        return False
+    fresh = compute_days(room_id, start, end)
+    with transaction.atomic():
+        existing = CalendarDay.objects.filter(room_id=room_id, date__range=(start, end))
+        current = dict(existing.values_list('date', 'events'))
+        if current == fresh:
+            return False
+        existing.exclude(date__in=list(fresh)).delete()
+        for day, events in fresh.items():
+            if current.get(day) != events:
+                CalendarDay.objects.update_or_create(room_id=room_id, date=day, defaults={'events': events})
+        RoomCalendar.objects.filter(room_id=room_id).update(last_modified=timezone.now())
+    return True
+
+
+def get_feed(room_id):
+    """``(content, etag, last_modified)`` of a room's feed, or None for unknown or inactive rooms."""
+    today = timezone.localdate()
+    # Read before the days, so newer days may be cached under an older key but never the reverse.
+    last_modified = RoomCalendar.objects.filter(room_id=room_id).values_list('last_modified', flat=True).first()
+    if last_modified is not None:
+        feed = cache.get(_feed_key(room_id, today, last_modified))
+        if feed is not None:
+            return feed
+
+    room = Room.objects.filter(pk=room_id, is_active=True).only('name').first()
+    if room is None:
+        return None
+    if last_modified is None:
+        rebuild_room(room_id)
+        last_modified = RoomCalendar.objects.values_list('last_modified', flat=True).get(room=room)
+
+    days = CalendarDay.objects.filter(
+        room=room, date__gte=today - timedelta(days=PAST_DAYS),
+    ).values_list('events', flat=True)
+    header = '\r\n'.join([
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{_escape(room.name)}',
+    ]) + '\r\n'
+    content = (header + ''.join(days) + 'END:VCALENDAR\r\n').encode()
+    feed = (content, '"{}"'.format(hashlib.sha1(content).hexdigest()), last_modified)
+    cache.set(_feed_key(room_id, today, last_modified), feed, FEED_TIMEOUT)
+    return feed
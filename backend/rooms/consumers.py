@@ -0,0 +1,19 @@
+from datetime import date
+
+from outbox.services import consumer
+from .calendar import refresh_dates
+
+
+@consumer('calendar')
+def refresh_room_calendar(event):
+    if event.aggregate_type != 'booking':
+        return
+    payload = event.payload
+    refresh_dates(payload['room_id'], date.fromisoformat(payload['check_in']), date.fromisoformat(payload['check_out']))
+    # booking.updated: a booking moved in the admin also leaves its old room and dates.
+    if 'previous_room_id' in payload:
+        refresh_dates(
+            payload['previous_room_id'],
+            date.fromisoformat(payload['previous_check_in']),
+            date.fromisoformat(payload['previous_check_out']),
+        )
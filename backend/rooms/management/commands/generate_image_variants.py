@@ -0,0 +1,58 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from PIL import UnidentifiedImageError
+
+from content.models import News, Event, Promotion
+from hotel.image_variants import needs_variants, read_source, render_variants, save_variants
+from rooms.models import RoomImage
+
+# Source images read ahead per pool worker; bounds how many originals sit in memory.
+IN_FLIGHT_PER_WORKER = 2
+
+
+class Command(BaseCommand):
+    help = 'Backfill thumbnail/card/full WebP and JPEG variants for room and content images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='Process pool size (default: CPU count).')
+        parser.add_argument('--force', action='store_true', help='Regenerate variants that already exist.')
+
+    def handle(self, *args, **options):
+        workers = options['workers'] or os.cpu_count() or 1
+        limit = workers * IN_FLIGHT_PER_WORKER
+        pending = [
+            instance
+            for model in (RoomImage, News, Event, Promotion)
+            for instance in model.objects.exclude(image='').exclude(image__isnull=True).iterator()
+            if options['force'] or needs_variants(instance)
+        ]
+        self.done = self.failed = 0
+        # Pillow does the heavy lifting in the pool; storage reads and writes stay here.
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {}
+            for instance in pending:
+                if len(futures) >= limit:
+                    finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        self.save(futures.pop(future), future)
+                try:
+                    futures[pool.submit(render_variants, read_source(instance))] = instance
+                except OSError as e:
+                    self.error(instance, e)
+            for future in list(futures):
+                self.save(futures.pop(future), future)
+
+        self.stdout.write(self.style.SUCCESS(f'Generated variants for {self.done} image(s), {self.failed} failed.'))
+
+    def save(self, instance, future):
+        try:
+            save_variants(instance, future.result())
+            self.done += 1
+        except (OSError, UnidentifiedImageError) as e:
+            self.error(instance, e)
+
+    def error(self, instance, e):
+        self.failed += 1
+        self.stderr.write(f'{type(instance).__name__} #{instance.pk}: {e}')
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from rooms.calendar import rebuild_room
+from rooms.models import Room
+
+
+class Command(BaseCommand):
+    help = 'Recompute the precomputed iCalendar days of every room from its bookings.'
+
+    def handle(self, *args, **options):
+        rooms = list(Room.objects.values_list('pk', flat=True))
+        for pk in rooms:
+            rebuild_room(pk)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt calendars for {len(rooms)} room(s).'))
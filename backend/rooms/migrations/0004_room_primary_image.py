@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def set_primary_images(apps, schema_editor):
+    Room = apps.get_model('rooms', 'Room')
+    RoomImage = apps.get_model('rooms', 'RoomImage')
+    for room in Room.objects.all():
+        image = RoomImage.objects.filter(room=room).order_by('-is_primary', 'order', 'id').first()
+        if image:
+            Room.objects.filter(pk=room.pk).update(primary_image=image)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0003_merge_room_types'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='primary_image',
+            field=models.ForeignKey(blank=True, help_text='Maintained automatically from the room images.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='rooms.roomimage'),
+        ),
+        migrations.RunPython(set_primary_images, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0004_room_primary_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='roomimage',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
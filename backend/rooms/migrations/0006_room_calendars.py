@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0005_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomCalendar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_modified', models.DateTimeField()),
+                ('room', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='calendar', to='rooms.room')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CalendarDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('events', models.TextField()),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calendar_days', to='rooms.room')),
+            ],
+            options={
+                'ordering': ['date'],
+                'constraints': [models.UniqueConstraint(fields=('room', 'date'), name='calendar_day_room_date_unique')],
+            },
+        ),
+    ]
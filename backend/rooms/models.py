@@ -22,6 +22,10 @@ class Room(models.Model):
     size_sqm = models.PositiveIntegerField(null=True, blank=True)
     amenities = models.JSONField(default=list)
     is_active = models.BooleanField(default=True)
+    primary_image = models.ForeignKey(
+        'RoomImage', null=True, blank=True, on_delete=models.SET_NULL, related_name='+',
+        help_text='Maintained automatically from the room images.',
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -31,10 +35,17 @@ class Room(models.Model):
     def __str__(self):
         return f'{self.name} ({self.get_room_type_display()})'
 
+    def refresh_primary_image(self):
+        """Point ``primary_image`` at the flagged image, falling back to the first one."""
+        image = self.images.order_by('-is_primary', 'order', 'id').first()
+        self.primary_image = image
+        Room.objects.filter(pk=self.pk).update(primary_image=image)
+
 
 class RoomImage(models.Model):
     room = models.ForeignKey(Room, related_name='images', on_delete=models.CASCADE)
     image = models.ImageField(upload_to='rooms/')
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     alt_text = models.CharField(max_length=200, blank=True)
     is_primary = models.BooleanField(default=False)
     order = models.PositiveIntegerField(default=0)
@@ -44,3 +55,27 @@ class RoomImage(models.Model):
 
     def __str__(self):
         return f'Image for {self.room.name}'
+
+
+class RoomCalendar(models.Model):
+    """Marks a room's iCalendar days as built; see rooms/calendar.py."""
+
+    room = models.OneToOneField(Room, related_name='calendar', on_delete=models.CASCADE)
+    last_modified = models.DateTimeField()
+
+    def __str__(self):
+        return f'Calendar for {self.room.name}'
+
+
+class CalendarDay(models.Model):
+    """Precomputed VEVENT lines for one room and date, rebuilt only when a booking touches the date."""
+
+    room = models.ForeignKey(Room, related_name='calendar_days', on_delete=models.CASCADE)
+    date = models.DateField()
+    events = models.TextField()
+
+    class Meta:
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(fields=['room', 'date'], name='calendar_day_room_date_unique'),
+        ]
@@ -1,54 +1,93 @@
 from rest_framework import serializers
+from hotel.image_variants import image_srcset
+from hotel.sparse_fields import SparseFieldsMixin
 from .models import Room, RoomImage
 
 
+def primary_image(room):
+    """
+    The room's primary image without extra queries: taken from the prefetched
+    ``images`` when present, otherwise via the denormalized ``primary_image``
+    pointer (select_related it).
+    """
+    prefetched = getattr(room, '_prefetched_objects_cache', {}).get('images')
+    if prefetched is None:
+        return room.primary_image
+    images = list(prefetched)
+    return (
+        next((i for i in images if i.pk == room.primary_image_id), None)
+        or next((i for i in images if i.is_primary), None)
+        or (images[0] if images else None)
+    )
+
+
+def primary_image_url(room, request=None):
+    primary = primary_image(room)
+    if not primary:
+        return None
+    if request:
+        return request.build_absolute_uri(primary.image.url)
+    return primary.image.url
+
+
 class RoomImageSerializer(serializers.ModelSerializer):
+    image_srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = RoomImage
-        fields = ('id', 'image', 'alt_text', 'is_primary', 'order')
+        fields = ('id', 'image', 'image_srcset', 'alt_text', 'is_primary', 'order')
+
+    def get_image_srcset(self, obj):
+        return image_srcset(obj.image_variants, self.context.get('request'))
 
 
-class RoomSerializer(serializers.ModelSerializer):
+class RoomSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     images = RoomImageSerializer(many=True, read_only=True)
     room_type_display = serializers.CharField(source='get_room_type_display', read_only=True)
     primary_image = serializers.SerializerMethodField()
+    primary_image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Room
         fields = (
             'id', 'name', 'room_type', 'room_type_display', 'description',
             'day_price', 'night_price', 'is_day_only', 'capacity', 'size_sqm',
-            'amenities', 'is_active', 'images', 'primary_image', 'created_at',
+            'amenities', 'is_active', 'images', 'primary_image', 'primary_image_srcset', 'created_at',
+        )
+        compact_fields = (
+            'id', 'name', 'room_type', 'room_type_display', 'day_price', 'night_price',
+            'is_day_only', 'capacity', 'primary_image',
         )
 
     def get_primary_image(self, obj):
-        primary = obj.images.filter(is_primary=True).first() or obj.images.first()
-        if primary:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(primary.image.url)
-            return primary.image.url
-        return None
+        return primary_image_url(obj, self.context.get('request'))
+
+    def get_primary_image_srcset(self, obj):
+        primary = primary_image(obj)
+        return image_srcset(primary.image_variants, self.context.get('request')) if primary else None
 
 
-class RoomListSerializer(serializers.ModelSerializer):
+class RoomListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     images = RoomImageSerializer(many=True, read_only=True)
     room_type_display = serializers.CharField(source='get_room_type_display', read_only=True)
     primary_image = serializers.SerializerMethodField()
+    primary_image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Room
         fields = (
             'id', 'name', 'room_type', 'room_type_display',
             'day_price', 'night_price', 'is_day_only', 'capacity',
-            'primary_image', 'amenities', 'images',
+            'primary_image', 'primary_image_srcset', 'amenities', 'images',
+        )
+        compact_fields = (
+            'id', 'name', 'room_type', 'room_type_display', 'day_price', 'night_price',
+            'is_day_only', 'capacity', 'primary_image',
         )
 
     def get_primary_image(self, obj):
-        primary = obj.images.filter(is_primary=True).first() or obj.images.first()
-        if primary:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(primary.image.url)
-            return primary.image.url
-        return None
+        return primary_image_url(obj, self.context.get('request'))
+
+    def get_primary_image_srcset(self, obj):
+        primary = primary_image(obj)
+        return image_srcset(primary.image_variants, self.context.get('request')) if primary else None
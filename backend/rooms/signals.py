@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from hotel.image_variants import delete_image_variants, ensure_image_variants
+from hotel.response_cache import bump_model_version
+from .models import Room, RoomImage
+
+for _model in (Room, RoomImage):
+    post_save.connect(bump_model_version, sender=_model, dispatch_uid=f'response-cache-{_model.__name__}')
+    post_delete.connect(bump_model_version, sender=_model, dispatch_uid=f'response-cache-{_model.__name__}')
+
+post_save.connect(ensure_image_variants, sender=RoomImage, dispatch_uid='image-variants-RoomImage')
+post_delete.connect(delete_image_variants, sender=RoomImage, dispatch_uid='image-variants-RoomImage')
+
+
+@receiver(post_save, sender=RoomImage)
+@receiver(post_delete, sender=RoomImage)
+def update_primary_image(sender, instance, **kwargs):
+    room = Room.objects.filter(pk=instance.room_id).first()
+    if room:
+        room.refresh_primary_image()
+
+
+@receiver(post_save, sender=Room)
+def restore_primary_image_after_loaddata(sender, instance, raw=False, **kwargs):
+    # fixtures/rooms.json is reloaded on every deploy and does not carry the pointer.
+    if raw:
+        instance.refresh_primary_image()
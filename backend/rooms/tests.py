@@ -0,0 +1,120 @@
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.admin.sites import site
+from django.core.cache import cache
+from django.forms.models import model_to_dict
+from django.test import RequestFactory, TestCase, override_settings
+
+from accounts.models import User
+from bookings.models import Booking
+from notifications.models import NotificationKind
+from outbox.models import OutboxEvent
+from outbox.services import booking_payload, record_event
+from .calendar import get_feed, rebuild_room
+from .consumers import refresh_room_calendar
+from .models import CalendarDay, Room
+
+
+class AdminMoveTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin_user = User.objects.create_superuser('admin@example.com', 'pw')
+        self.guest = User.objects.create_user('guest@example.com', 'pw', first_name='Guest', last_name='User')
+        self.old_room = Room.objects.create(name='Cottage 1', description='', day_price=Decimal('500'))
+        self.new_room = Room.objects.create(name='Cottage 2', description='', day_price=Decimal('500'))
+        self.old_day = date.today() + timedelta(days=10)
+        self.new_day = self.old_day + timedelta(days=5)
+        self.booking = Booking.objects.create(
+            user=self.guest, room=self.old_room, check_in=self.old_day, check_out=self.old_day,
+            slots=[{'date': self.old_day.isoformat(), 'slot': 'day'}], total_price=Decimal('500'),
+        )
+        rebuild_room(self.old_room.pk)
+        rebuild_room(self.new_room.pk)
+
+    def move(self, **changes):
+        model_admin = site._registry[Booking]
+        request = RequestFactory().post('/')
+        request.user = self.admin_user
+        data = {**model_to_dict(self.booking), **changes}
+        data['slots'] = json.dumps(data['slots'])
+        # Sent by the change form: the field's default is callable.
+        data['initial-slots'] = json.dumps(self.booking.slots)
+        form = model_admin.get_form(request, self.booking)(data, instance=self.booking)
+        self.assertTrue(form.is_valid(), form.errors)
+        model_admin.save_model(request, form.save(commit=False), form, True)
+
+    def test_move_refreshes_old_and_new_ranges(self):
+        self.move(
+            room=self.new_room.pk, check_in=self.new_day, check_out=self.new_day,
+            slots=[{'date': self.new_day.isoformat(), 'slot': 'day'}],
+        )
+        event = OutboxEvent.objects.get(event_type='booking.updated')
+        self.assertEqual(
+            (event.payload['previous_room_id'], event.payload['previous_check_in']),
+            (self.old_room.pk, self.old_day.isoformat()),
+        )
+
+        refresh_room_calendar(event)
+        self.assertFalse(CalendarDay.objects.filter(room=self.old_room).exists())
+        self.assertEqual(list(CalendarDay.objects.filter(room=self.new_room).values_list('date', flat=True)), [self.new_day])
+
+    def test_move_opens_the_old_slot_to_the_waitlist(self):
+        waiting = self.guest.waitlist_entries.create(room=self.old_room, date=self.old_day, slot='day')
+        self.move(room=self.new_room.pk)
+        self.assertEqual(
+            list(waiting.notifications.values_list('kind', flat=True)), [NotificationKind.WAITLIST_OPENING],
+        )
+
+    def test_unrelated_change_records_no_move(self):
+        self.move(special_requests='Late arrival')
+        self.assertFalse(OutboxEvent.objects.filter(event_type='booking.updated').exists())
+
+
+class CalendarFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.guest = User.objects.create_user('guest@example.com', 'pw', first_name='Guest', last_name='User')
+        self.room = Room.objects.create(name='Cottage 1', description='', day_price=Decimal('500'))
+        self.day = date.today() + timedelta(days=3)
+        self.url = f'/api/rooms/{self.room.pk}/calendar.ics'
+
+    def book(self):
+        booking = Booking.objects.create(
+            user=self.guest, room=self.room, check_in=self.day, check_out=self.day,
+            slots=[{'date': self.day.isoformat(), 'slot': 'night'}], total_price=Decimal('500'),
+        )
+        return record_event('booking', booking.pk, 'booking.created', booking_payload(booking))
+
+    def test_feed_is_built_then_served_from_cache(self):
+        content, etag, _ = get_feed(self.room.pk)
+        self.assertNotIn(b'BEGIN:VEVENT', content)
+        # The RoomCalendar lookup; the feed itself comes from the cache.
+        with self.assertNumQueries(1):
+            self.assertEqual(get_feed(self.room.pk)[1], etag)
+
+    def test_refresh_in_a_worker_with_its_own_cache_reaches_the_feed(self):
+        get_feed(self.room.pk)
+        event = self.book()
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            refresh_room_calendar(event)
+        self.assertIn(b'SUMMARY:Booked (night)', get_feed(self.room.pk)[0])
+
+    def test_conditional_get(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        etag = response['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        refresh_room_calendar(self.book())
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn(b'BEGIN:VEVENT', response.content)
+
+    def test_unknown_or_inactive_room(self):
+        self.assertEqual(self.client.get('/api/rooms/999/calendar.ics').status_code, 404)
+        Room.objects.filter(pk=self.room.pk).update(is_active=False)
+        self.assertIsNone(get_feed(self.room.pk))
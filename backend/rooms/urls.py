@@ -6,4 +6,5 @@ urlpatterns = [
     path('all-availability/', views.all_rooms_availability, name='all-availability'),
     path('<int:pk>/', views.RoomDetailView.as_view(), name='room-detail'),
     path('<int:pk>/availability/', views.room_availability, name='room-availability'),
+    path('<int:pk>/calendar.ics', views.room_calendar, name='room-calendar'),
 ]
@@ -3,14 +3,21 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_GET
 
-from .models import Room
+from .models import Room, RoomImage
 from .serializers import RoomSerializer, RoomListSerializer
 from .filters import RoomFilter
+from .calendar import get_feed
+from hotel.response_cache import CachedResponseMixin
 from bookings.models import Booking
 
 
-class RoomListView(generics.ListAPIView):
+class RoomListView(CachedResponseMixin, generics.ListAPIView):
+    cache_models = (Room, RoomImage)
     serializer_class = RoomListSerializer
     permission_classes = [AllowAny]
     filterset_class = RoomFilter
@@ -19,7 +26,8 @@ class RoomListView(generics.ListAPIView):
         return Room.objects.filter(is_active=True).prefetch_related('images')
 
 
-class RoomDetailView(generics.RetrieveAPIView):
+class RoomDetailView(CachedResponseMixin, generics.RetrieveAPIView):
+    cache_models = (Room, RoomImage)
     queryset = Room.objects.filter(is_active=True).prefetch_related('images')
     serializer_class = RoomSerializer
     permission_classes = [AllowAny]
@@ -72,3 +80,20 @@ def all_rooms_availability(request):
         })
 
     return Response(result)
+
+
+@require_GET
+def room_calendar(request, pk):
+    """Booked slots of a room as an iCalendar feed, with conditional GET for polling clients."""
+    feed = get_feed(pk)
+    if feed is None:
+        raise Http404('Room not found.')
+    content, etag, last_modified = feed
+    last_modified = int(last_modified.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(content, content_type='text/calendar; charset=utf-8')
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'public, max-age=300'
+    return response
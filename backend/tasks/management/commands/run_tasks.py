@@ -0,0 +1,88 @@
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from tasks.services import (
+    HEARTBEAT_INTERVAL, claim_tasks, ensure_periodic_tasks, heartbeat, requeue_stale_tasks, run_task,
+)
+
+# Seconds between stale-lock and periodic-schedule sweeps.
+MAINTENANCE_INTERVAL = 60
+# Database connections a pool process inherited from the worker; kept referenced so they are never closed.
+_inherited = []
+
+
+def detach_connections():
+    """Process pool initializer: make a forked child open database connections of its own."""
+    # Closing an inherited connection would end the parent's session on the shared socket,
+    # so the child only forgets it; Django connects afresh on the next query.
+    for conn in connections.all(initialized_only=True):
+        if conn.connection is not None:
+            _inherited.append(conn.connection)
+            conn.connection = None
+
+
+class Command(BaseCommand):
+    help = 'Run queued background tasks from the database with a thread or process pool.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2, help='Tasks run at the same time.')
+        parser.add_argument('--pool', choices=('thread', 'process'), default='thread',
+                            help='Threads suit I/O-bound tasks; processes suit CPU-bound ones like image rendering.')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to sleep when the queue is empty.')
+        parser.add_argument('--once', action='store_true', help='Exit once no task is due instead of polling.')
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency']
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        if options['pool'] == 'process':
+            # Children are forked at the first submit, after the loop below has connected.
+            pool = ProcessPoolExecutor(concurrency, initializer=detach_connections)
+        else:
+            pool = ThreadPoolExecutor(concurrency)
+
+        self.stdout.write(f'Worker {worker_id} running with {concurrency} {options["pool"]}(s).')
+        done = 0
+        inflight = {}
+        next_maintenance = next_heartbeat = 0
+        try:
+            while not self.stopping:
+                if time.monotonic() >= next_maintenance:
+                    requeue_stale_tasks()
+                    ensure_periodic_tasks()
+                    next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+
+                if time.monotonic() >= next_heartbeat:
+                    heartbeat(worker_id, list(inflight.values()))
+                    next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL.total_seconds()
+
+                claimed = claim_tasks(worker_id, concurrency - len(inflight)) if len(inflight) < concurrency else []
+                inflight.update((pool.submit(run_task, pk), pk) for pk in claimed)
+                close_old_connections()
+
+                if inflight:
+                    finished, _ = wait(inflight, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        del inflight[future]
+                    done += len(finished)
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['poll_interval'])
+        finally:
+            # Let running tasks finish; a killed worker's tasks are requeued after the lock timeout.
+            pool.shutdown(wait=True)
+            done += len(inflight)
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker_id} stopped after {done} task(s).'))
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,186 @@
+"""
+Database-backed task queue.
+
+Functions decorated with ``@task`` are queued with ``.delay()`` or
+``.schedule()`` as ``Task`` rows in the main database, so enqueueing is part of
+the caller's transaction and needs no broker. ``run_tasks`` workers claim due
+rows with ``SELECT ... FOR UPDATE SKIP LOCKED`` where the backend supports it
+(Postgres) and with a conditional UPDATE per row otherwise (SQLite, which
+serialises writers anyway). Failed runs are retried with exponential backoff;
+``every=`` tasks keep exactly one pending run that is rescheduled after each
+finished one.
+"""
+
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+# Workers refresh the lock of their running tasks this often, however long a task runs.
+HEARTBEAT_INTERVAL = timedelta(minutes=1)
+# Running tasks whose lock was not refreshed for this long belong to a dead worker.
+LOCK_TIMEOUT = timedelta(minutes=10)
+
+registry = {}
+
+
+class TaskFunction:
+    def __init__(self, func, name, max_attempts, backoff, every, priority):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.every = every
+        self.priority = priority
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        return enqueue(self.name, args, kwargs)
+
+    def schedule(self, run_at, *args, **kwargs):
+        return enqueue(self.name, args, kwargs, run_at=run_at)
+
+    def retry_delay(self, attempts):
+        return timedelta(seconds=self.backoff * 2 ** (attempts - 1))
+
+
+def task(name=None, *, max_attempts=3, backoff=30, every=None, priority=0):
+    """
+    Register a function as a queueable task.
+
+    Arguments must be JSON-serialisable. ``backoff`` is the first retry delay
+    in seconds, doubled on each further attempt; ``every`` (a timedelta) makes
+    the task periodic.
+    """
+    def decorator(func):
+        definition = TaskFunction(
+            func, name or f'{func.__module__}.{func.__name__}', max_attempts, backoff, every, priority,
+        )
+        registry[definition.name] = definition
+        return definition
+    return decorator
+
+
+def enqueue(name, args=(), kwargs=None, run_at=None, priority=None):
+    definition = registry[name]
+    kwargs = kwargs or {}
+    if settings.TASKS_EAGER:
+        definition.func(*args, **kwargs)
+        return None
+    return Task.objects.create(
+        name=name,
+        args=list(args),
+        kwargs=kwargs,
+        run_at=run_at or timezone.now(),
+        priority=definition.priority if priority is None else priority,
+        max_attempts=definition.max_attempts,
+    )
+
+
+def claim_tasks(worker_id, limit):
+    """Mark up to ``limit`` due tasks as running for ``worker_id`` and return their ids."""
+    now = timezone.now()
+    due = Task.objects.filter(status=TaskStatus.QUEUED, run_at__lte=now).order_by('-priority', 'run_at', 'pk')
+    claim = {'status': TaskStatus.RUNNING, 'locked_by': worker_id, 'locked_at': now, 'attempts': F('attempts') + 1}
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+            Task.objects.filter(pk__in=ids).update(**claim)
+        return ids
+
+    claimed = []
+    for pk in due.values_list('pk', flat=True)[:limit]:
+        # Another worker may have taken it since the SELECT; only one UPDATE matches.
+        if Task.objects.filter(pk=pk, status=TaskStatus.QUEUED).update(**claim):
+            claimed.append(pk)
+    return claimed
+
+
+def heartbeat(worker_id, pks):
+    """Refresh the locks of ``worker_id``'s running tasks so they are not requeued as stale."""
+    if not pks:
+        return 0
+    return Task.objects.filter(pk__in=pks, status=TaskStatus.RUNNING, locked_by=worker_id).update(
+        locked_at=timezone.now(),
+    )
+
+
+def run_task(pk):
+    """Execute a claimed task and record the outcome. Safe to call from pool threads or processes."""
+    close_old_connections()
+    try:
+        task = Task.objects.get(pk=pk)
+        definition = registry.get(task.name)
+        try:
+            if definition is None:
+                raise LookupError(f'No task registered as {task.name!r}.')
+            definition.func(*task.args, **task.kwargs)
+        except Exception:
+            logger.exception('Task %s failed (attempt %s of %s)', task, task.attempts, task.max_attempts)
+            _failed(task, definition, traceback.format_exc())
+        else:
+            Task.objects.filter(pk=pk).update(status=TaskStatus.SUCCEEDED, finished_at=timezone.now(), last_error='')
+            if task.periodic:
+                schedule_periodic(definition)
+    finally:
+        close_old_connections()
+
+
+def _failed(task, definition, error):
+    now = timezone.now()
+    if definition is not None and task.attempts < task.max_attempts:
+        Task.objects.filter(pk=task.pk).update(
+            status=TaskStatus.QUEUED, run_at=now + definition.retry_delay(task.attempts),
+            last_error=error, locked_by='', locked_at=None,
+        )
+        return
+    Task.objects.filter(pk=task.pk).update(status=TaskStatus.FAILED, finished_at=now, last_error=error)
+    if task.periodic and definition is not None:
+        schedule_periodic(definition)
+
+
+def schedule_periodic(definition, run_at=None):
+    """Queue the next run of a periodic task unless one is already pending."""
+    try:
+        with transaction.atomic():
+            Task.objects.create(
+                name=definition.name, periodic=True, priority=definition.priority,
+                max_attempts=definition.max_attempts, run_at=run_at or timezone.now() + definition.every,
+            )
+    except IntegrityError:
+        pass
+
+
+def ensure_periodic_tasks():
+    """Make sure every registered periodic task has a pending run, e.g. after a deploy adds one."""
+    pending = set(
+        Task.objects.filter(periodic=True, status__in=[TaskStatus.QUEUED, TaskStatus.RUNNING])
+        .values_list('name', flat=True)
+    )
+    for definition in registry.values():
+        if definition.every and definition.name not in pending:
+            schedule_periodic(definition, run_at=timezone.now())
+
+
+def requeue_stale_tasks():
+    """Give running tasks of crashed workers back to the queue, or fail them when out of attempts."""
+    cutoff = timezone.now() - LOCK_TIMEOUT
+    stale = Task.objects.filter(status=TaskStatus.RUNNING, locked_at__lt=cutoff)
+    requeued = stale.filter(attempts__lt=F('max_attempts')).update(
+        status=TaskStatus.QUEUED, locked_by='', locked_at=None, last_error='Worker lock expired.',
+    )
+    for task in stale.filter(attempts__gte=F('max_attempts')):
+        _failed(task, registry.get(task.name), 'Worker lock expired.')
+    return requeued
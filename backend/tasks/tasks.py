@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import Task, TaskStatus
+from .services import task
+
+# Finished tasks are kept this long for inspection in the admin.
+KEEP_FINISHED_DAYS = 7
+
+
+@task(every=timedelta(days=1))
+def prune_finished_tasks():
+    cutoff = timezone.now() - timedelta(days=KEEP_FINISHED_DAYS)
+    deleted, _ = Task.objects.filter(
+        status__in=[TaskStatus.SUCCEEDED, TaskStatus.FAILED], finished_at__lt=cutoff,
+    ).delete()
+    return deleted
@@ -0,0 +1,119 @@
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .models import Task, TaskStatus
+from .services import LOCK_TIMEOUT, claim_tasks, heartbeat, requeue_stale_tasks, run_task, task
+
+calls = []
+
+
+@task(name='tasks.tests.record', max_attempts=2, backoff=10)
+def record(value, fail=False):
+    calls.append(value)
+    if fail:
+        raise RuntimeError('failed on purpose')
+
+
+@task(name='tasks.tests.report_connection')
+def report_connection(path):
+    with open(path, 'w') as report:
+        report.write(f'{os.getpid()} {id(connection.connection)}')
+
+
+# run_task() closes stale connections, which must not happen inside a TestCase transaction.
+class TaskQueueTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_claim_takes_due_tasks_by_priority_once(self):
+        low = record.delay('low')
+        high = Task.objects.create(name=record.name, args=['high'], priority=5)
+        record.schedule(timezone.now() + timedelta(hours=1), 'later')
+
+        self.assertEqual(claim_tasks('w1', 10), [high.pk, low.pk])
+        self.assertEqual(claim_tasks('w2', 10), [])
+        high.refresh_from_db()
+        self.assertEqual((high.status, high.locked_by, high.attempts), (TaskStatus.RUNNING, 'w1', 1))
+
+    def test_claim_respects_limit(self):
+        for n in range(3):
+            record.delay(n)
+        self.assertEqual(len(claim_tasks('w1', 2)), 2)
+        self.assertEqual(len(claim_tasks('w1', 2)), 1)
+
+    def test_success(self):
+        queued = record.delay('ok')
+        (pk,) = claim_tasks('w1', 1)
+        run_task(pk)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, TaskStatus.SUCCEEDED)
+        self.assertEqual(calls, ['ok'])
+
+    def test_failure_retries_with_backoff_then_fails(self):
+        queued = record.delay('boom', fail=True)
+        (pk,) = claim_tasks('w1', 1)
+        before = timezone.now()
+        with self.assertLogs('tasks.services', 'ERROR'):
+            run_task(pk)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, TaskStatus.QUEUED)
+        self.assertIn('failed on purpose', queued.last_error)
+        self.assertGreaterEqual(queued.run_at, before + timedelta(seconds=10))
+        self.assertEqual(claim_tasks('w1', 1), [])
+
+        Task.objects.filter(pk=pk).update(run_at=timezone.now())
+        self.assertEqual(claim_tasks('w1', 1), [pk])
+        with self.assertLogs('tasks.services', 'ERROR'):
+            run_task(pk)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (TaskStatus.FAILED, 2))
+
+    def test_stale_tasks_requeued_or_failed(self):
+        stale = timezone.now() - LOCK_TIMEOUT - timedelta(minutes=1)
+        running = {'name': record.name, 'status': TaskStatus.RUNNING, 'max_attempts': 2}
+        retry = Task.objects.create(**running, attempts=1, locked_at=stale)
+        spent = Task.objects.create(**running, attempts=2, locked_at=stale)
+        fresh = Task.objects.create(**running, attempts=1, locked_at=timezone.now())
+
+        self.assertEqual(requeue_stale_tasks(), 1)
+        statuses = dict(Task.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses[retry.pk], TaskStatus.QUEUED)
+        self.assertEqual(statuses[spent.pk], TaskStatus.FAILED)
+        self.assertEqual(statuses[fresh.pk], TaskStatus.RUNNING)
+
+    def test_heartbeat_keeps_long_task_locked(self):
+        queued = record.delay('long')
+        claim_tasks('w1', 1)
+        Task.objects.filter(pk=queued.pk).update(locked_at=timezone.now() - LOCK_TIMEOUT - timedelta(minutes=1))
+
+        self.assertEqual(heartbeat('w2', [queued.pk]), 0)
+        self.assertEqual(heartbeat('w1', [queued.pk]), 1)
+        requeue_stale_tasks()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, TaskStatus.RUNNING)
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_mode_runs_inline(self):
+        self.assertIsNone(record.delay('inline'))
+        self.assertEqual(calls, ['inline'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_process_pool_child_opens_its_own_connection(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'report')
+        report_connection.delay(path)
+
+        connection.ensure_connection()
+        call_command('run_tasks', pool='process', concurrency=1, once=True, poll_interval=0.1, stdout=StringIO())
+        with open(path) as report:
+            pid, connection_id = map(int, report.read().split())
+        self.assertNotEqual(pid, os.getpid())
+        self.assertNotEqual(connection_id, id(connection.connection))
@@ -1,12 +1,24 @@
 from django.contrib import admin
 from .models import Voucher, VoucherUsage
+from .services import get_times_used, has_redemptions
 
 
 @admin.register(Voucher)
 class VoucherAdmin(admin.ModelAdmin):
-    list_display = ('code', 'discount_type', 'discount_value', 'is_active', 'times_used', 'valid_from', 'valid_until')
+    list_display = ('code', 'discount_type', 'discount_value', 'is_active', 'get_times_used', 'valid_from', 'valid_until')
     list_filter = ('is_active', 'discount_type')
     search_fields = ('code',)
+    readonly_fields = ('times_used', 'uses_reserved')
+
+    def get_readonly_fields(self, request, obj=None):
+        # Shard rows hold part of the usage count; re-sharding a used voucher would lose it.
+        if obj is not None and has_redemptions(obj):
+            return (*self.readonly_fields, 'counter_shards')
+        return self.readonly_fields
+
+    @admin.display(description='Times used')
+    def get_times_used(self, obj):
+        return get_times_used(obj)
 
 
 @admin.register(VoucherUsage)
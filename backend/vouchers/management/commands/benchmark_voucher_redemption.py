@@ -0,0 +1,65 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+from django.utils import timezone
+
+from vouchers.models import Voucher
+from vouchers.services import claim_use, get_times_used
+
+
+class Command(BaseCommand):
+    help = 'Compare concurrent redemption throughput of single-row and sharded voucher counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--redemptions', type=int, default=100, help='Redemptions per thread.')
+        parser.add_argument('--shards', type=int, default=8)
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        per_thread = options['redemptions']
+        total = threads * per_thread
+
+        for label, shards in (('single-row', 0), (f'{options["shards"]} shards', options['shards'])):
+            voucher = Voucher.objects.create(
+                code=f'BENCH-{uuid.uuid4().hex[:10].upper()}',
+                discount_type='fixed',
+                discount_value=0,
+                valid_from=timezone.now(),
+                valid_until=timezone.now() + timedelta(hours=1),
+                max_uses=total,
+                counter_shards=shards,
+            )
+            try:
+                elapsed, claimed, errors = self._run(voucher, threads, per_thread)
+                voucher.refresh_from_db()
+                self.stdout.write(
+                    f'{label:>12}: {claimed}/{total} claimed in {elapsed:.2f}s '
+                    f'({claimed / elapsed:.0f} redemptions/s), {errors} lock error(s), '
+                    f'counted {get_times_used(voucher)}'
+                )
+            finally:
+                voucher.delete()
+
+    def _run(self, voucher, threads, per_thread):
+        def worker():
+            claimed = errors = 0
+            try:
+                for _ in range(per_thread):
+                    try:
+                        claimed += claim_use(voucher)
+                    except OperationalError:
+                        errors += 1
+            finally:
+                connection.close()
+            return claimed, errors
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = [f.result() for f in [pool.submit(worker) for _ in range(threads)]]
+        elapsed = time.perf_counter() - start
+        return elapsed, sum(r[0] for r in results), sum(r[1] for r in results)
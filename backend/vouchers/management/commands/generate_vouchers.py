@@ -0,0 +1,60 @@
+import csv
+import sys
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from vouchers.services import bulk_create_vouchers
+
+
+class Command(BaseCommand):
+    help = 'Generate single-use (or --max-uses) voucher codes in bulk and write them as CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int)
+        parser.add_argument('--prefix', default='')
+        parser.add_argument('--length', type=int, default=10)
+        parser.add_argument('--discount-type', choices=['percentage', 'fixed'], required=True)
+        parser.add_argument('--discount-value', type=Decimal, required=True)
+        parser.add_argument('--valid-from', help='ISO datetime, defaults to now.')
+        parser.add_argument('--valid-until', help='ISO datetime, defaults to 30 days from --valid-from.')
+        parser.add_argument('--max-uses', type=int, default=1)
+        parser.add_argument('--min-booking-amount', type=Decimal)
+        parser.add_argument('--output', help='CSV file to write, defaults to stdout.')
+
+    def handle(self, *args, **options):
+        valid_from = self._parse(options['valid_from']) or timezone.now()
+        valid_until = self._parse(options['valid_until']) or valid_from + timedelta(days=30)
+        if valid_until <= valid_from:
+            raise CommandError('--valid-until must be after --valid-from.')
+
+        codes = bulk_create_vouchers(
+            options['count'], options['prefix'], options['length'],
+            discount_type=options['discount_type'],
+            discount_value=options['discount_value'],
+            valid_from=valid_from,
+            valid_until=valid_until,
+            max_uses=options['max_uses'],
+            min_booking_amount=options['min_booking_amount'],
+        )
+
+        out = open(options['output'], 'w', newline='') if options['output'] else sys.stdout
+        try:
+            writer = csv.writer(out)
+            writer.writerow(['code'])
+            writer.writerows([code] for code in codes)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        self.stderr.write(self.style.SUCCESS(f'Generated {len(codes)} voucher(s).'))
+
+    def _parse(self, value):
+        if not value:
+            return None
+        dt = parse_datetime(value)
+        if dt is None:
+            raise CommandError(f'Invalid datetime: {value}')
+        return dt if timezone.is_aware(dt) else timezone.make_aware(dt)
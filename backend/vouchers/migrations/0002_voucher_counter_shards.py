@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vouchers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='voucher',
+            name='counter_shards',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Spread redemptions over this many counter rows for high-traffic promos. 0 = single counter.'),
+        ),
+        migrations.AddField(
+            model_name='voucher',
+            name='uses_reserved',
+            field=models.PositiveIntegerField(default=0, help_text='Uses handed out to counter shards in blocks.'),
+        ),
+        migrations.CreateModel(
+            name='VoucherCounterShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('used', models.PositiveIntegerField(default=0)),
+                ('capacity', models.PositiveIntegerField(default=0)),
+                ('voucher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='counter_shard_rows', to='vouchers.voucher')),
+            ],
+            options={
+                'unique_together': {('voucher', 'shard')},
+            },
+        ),
+    ]
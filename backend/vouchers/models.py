@@ -15,6 +15,11 @@ class Voucher(models.Model):
     valid_until = models.DateTimeField()
     max_uses = models.PositiveIntegerField(null=True, blank=True, help_text='Leave blank for unlimited uses')
     times_used = models.PositiveIntegerField(default=0)
+    counter_shards = models.PositiveSmallIntegerField(
+        default=0,
+        help_text='Spread redemptions over this many counter rows for high-traffic promos. 0 = single counter.',
+    )
+    uses_reserved = models.PositiveIntegerField(default=0, help_text='Uses handed out to counter shards in blocks.')
     min_booking_amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -26,6 +31,19 @@ class Voucher(models.Model):
         return f'{self.code} ({self.get_discount_type_display()})'
 
 
+class VoucherCounterShard(models.Model):
+    voucher = models.ForeignKey(Voucher, on_delete=models.CASCADE, related_name='counter_shard_rows')
+    shard = models.PositiveSmallIntegerField()
+    used = models.PositiveIntegerField(default=0)
+    capacity = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('voucher', 'shard')
+
+    def __str__(self):
+        return f'{self.voucher.code} shard {self.shard}: {self.used}/{self.capacity}'
+
+
 class VoucherUsage(models.Model):
     voucher = models.ForeignKey(Voucher, on_delete=models.CASCADE, related_name='usages')
     booking = models.OneToOneField('bookings.Booking', on_delete=models.CASCADE, related_name='voucher_usage')
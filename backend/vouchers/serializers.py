@@ -1,19 +1,52 @@
 from rest_framework import serializers
 from django.utils import timezone
+from hotel.sparse_fields import SparseFieldsMixin
 from .models import Voucher
+from .services import get_times_used, has_redemptions
 
 
-class VoucherSerializer(serializers.ModelSerializer):
+class VoucherSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    times_used = serializers.SerializerMethodField()
+
     class Meta:
         model = Voucher
         fields = (
             'id', 'code', 'discount_type', 'discount_value',
             'valid_from', 'valid_until', 'max_uses', 'times_used',
-            'min_booking_amount', 'is_active', 'created_at',
+            'min_booking_amount', 'is_active', 'counter_shards', 'created_at',
         )
         read_only_fields = ('id', 'times_used', 'created_at')
+        compact_fields = ('id', 'code', 'discount_type', 'discount_value', 'max_uses', 'times_used', 'is_active')
+
+    def get_times_used(self, obj):
+        return get_times_used(obj)
+
+    def validate_counter_shards(self, value):
+        # Shard rows hold part of the usage count; re-sharding a used voucher would lose it.
+        if self.instance is not None and value != self.instance.counter_shards and has_redemptions(self.instance):
+            raise serializers.ValidationError('Counter shards cannot be changed once the voucher has been used.')
+        return value
 
 
 class VoucherValidateSerializer(serializers.Serializer):
     code = serializers.CharField(max_length=50)
     booking_id = serializers.IntegerField()
+
+
+class VoucherBulkCreateSerializer(serializers.Serializer):
+    count = serializers.IntegerField(min_value=1, max_value=50000)
+    prefix = serializers.CharField(max_length=20, required=False, default='', allow_blank=True)
+    length = serializers.IntegerField(min_value=6, max_value=30, default=10)
+    discount_type = serializers.ChoiceField(choices=Voucher.DISCOUNT_TYPE_CHOICES)
+    discount_value = serializers.DecimalField(max_digits=10, decimal_places=2)
+    valid_from = serializers.DateTimeField()
+    valid_until = serializers.DateTimeField()
+    max_uses = serializers.IntegerField(min_value=1, required=False, allow_null=True, default=1)
+    min_booking_amount = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, allow_null=True)
+
+    def validate(self, data):
+        if len(data['prefix'].strip()) + data['length'] > Voucher._meta.get_field('code').max_length:
+            raise serializers.ValidationError('Prefix plus code length is too long.')
+        if data['valid_until'] <= data['valid_from']:
+            raise serializers.ValidationError('valid_until must be after valid_from.')
+        return data
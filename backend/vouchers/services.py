@@ -0,0 +1,246 @@
+"""Shared voucher engine: lookup, validation, discount maths, redemption and bulk codes."""
+
+import random
+import secrets
+import threading
+import time
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from hotel.cache import NamespacedCache
+
+from .models import Voucher, VoucherCounterShard, VoucherUsage
+
+# Active vouchers are cached per process; saves in another gunicorn worker
+# only reach this one once the entry expires.
+ACTIVE_CACHE_TTL_SECONDS = 60
+
+# Sharded vouchers hand out uses to each counter row in blocks of this size,
+# so the voucher row itself is only locked once per block.
+SHARD_BLOCK_SIZE = 10
+TIMES_USED_CACHE_SECONDS = 30
+
+# Unambiguous characters only: no 0/O or 1/I/L, codes get read aloud at the front desk.
+CODE_ALPHABET = 'ABCDEFGHJKMNPQRSTUVWXYZ23456789'
+BULK_BATCH_SIZE = 500
+
+cache = NamespacedCache('vouchers')
+
+_active_cache = {}
+_active_cache_lock = threading.Lock()
+
+
+class VoucherError(Exception):
+    """Raised when a voucher cannot be applied; the message is user-facing."""
+
+
+def normalize_code(code):
+    return (code or '').strip().upper()
+
+
+def get_active_voucher(code):
+    """Return the active voucher for ``code``, served from the in-process cache when possible."""
+    key = normalize_code(code)
+    now = time.monotonic()
+    with _active_cache_lock:
+        entry = _active_cache.get(key)
+    if entry and entry[1] > now:
+        return entry[0]
+
+    voucher = Voucher.objects.filter(code__iexact=key).first()
+    if voucher is None:
+        raise VoucherError('Invalid voucher code.')
+    if not voucher.is_active:
+        raise VoucherError('This voucher is no longer active.')
+
+    with _active_cache_lock:
+        _active_cache[key] = (voucher, now + ACTIVE_CACHE_TTL_SECONDS)
+    return voucher
+
+
+def invalidate_voucher_cache(code=None):
+    """Drop one cached voucher, or the whole cache when no code is given."""
+    with _active_cache_lock:
+        if code is None:
+            _active_cache.clear()
+        else:
+            _active_cache.pop(normalize_code(code), None)
+
+
+def check_voucher(voucher, amount, now=None):
+    """Raise ``VoucherError`` unless ``voucher`` can be applied to ``amount``."""
+    now = now or timezone.now()
+    if not voucher.is_active:
+        raise VoucherError('This voucher is no longer active.')
+    if now < voucher.valid_from:
+        raise VoucherError('This voucher is not yet valid.')
+    if now > voucher.valid_until:
+        raise VoucherError('This voucher has expired.')
+    # Advisory only: the cached ``times_used`` may lag, redeem_voucher() enforces the cap.
+    if voucher.max_uses is not None and get_times_used(voucher) >= voucher.max_uses:
+        raise VoucherError('This voucher has reached its maximum uses.')
+    if voucher.min_booking_amount and amount < voucher.min_booking_amount:
+        raise VoucherError(f'Minimum booking amount of ₱{voucher.min_booking_amount} required.')
+
+
+def compute_discount(voucher, amount):
+    if voucher.discount_type == 'percentage':
+        discount = (amount * voucher.discount_value / Decimal('100')).quantize(Decimal('0.01'))
+        return min(discount, amount)
+    return min(voucher.discount_value, amount)
+
+
+def apply_voucher(code, amount):
+    """Look up and validate ``code`` against ``amount``. Returns ``(voucher, discount)``."""
+    voucher = get_active_voucher(code)
+    check_voucher(voucher, amount)
+    return voucher, compute_discount(voucher, amount)
+
+
+def ensure_counter_shards(voucher):
+    """Create any missing counter rows for a sharded voucher."""
+    if voucher.counter_shards:
+        VoucherCounterShard.objects.bulk_create(
+            [VoucherCounterShard(voucher=voucher, shard=n) for n in range(voucher.counter_shards)],
+            ignore_conflicts=True,
+        )
+
+
+def has_redemptions(voucher):
+    """Whether any use of ``voucher`` has been claimed or handed out to counter shards."""
+    if voucher.times_used or voucher.uses_reserved:
+        return True
+    return VoucherCounterShard.objects.filter(voucher=voucher, used__gt=0).exists()
+
+
+def get_times_used(voucher):
+    """Total redemptions; for sharded vouchers the shard rows are summed and cached briefly."""
+    if not voucher.counter_shards:
+        return voucher.times_used
+    key = f'times-used:{voucher.pk}'
+    total = cache.get(key)
+    if total is None:
+        sharded = VoucherCounterShard.objects.filter(voucher=voucher).aggregate(total=Sum('used'))['total']
+        total = voucher.times_used + (sharded or 0)
+        cache.set(key, total, TIMES_USED_CACHE_SECONDS)
+    return total
+
+
+def _take_from_shard(voucher, shard):
+    shards = VoucherCounterShard.objects.filter(voucher=voucher, shard=shard)
+    if voucher.max_uses is not None:
+        shards = shards.filter(used__lt=F('capacity'))
+    return shards.update(used=F('used') + 1) == 1
+
+
+def _reserve_block(voucher, shard):
+    """Move up to SHARD_BLOCK_SIZE unreserved uses from the voucher onto one shard."""
+    with transaction.atomic():
+        max_uses, times_used, reserved = (
+            Voucher.objects
+            .select_for_update()
+            .values_list('max_uses', 'times_used', 'uses_reserved')
+            .get(pk=voucher.pk)
+        )
+        block = min(SHARD_BLOCK_SIZE, max_uses - times_used - reserved)
+        if block <= 0:
+            return False
+        Voucher.objects.filter(pk=voucher.pk).update(uses_reserved=F('uses_reserved') + block)
+        VoucherCounterShard.objects.filter(voucher=voucher, shard=shard).update(capacity=F('capacity') + block)
+    return True
+
+
+def _claim_sharded(voucher):
+    # A plain read: unlike an UPDATE it never waits on the voucher row lock.
+    if not Voucher.objects.filter(pk=voucher.pk, is_active=True).exists():
+        return False
+    shards = list(range(voucher.counter_shards))
+    random.shuffle(shards)
+    if voucher.max_uses is None:
+        return _take_from_shard(voucher, shards[0])
+    for shard in shards:
+        if _take_from_shard(voucher, shard):
+            return True
+        if _reserve_block(voucher, shard) and _take_from_shard(voucher, shard):
+            return True
+    return False
+
+
+def claim_use(voucher):
+    """
+    Consume one use of ``voucher``. Returns False when the cap is reached
+    or the voucher has been deactivated.
+
+    Single-counter vouchers use one conditional UPDATE on the voucher row;
+    sharded vouchers increment a random counter row instead.
+    """
+    if voucher.counter_shards:
+        return _claim_sharded(voucher)
+    claimed = (
+        Voucher.objects
+        .filter(pk=voucher.pk, is_active=True)
+        .filter(Q(max_uses__isnull=True) | Q(times_used__lt=F('max_uses')))
+        .update(times_used=F('times_used') + 1)
+    )
+    return claimed == 1
+
+
+def redeem_voucher(voucher, booking, user, discount_amount):
+    """
+    Consume one use of ``voucher`` and record the usage atomically.
+
+    The increment is conditional, so concurrent redemptions can never push
+    the usage count past ``max_uses``.
+    """
+    with transaction.atomic():
+        if not claim_use(voucher):
+            invalidate_voucher_cache(voucher.code)
+            raise VoucherError('This voucher has reached its maximum uses.')
+        return VoucherUsage.objects.create(
+            voucher=voucher,
+            booking=booking,
+            user=user,
+            discount_amount=discount_amount,
+        )
+
+
+def _unused_codes(count, prefix, length, exclude=frozenset()):
+    """Draw ``count`` random codes that are neither in ``exclude`` nor already taken."""
+    codes = set()
+    while len(codes) < count:
+        candidates = {
+            prefix + ''.join(secrets.choice(CODE_ALPHABET) for _ in range(length))
+            for _ in range(count - len(codes))
+        } - exclude - codes
+        taken = set(Voucher.objects.filter(code__in=candidates).values_list('code', flat=True))
+        codes |= candidates - taken
+    return codes
+
+
+def bulk_create_vouchers(count, prefix='', length=10, batch_size=BULK_BATCH_SIZE, **fields):
+    """
+    Create ``count`` vouchers with random unique codes and return the codes.
+
+    Candidates are checked against the unique ``code`` index before each
+    batch insert. If another request wins a race for a code, only that
+    batch is rolled back and only its colliding codes are redrawn.
+    """
+    prefix = normalize_code(prefix)
+    created = []
+    while len(created) < count:
+        pending = _unused_codes(min(batch_size, count - len(created)), prefix, length)
+        while True:
+            try:
+                with transaction.atomic():
+                    Voucher.objects.bulk_create([Voucher(code=code, **fields) for code in pending])
+                break
+            except IntegrityError:
+                taken = set(Voucher.objects.filter(code__in=pending).values_list('code', flat=True))
+                if not taken:
+                    raise
+                pending = (pending - taken) | _unused_codes(len(taken), prefix, length, pending)
+        created.extend(sorted(pending))
+    return created
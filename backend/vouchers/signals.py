@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Voucher
+from .services import ensure_counter_shards, invalidate_voucher_cache
+
+
+@receiver(post_save, sender=Voucher)
+@receiver(post_delete, sender=Voucher)
+def drop_cached_vouchers(sender, instance, **kwargs):
+    # Clear everything: the code itself may have been edited in the admin.
+    invalidate_voucher_cache()
+
+
+@receiver(post_save, sender=Voucher)
+def create_counter_shards(sender, instance, **kwargs):
+    ensure_counter_shards(instance)
@@ -0,0 +1,98 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.admin.sites import site
+from django.core.cache import cache
+from django.db.models import Sum
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import User
+from bookings.models import Booking
+from rooms.models import Room
+
+from .models import Voucher, VoucherCounterShard, VoucherUsage
+from .serializers import VoucherSerializer
+from .services import VoucherError, claim_use, get_times_used, redeem_voucher
+
+
+def make_voucher(**fields):
+    now = timezone.now()
+    return Voucher.objects.create(
+        code=fields.pop('code', 'TEST10'), discount_type='fixed', discount_value=Decimal('100'),
+        valid_from=now - timedelta(days=1), valid_until=now + timedelta(days=1), **fields,
+    )
+
+
+class RedemptionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('guest@example.com', 'pw', first_name='Guest', last_name='User')
+        self.room = Room.objects.create(name='Cottage 1', description='', day_price=Decimal('500'))
+
+    def book(self, day):
+        return Booking.objects.create(
+            user=self.user, room=self.room, check_in=day, check_out=day, total_price=Decimal('500'),
+        )
+
+    def test_claims_stop_at_max_uses(self):
+        voucher = make_voucher(max_uses=2)
+        self.assertEqual([claim_use(voucher) for _ in range(3)], [True, True, False])
+        voucher.refresh_from_db()
+        self.assertEqual(voucher.times_used, 2)
+
+    def test_redeem_at_cap_records_no_usage(self):
+        voucher = make_voucher(max_uses=1)
+        redeem_voucher(voucher, self.book(date(2030, 1, 1)), self.user, Decimal('100'))
+        with self.assertRaises(VoucherError):
+            redeem_voucher(voucher, self.book(date(2030, 1, 2)), self.user, Decimal('100'))
+        self.assertEqual(VoucherUsage.objects.filter(voucher=voucher).count(), 1)
+
+    def test_inactive_voucher_cannot_be_claimed(self):
+        voucher = make_voucher(max_uses=5, is_active=False)
+        self.assertFalse(claim_use(voucher))
+
+
+class ShardedCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_shard_rows_created_on_save(self):
+        voucher = make_voucher(counter_shards=4)
+        self.assertEqual(VoucherCounterShard.objects.filter(voucher=voucher).count(), 4)
+
+    def test_sharded_claims_respect_max_uses(self):
+        voucher = make_voucher(max_uses=25, counter_shards=3)
+        results = [claim_use(voucher) for _ in range(30)]
+        self.assertEqual(results.count(True), 25)
+        self.assertFalse(any(results[25:]))
+
+        shards = VoucherCounterShard.objects.filter(voucher=voucher)
+        self.assertEqual(shards.aggregate(total=Sum('used'))['total'], 25)
+        for shard in shards:
+            self.assertLessEqual(shard.used, shard.capacity)
+        voucher.refresh_from_db()
+        self.assertEqual(voucher.uses_reserved, shards.aggregate(total=Sum('capacity'))['total'])
+        self.assertLessEqual(voucher.uses_reserved, 25)
+        self.assertEqual(get_times_used(voucher), 25)
+
+    def test_unlimited_sharded_voucher_reserves_nothing(self):
+        voucher = make_voucher(counter_shards=2)
+        self.assertTrue(all(claim_use(voucher) for _ in range(5)))
+        voucher.refresh_from_db()
+        self.assertEqual(voucher.uses_reserved, 0)
+        self.assertEqual(get_times_used(voucher), 5)
+
+    def test_counter_shards_locked_once_used(self):
+        voucher = make_voucher(max_uses=10, counter_shards=2)
+        serializer = VoucherSerializer(voucher, data={'counter_shards': 4}, partial=True)
+        self.assertTrue(serializer.is_valid())
+
+        claim_use(voucher)
+        serializer = VoucherSerializer(voucher, data={'counter_shards': 0}, partial=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('counter_shards', serializer.errors)
+
+        model_admin = site._registry[Voucher]
+        self.assertIn('counter_shards', model_admin.get_readonly_fields(None, voucher))
+        self.assertIn('times_used', model_admin.get_readonly_fields(None, None))
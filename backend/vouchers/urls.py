@@ -3,6 +3,7 @@ from . import views
 
 urlpatterns = [
     path('validate/', views.validate_voucher),
+    path('bulk/', views.voucher_bulk_create),
     path('', views.voucher_list_create),
     path('<int:pk>/toggle/', views.voucher_toggle),
     path('<int:pk>/', views.voucher_delete),
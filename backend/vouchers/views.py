@@ -1,13 +1,14 @@
-from decimal import Decimal
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
-from django.utils import timezone
+from django.http import StreamingHttpResponse
 
 from bookings.models import Booking
+from hotel.streaming import csv_lines
 from .models import Voucher
-from .serializers import VoucherSerializer, VoucherValidateSerializer
+from .serializers import VoucherSerializer, VoucherValidateSerializer, VoucherBulkCreateSerializer
+from .services import VoucherError, apply_voucher, bulk_create_vouchers
 
 
 @api_view(['POST'])
@@ -17,7 +18,7 @@ def validate_voucher(request):
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    code = serializer.validated_data['code'].strip().upper()
+    code = serializer.validated_data['code']
     booking_id = serializer.validated_data['booking_id']
 
     try:
@@ -25,33 +26,11 @@ def validate_voucher(request):
     except Booking.DoesNotExist:
         return Response({'detail': 'Booking not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-    try:
-        voucher = Voucher.objects.get(code__iexact=code)
-    except Voucher.DoesNotExist:
-        return Response({'detail': 'Invalid voucher code.'}, status=status.HTTP_400_BAD_REQUEST)
-
-    now = timezone.now()
-    if not voucher.is_active:
-        return Response({'detail': 'This voucher is no longer active.'}, status=status.HTTP_400_BAD_REQUEST)
-    if now < voucher.valid_from:
-        return Response({'detail': 'This voucher is not yet valid.'}, status=status.HTTP_400_BAD_REQUEST)
-    if now > voucher.valid_until:
-        return Response({'detail': 'This voucher has expired.'}, status=status.HTTP_400_BAD_REQUEST)
-    if voucher.max_uses is not None and voucher.times_used >= voucher.max_uses:
-        return Response({'detail': 'This voucher has reached its maximum uses.'}, status=status.HTTP_400_BAD_REQUEST)
-
     total = booking.total_price
-    if voucher.min_booking_amount and total < voucher.min_booking_amount:
-        return Response(
-            {'detail': f'Minimum booking amount of \u20b1{voucher.min_booking_amount} required.'},
-            status=status.HTTP_400_BAD_REQUEST,
-        )
-
-    if voucher.discount_type == 'percentage':
-        discount = (total * voucher.discount_value / Decimal('100')).quantize(Decimal('0.01'))
-        discount = min(discount, total)
-    else:
-        discount = min(voucher.discount_value, total)
+    try:
+        voucher, discount = apply_voucher(code, total)
+    except VoucherError as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     final_price = total - discount
 
@@ -71,7 +50,7 @@ def validate_voucher(request):
 def voucher_list_create(request):
     if request.method == 'GET':
         vouchers = Voucher.objects.all()
-        serializer = VoucherSerializer(vouchers, many=True)
+        serializer = VoucherSerializer(vouchers, many=True, context={'request': request})
         return Response(serializer.data)
 
     serializer = VoucherSerializer(data=request.data)
@@ -82,6 +61,21 @@ def voucher_list_create(request):
     return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def voucher_bulk_create(request):
+    serializer = VoucherBulkCreateSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    options = dict(serializer.validated_data)
+    codes = bulk_create_vouchers(options.pop('count'), options.pop('prefix'), options.pop('length'), **options)
+
+    rows = csv_lines(('code',), ((code,) for code in codes))
+    response = StreamingHttpResponse(rows, content_type='text/csv', status=status.HTTP_201_CREATED)
+    response['Content-Disposition'] = f'attachment; filename="vouchers-{len(codes)}.csv"'
+    return response
+
+
 @api_view(['PATCH'])
 @permission_classes([IsAdminUser])
 def voucher_toggle(request, pk):
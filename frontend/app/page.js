@@ -6,12 +6,13 @@ import { ArrowRight, Trophy, TreePalm, Music, CarFront } from 'lucide-react'
 import api from '@/lib/api'
 import RoomCard from '@/components/RoomCard'
 
-async function getFeaturedRooms() {
+// One cached request for the landing page content instead of a call per section.
+async function getHomepageBundle() {
   try {
-    const { data } = await api.get('/rooms/?page_size=3')
-    return data.results || data
+    const { data } = await api.get('/content/bundle/')
+    return data
   } catch {
-    return []
+    return { rooms: [] }
   }
 }
 
@@ -23,7 +24,7 @@ const features = [
 ]
 
 export default async function HomePage() {
-  const rooms = await getFeaturedRooms()
+  const { rooms } = await getHomepageBundle()
 
   return (
     <>